@@ -21,18 +21,27 @@ from sdc_scissor.can_api.can_msg_generator import CANMessageGenerator, RandomCAN
 from sdc_scissor.can_api.can_output import CANBusOutputDecorator, InfluxDBDecorator, NoCANBusOutput, StdOutDecorator
 from sdc_scissor.config import CONFIG
 from sdc_scissor.feature_extraction_api.angle_based_strategy import AngleBasedStrategy
-from sdc_scissor.feature_extraction_api.feature_extraction import FeatureExtractor
+from sdc_scissor.feature_extraction_api.feature_cache import FeatureCache
+from sdc_scissor.feature_extraction_api.feature_extraction import RoadFeatures
+from sdc_scissor.feature_extraction_api.feature_extraction_benchmark import FeatureExtractionBenchmark
+from sdc_scissor.feature_extraction_api.parallel_feature_extractor import ParallelFeatureExtractor
+from sdc_scissor.feature_extraction_api.road_features_writer import RoadFeaturesWriter
 from sdc_scissor.machine_learning_api.cost_effectiveness_evaluator import CostEffectivenessEvaluator
 from sdc_scissor.machine_learning_api.csv_loader import CSVLoader
 from sdc_scissor.machine_learning_api.model_evaluator import ModelEvaluator
 from sdc_scissor.machine_learning_api.predictor import Predictor
 from sdc_scissor.obstacle_api.beamng_obstacle_factory import BeamngObstacleFactory
 from sdc_scissor.simulator_api.simulator_factory import SimulatorFactory
+from sdc_scissor.testing_api.packed_test_corpus import PackedTestCorpus
+from sdc_scissor.testing_api.pipeline import Pipeline
+from sdc_scissor.testing_api.test_catalog import TestCatalog
 from sdc_scissor.testing_api.test_generator import KeepAllTestsBehavior, KeepValidTestsOnlyBehavior, TestGenerator
 from sdc_scissor.testing_api.test_loader import TestLoader
 from sdc_scissor.testing_api.test_monitor import TestMonitor
 from sdc_scissor.testing_api.test_runner import TestRunner
 from sdc_scissor.testing_api.test_validator import NoIntersectionValidator, SimpleTestValidator
+from sdc_scissor.testing_api.test_writer import PackedTestWriter, ShardedTestWriter
+from sdc_scissor.testing_api.validation_cache import ValidationCache
 
 _ROOT_DIR = Path(__file__).parent.parent
 _DESTINATION = _ROOT_DIR / "destination"
@@ -88,7 +97,34 @@ def cli(ctx: click.Context, config: Path, debug) -> None:
     "-d", "--destination", default=_DESTINATION, type=click.Path(), help="Output directory to store the generated tests"
 )
 @click.option("-t", "--tool", default="frenetic", type=click.STRING, help="Name of the test generator tool")
-def generate_tests(count: int, keep: bool, destination: Path, tool: str) -> None:
+@click.option("--catalog", default=None, type=click.Path(), help="Path to a test catalog to add the generated tests to")
+@click.option(
+    "--shard-size",
+    default=1000,
+    type=click.INT,
+    help="Number of tests per subdirectory of the destination, 0 stores all tests directly in the destination",
+)
+@click.option("--writer-threads", default=4, type=click.INT, help="Number of threads writing the test files")
+@click.option(
+    "--corpus",
+    default=None,
+    type=click.Path(),
+    help="Path of a packed test corpus to store the tests in instead of JSON files",
+)
+@click.option("-j", "--jobs", default=1, type=click.INT, help="Number of worker processes (0 uses all CPUs)")
+@click.option("--seed", default=None, type=click.INT, help="Seed to generate a reproducible test suite")
+def generate_tests(
+    count: int,
+    keep: bool,
+    destination: Path,
+    tool: str,
+    catalog: Path,
+    shard_size: int,
+    writer_threads: int,
+    corpus: Path,
+    jobs: int,
+    seed: int,
+) -> None:
     """
     Generate tests (road specifications) for self-driving cars.
 
@@ -96,11 +132,34 @@ def generate_tests(count: int, keep: bool, destination: Path, tool: str) -> None
     :param keep: Keep the invalid road specifications or omit them
     :param destination: Directory where the test specifications should be stored
     :param tool: Name of the test generator to be used
+    :param catalog: Path to a test catalog of the destination directory
+    :param shard_size: Number of tests per subdirectory of the destination
+    :param writer_threads: Number of threads writing the test files
+    :param corpus: Path of a packed test corpus to store the tests in instead of the destination directory
+    :param jobs: Number of worker processes generating the tests
+    :param seed: Seed of the generation, the same seed generates the same tests for any number of jobs
     """
     logging.debug("* generate_tests")
+    if corpus and catalog:
+        raise Exception("A test catalog can only be kept for tests stored as JSON files!")
     destination = Path(destination)
-    if not destination.exists():
-        destination.mkdir(parents=True)
+    test_catalog = TestCatalog(catalog, destination) if catalog else None
+
+    def add_to_catalog(test_path: Path, test_dict: dict):
+        test_catalog.put(test_path, TestLoader.get_metadata(test_path, test_dict))
+
+    if corpus:
+        test_writer = PackedTestWriter(corpus, shard_size=shard_size, count=count)
+    else:
+        if not destination.exists():
+            destination.mkdir(parents=True)
+        test_writer = ShardedTestWriter(
+            destination,
+            shard_size=shard_size,
+            nr_of_threads=writer_threads,
+            on_write=add_to_catalog if test_catalog is not None else None,
+            count=count,
+        )
 
     test_keeping_behavior = KeepAllTestsBehavior() if keep else KeepValidTestsOnlyBehavior()
     test_validator = NoIntersectionValidator(SimpleTestValidator())
@@ -110,39 +169,284 @@ def generate_tests(count: int, keep: bool, destination: Path, tool: str) -> None
         tool=tool,
         validator=test_validator,
         test_keeping_behavior=test_keeping_behavior,
+        test_writer=test_writer,
+        jobs=jobs,
+        seed=seed,
     )
-    test_generator.generate()
-    test_generator.save_tests()
+
+    # every test is written as soon as it is validated, hence the generated tests are not kept in memory
+    with test_writer:
+        Pipeline(test_generator.iter_tests()).run(test_generator.save_test)
+    if test_catalog is not None:
+        test_catalog.close()
 
 
 @cli.command()
 @click.option(
     "-t", "--tests", default=_DESTINATION, type=click.Path(exists=True), help="Path to directory containing the tests"
 )
+@click.option("-o", "--out", required=True, type=click.Path(), help="Path of the packed test corpus to create")
+def pack_tests(tests: Path, out: Path) -> None:
+    """
+    Convert a directory of JSON test files into a single packed test corpus.
+
+    :param tests: Path to the directory containing the tests
+    :param out: Path of the packed test corpus
+    """
+    test_paths = TestLoader.find_test_paths(tests)
+    # store the tests in the order the test loader provides them
+    nr_of_tests = PackedTestCorpus.pack_tests(list(reversed(test_paths)), tests_dir=tests, corpus_path=out)
+    print("packed tests: {}".format(nr_of_tests))
+
+
+@cli.command()
+@click.option("-c", "--corpus", required=True, type=click.Path(exists=True), help="Path to the packed test corpus")
+@click.option(
+    "-d", "--destination", default=_DESTINATION, type=click.Path(), help="Output directory to store the JSON test files"
+)
+def unpack_tests(corpus: Path, destination: Path) -> None:
+    """
+    Convert a packed test corpus into JSON test files.
+
+    :param corpus: Path to the packed test corpus
+    :param destination: Directory where the JSON test files should be stored
+    """
+    test_corpus = PackedTestCorpus(corpus)
+    nr_of_tests = test_corpus.unpack_tests(destination)
+    test_corpus.close()
+    print("unpacked tests: {}".format(nr_of_tests))
+
+
+@cli.command()
+@click.option(
+    "-t",
+    "--tests",
+    default=_DESTINATION,
+    type=click.Path(exists=True),
+    help="Path to directory containing the tests or to a packed test corpus",
+)
 @click.option("-s", "--segmentation", default="angle-based", type=click.STRING, help="Road segmentation strategy")
-def extract_features(tests: Path, segmentation: str) -> None:
+@click.option("-j", "--jobs", default=1, type=click.INT, help="Number of worker processes (0 uses all CPUs)")
+@click.option(
+    "--parquet/--no-parquet",
+    default=False,
+    type=click.BOOL,
+    help="Additionally store the road features as a Parquet file (requires pyarrow)",
+)
+@click.option(
+    "--cache",
+    default=None,
+    type=click.Path(),
+    help="Path to a feature cache file, features of unchanged roads are served from the cache",
+)
+@click.option(
+    "--manifest",
+    default=None,
+    type=click.Path(),
+    help="Path to a manifest file, unchanged tests known to be invalid are skipped without parsing them",
+)
+@click.option(
+    "--validation-cache",
+    default=None,
+    type=click.Path(),
+    help="Path to a validation cache file, roads that were validated before are not validated again",
+)
+@click.option(
+    "--catalog",
+    default=None,
+    type=click.Path(),
+    help="Path to a test catalog, it is kept in sync with the tests",
+)
+@click.option(
+    "--query",
+    default=None,
+    type=click.STRING,
+    help="SQL expression selecting the valid tests of the catalog, e.g., 'road_distance > 200'",
+)
+def extract_features(
+    tests: Path,
+    segmentation: str,
+    jobs: int,
+    parquet: bool,
+    cache: Path,
+    manifest: Path,
+    validation_cache: Path,
+    catalog: Path,
+    query: str,
+) -> None:
     """
     Extract road features from given test scenarios.
 
-    :param tests: Path to the directory containing the tests
+    :param tests: Path to the directory containing the tests or to a packed test corpus
     :param segmentation: Name of the road segmentation strategy
+    :param jobs: Number of worker processes extracting the features
+    :param parquet: Additionally store the road features as a Parquet file
+    :param cache: Path to a feature cache file
+    :param manifest: Path to a manifest file of the tests
+    :param validation_cache: Path to a validation cache file
+    :param catalog: Path to a test catalog, the extracted road features are stored in it
+    :param query: SQL expression selecting the tests of the catalog
     """
     logging.debug("extract_features")
     tests = Path(tests)
 
-    test_validator = NoIntersectionValidator(SimpleTestValidator())
-    test_loader = TestLoader(tests, test_validator=test_validator)
+    validation_cache = ValidationCache(validation_cache) if validation_cache else None
+    test_validator = NoIntersectionValidator(SimpleTestValidator(), validation_cache=validation_cache)
+    test_loader = TestLoader(
+        tests, test_validator=test_validator, manifest_path=manifest, catalog_path=catalog, catalog_query=query
+    )
     if segmentation == "angle-based":
         segmentation = AngleBasedStrategy(angle_threshold=5, decision_distance=10)
-    feature_extractor = FeatureExtractor(segmentation_strategy=segmentation)
-    road_features_lst = []
-    while test_loader.has_next():
-        test, _ = test_loader.next()
-        road_features = feature_extractor.extract_features(test)
-        road_features.safety = test.test_outcome
-        road_features_lst.append((test.test_id, road_features))
+    feature_cache = FeatureCache(cache) if cache else None
+    if feature_cache:
+        statistics_before = feature_cache.get_statistics()
+    parallel_feature_extractor = ParallelFeatureExtractor(
+        test_loader=test_loader, segmentation_strategy=segmentation, jobs=jobs, feature_cache=feature_cache
+    )
+    out_dir = tests.parent if tests.is_file() else tests
+    with RoadFeaturesWriter(out_dir=out_dir, parquet=parquet) as road_features_writer:
+
+        def store_road_features(road_features_lst: list):
+            road_features_writer.write_all(road_features_lst)
+            if test_loader.test_catalog is not None:
+                # the test id of a test file is its path
+                test_loader.test_catalog.put_features(
+                    {
+                        Path(test_id): {
+                            field: value
+                            for field, value in zip(RoadFeatures.FIELDS, road_features.to_row())
+                            if field != "safety"
+                        }
+                        for test_id, road_features in road_features_lst
+                    }
+                )
+
+        # the road features are streamed from the workers to the writer, hence the memory does not grow with the tests
+        Pipeline(parallel_feature_extractor.iter_features()).batch(1000).run(store_road_features)
+
+    test_loader.save_metadata()
+    if validation_cache is not None:
+        validation_cache.close()
+    if feature_cache:
+        feature_cache.flush()
+        statistics_after = feature_cache.get_statistics()
+        logging.info(
+            "feature cache: {} hits, {} misses".format(
+                statistics_after["hits"] - statistics_before["hits"],
+                statistics_after["misses"] - statistics_before["misses"],
+            )
+        )
+        feature_cache.close()
 
-    FeatureExtractor.save_to_csv(road_features_lst, tests)
+
+@cli.command()
+@click.option("--cache", required=True, type=click.Path(exists=True), help="Path to the feature cache file")
+@click.option(
+    "--max-entries", default=None, type=click.INT, help="Evict least recently used entries beyond this number"
+)
+@click.option("--max-age", default=None, type=click.FLOAT, help="Evict entries not accessed within this number of days")
+@click.option("--compact/--no-compact", default=False, type=click.BOOL, help="Reclaim the space of evicted entries")
+def feature_cache(cache: Path, max_entries: int, max_age: float, compact: bool) -> None:
+    """
+    Show statistics of a feature cache, evict old entries and compact it.
+
+    :param cache: Path to the feature cache file
+    :param max_entries: Number of entries to keep at most
+    :param max_age: Maximum number of days since the last access of an entry
+    :param compact: Reclaim the disk space of evicted entries
+    """
+    feature_cache = FeatureCache(cache)
+    if max_entries is not None or max_age is not None:
+        nr_of_evicted_entries = feature_cache.evict(max_entries=max_entries, max_age_in_days=max_age)
+        print("evicted: {}".format(nr_of_evicted_entries))
+    if compact:
+        feature_cache.compact()
+    statistics = feature_cache.get_statistics()
+    print(
+        "entries: {}, hits: {}, misses: {}, size: {} bytes".format(
+            statistics["entries"], statistics["hits"], statistics["misses"], statistics["size_in_bytes"]
+        )
+    )
+    feature_cache.close()
+
+
+@cli.command()
+@click.option(
+    "-t",
+    "--tests",
+    default=_ROOT_DIR / "sample_tests",
+    type=click.Path(exists=True),
+    help="Path to directory with tests",
+)
+@click.option(
+    "--road-points",
+    default="50,100,200,400,800",
+    type=click.STRING,
+    help="Comma separated number of road points of the synthetic roads",
+)
+@click.option("--synthetic-roads", default=20, type=click.INT, help="Number of synthetic roads per road length")
+@click.option("--repetitions", default=3, type=click.INT, help="Number of timed runs per phase")
+@click.option("--baseline", default=None, type=click.Path(), help="Path to a JSON file with baseline results")
+@click.option(
+    "--save-baseline/--no-save-baseline", default=False, type=click.BOOL, help="Store the results as the new baseline"
+)
+@click.option("--tolerance", default=0.2, type=click.FLOAT, help="Accepted relative deviation from the baseline")
+def benchmark_features(
+    tests: Path,
+    road_points: str,
+    synthetic_roads: int,
+    repetitions: int,
+    baseline: Path,
+    save_baseline: bool,
+    tolerance: float,
+) -> None:
+    """
+    Benchmark the feature extraction pipeline and compare the results with a baseline.
+
+    :param tests: Path to the directory containing the tests
+    :param road_points: Comma separated number of road points of the synthetic roads
+    :param synthetic_roads: Number of synthetic roads per road length
+    :param repetitions: Number of timed runs per phase
+    :param baseline: Path to a JSON file with baseline results
+    :param save_baseline: Store the results as the new baseline instead of comparing them
+    :param tolerance: Accepted relative deviation from the baseline
+    """
+    benchmark = FeatureExtractionBenchmark(
+        tests_dir=tests,
+        nr_of_road_points=[int(n) for n in road_points.split(",")],
+        nr_of_synthetic_roads=synthetic_roads,
+        repetitions=repetitions,
+    )
+    results = benchmark.run()
+
+    nr_hyphens = 106
+    print(nr_hyphens * "-")
+    for corpus_name, corpus_results in results["corpora"].items():
+        for phase_name, phase_results in corpus_results.items():
+            output = "{:^16}| {:^36}| {:>12.1f} roads/s | {:>10.4f} s | {:>10} bytes |".format(
+                corpus_name,
+                phase_name,
+                phase_results["roads_per_second"],
+                phase_results["seconds"],
+                phase_results["peak_memory_in_bytes"],
+            )
+            print(output)
+        print(nr_hyphens * "-")
+
+    if baseline is None:
+        return
+    if save_baseline or not Path(baseline).exists():
+        FeatureExtractionBenchmark.save_baseline(results, baseline)
+        print("baseline saved: {}".format(baseline))
+        return
+    regressions = FeatureExtractionBenchmark.get_regressions(
+        results, FeatureExtractionBenchmark.load_baseline(baseline), tolerance=tolerance
+    )
+    for regression in regressions:
+        print("regression: {}".format(regression))
+    if regressions:
+        raise Exception("{} benchmark regressions compared to the baseline!".format(len(regressions)))
+    print("no regressions compared to the baseline")
 
 
 @cli.command()
@@ -158,7 +462,7 @@ def feature_statistics(csv) -> None:
 
     :param csv: Path to the CSV file containing the extracted road features
     """
-    dd = CSVLoader.load_dataframe_from_csv(csv)
+    dd = CSVLoader.load_dataframe(csv)
     nr_pass = np.sum(dd["safety"] == "PASS")
     nr_fails = np.sum(dd["safety"] == "FAIL")
     nr_tests = nr_pass + nr_fails
@@ -228,6 +532,18 @@ def feature_statistics(csv) -> None:
 @click.option("--can-bitrate", type=click.Path(exists=True), help="CAN bitrate")
 @click.option("--influxdb-bucket", type=click.STRING, default=None, help="InfluxDB bucket to write CAN message to")
 @click.option("--influxdb-org", type=click.STRING, default=None, help="InfluxDB organization")
+@click.option(
+    "--catalog",
+    default=None,
+    type=click.Path(),
+    help="Path to a test catalog, it is kept in sync with the tests",
+)
+@click.option(
+    "--query",
+    default=None,
+    type=click.STRING,
+    help="SQL expression selecting the valid tests of the catalog, e.g., 'road_distance > 200'",
+)
 def label_tests(
     tests,
     home,
@@ -250,6 +566,8 @@ def label_tests(
     can_bitrate,
     influxdb_bucket,
     influxdb_org,
+    catalog,
+    query,
 ) -> None:
     """
     Execute the tests in simulation to label them as safe or unsafe scenarios.
@@ -259,6 +577,8 @@ def label_tests(
 
     logging.debug("label_tests")
     tests = Path(tests)
+    if PackedTestCorpus.is_packed_corpus(tests):
+        raise Exception("Labeled tests are written back to their JSON files, unpack the packed test corpus first!")
     logging.debug("Test directory: {}".format(tests))
     beamng_simulator = SimulatorFactory.get_beamng_simulator(
         home=CONFIG.BEAMNG_HOME,
@@ -269,7 +589,7 @@ def label_tests(
     )
 
     test_validator = NoIntersectionValidator(SimpleTestValidator())
-    test_loader = TestLoader(tests_dir=tests, test_validator=test_validator)
+    test_loader = TestLoader(tests_dir=tests, test_validator=test_validator, catalog_path=catalog, catalog_query=query)
 
     if obstacles:
         obstacle_factory = BeamngObstacleFactory()
@@ -306,6 +626,7 @@ def label_tests(
     )
 
     test_runner.run_test_suite()
+    test_loader.save_metadata()
 
 
 @cli.command()
@@ -326,7 +647,7 @@ def evaluate_models(csv: Path, models_dir: Path) -> None:
     if not models_dir.exists():
         models_dir.mkdir()
 
-    dd = CSVLoader.load_dataframe_from_csv(csv)
+    dd = CSVLoader.load_dataframe(csv)
 
     model_evaluator = ModelEvaluator(data_frame=dd, label="safety")
     # metrics = model_evaluator.model_evaluation_with_balanced_training()
@@ -348,7 +669,7 @@ def grid_search(csv: Path, clf: str) -> None:
     """
     Perform GridSearch on a selected classifier to optimize the hyperparameters
     """
-    dd = CSVLoader.load_dataframe_from_csv(csv)
+    dd = CSVLoader.load_dataframe(csv)
 
     model_evaluator = ModelEvaluator(data_frame=dd, label="safety")
 
@@ -406,7 +727,7 @@ def evaluate_cost_effectiveness(csv: Path, random, top_k) -> None:
     Evaluate the speed-up SDC-Scissor achieves by only selecting test scenarios that likely fail.
     """
     logging.debug("evaluate_cost_effectiveness")
-    df = CSVLoader.load_dataframe_from_csv(csv)
+    df = CSVLoader.load_dataframe(csv)
     logging.debug("data: {}".format(df))
     classifiers_dict = {
         "random_forest": RandomForestClassifier(),
@@ -448,15 +769,47 @@ def evaluate_cost_effectiveness(csv: Path, random, top_k) -> None:
     type=click.Path(exists=True),
     help="Path to the trained classifier model",
 )
-def predict_tests(tests: Path, classifier: Path) -> None:
+@click.option(
+    "--prefetch",
+    default=8,
+    type=click.INT,
+    help="Number of tests that are loaded and validated in the background, 0 disables prefetching",
+)
+@click.option(
+    "--validation-cache",
+    default=None,
+    type=click.Path(),
+    help="Path to a validation cache file, roads that were validated before are not validated again",
+)
+@click.option(
+    "--catalog",
+    default=None,
+    type=click.Path(),
+    help="Path to a test catalog, it is kept in sync with the tests",
+)
+@click.option(
+    "--query",
+    default=None,
+    type=click.STRING,
+    help="SQL expression selecting the valid tests of the catalog, e.g., 'road_distance > 200'",
+)
+def predict_tests(
+    tests: Path, classifier: Path, prefetch: int, validation_cache: Path, catalog: Path, query: str
+) -> None:
     """
     Predict the most likely outcome of a test scenario without executing them in simulation.
     """
-    test_validator = NoIntersectionValidator(SimpleTestValidator())
-    test_loader = TestLoader(tests_dir=tests, test_validator=test_validator)
+    if PackedTestCorpus.is_packed_corpus(tests):
+        raise Exception("Predicted tests are written back to their JSON files, unpack the packed test corpus first!")
+    validation_cache = ValidationCache(validation_cache) if validation_cache else None
+    test_validator = NoIntersectionValidator(SimpleTestValidator(), validation_cache=validation_cache)
+    test_loader = TestLoader(tests_dir=tests, test_validator=test_validator, catalog_path=catalog, catalog_query=query)
 
-    predictor = Predictor(test_loader=test_loader, joblib_classifier=classifier)
+    predictor = Predictor(test_loader=test_loader, joblib_classifier=classifier, prefetch=prefetch)
     predictor.predict()
+    test_loader.save_metadata()
+    if validation_cache is not None:
+        validation_cache.close()
 
 
 @cli.command()
@@ -1,4 +1,7 @@
+import numpy as np
+
 from sdc_scissor.feature_extraction_api.road_geometry_calculator import RoadGeometryCalculator
+from sdc_scissor.feature_extraction_api.road_geometry_index import RoadGeometryIndex
 from sdc_scissor.feature_extraction_api.segmentation_strategy import SegmentationStrategy
 
 
@@ -19,26 +22,41 @@ class AngleBasedStrategy(SegmentationStrategy):
         self.__road_geometry_calculator = RoadGeometryCalculator()
         self.__angle_threshold = angle_threshold
         self.__decision_distance = decision_distance
+        self.__tolerance = 1e-9
 
     def extract_segments(self, road_points):
         """
         Extract segments from road points according to the angle-based segmentation strategy.
 
+        The lengths and angles of the road pieces are looked up in a precomputed geometry index and the iterations in
+        which no decision is possible are skipped by a binary search on the cumulative road length, which makes the
+        segmentation linear in the number of road points. Whenever a lookup is too close to a decision boundary to be
+        trusted, the value is recomputed on the road piece exactly as before so that the segments are identical.
+
         :param road_points: List of 2D  points, defining the road to be segmented
         :return: List of indexes defining the start and end of segments
         """
+        nr_of_road_points = len(road_points)
+        if nr_of_road_points == 0:
+            return []
+
+        geometry_index = RoadGeometryIndex(road_points)
+        cumulative_lengths = geometry_index.cumulative_lengths
+        length_tolerance = self.__tolerance * max(1.0, float(cumulative_lengths[-1]))
+        angle_tolerance = self.__tolerance * max(1.0, float(np.max(np.abs(geometry_index.angle_prefix_sums))))
+
         # iterate according to the decision distance
         segment_indexes = []
         segment_start_index = 0
         current_road_piece_start_index = 0
         current_angle = 0
+        current_angle_piece = None
         is_first_piece = True
-        is_last_iteration = False
 
-        for i in range(len(road_points)):
+        i = 0
+        while i < nr_of_road_points:
             # check if it is the last iteration
-            if i == (len(road_points) - 1):
-                is_last_iteration = True
+            is_last_iteration = i == (nr_of_road_points - 1)
 
             # the start of a new piece has to be 2 indexes ahead of the current i
             if current_road_piece_start_index == i + 1:
@@ -46,44 +64,138 @@ class AngleBasedStrategy(SegmentationStrategy):
             else:
                 current_road_piece_end_index = i + 1
 
-            # define the current road piece to calculate the turn angle and distance
-            current_road_piece = road_points[current_road_piece_start_index : current_road_piece_end_index + 1]
-
-            # calculate the road piece distance defined above
-            current_distance = self.__road_geometry_calculator.get_road_length(current_road_piece)
+            # calculate the road piece distance defined by its start and end index
+            current_distance = self.__get_road_piece_length(
+                road_points,
+                geometry_index,
+                current_road_piece_start_index,
+                current_road_piece_end_index,
+                length_tolerance,
+            )
 
             # check if the distance of the current road piece is long enough or it is the last iteration
-            if (current_distance >= self.__decision_distance) or is_last_iteration:
-                previous_angle = current_angle
-
-                # calculate the angle of the current road piece
-                # TODO: ensure that the road piece to calculate the angle has enough points!!!
-                # (e.g., use temporarily a longer road piece)
-                if len(current_road_piece) == 2 and current_road_piece_start_index > 0:
-                    tmp_current_road_piece = road_points[
-                        current_road_piece_start_index - 1 : current_road_piece_end_index + 1
-                    ]
-                else:
-                    tmp_current_road_piece = current_road_piece
-                current_angle = sum(self.__road_geometry_calculator.extract_turn_angles(tmp_current_road_piece))
-
-                # define start and end index of segment iff the angle of the current road piece is different
-                if (
-                    self.__has_current_angle_changed(previous_angle, current_angle) and not is_first_piece
-                ) or is_last_iteration:
-                    segment_end_index = i
-                    segment_indexes.append((segment_start_index, segment_end_index))
-                    segment_start_index = segment_end_index + 1
-                    current_road_piece_start_index = segment_start_index
-                else:
-                    current_road_piece_start_index = current_road_piece_end_index + 1
-                    is_first_piece = False
+            if not ((current_distance >= self.__decision_distance) or is_last_iteration):
+                i = self.__get_next_decision_index(
+                    i, current_road_piece_start_index, cumulative_lengths, length_tolerance
+                )
+                continue
+
+            previous_angle, previous_angle_piece = current_angle, current_angle_piece
+
+            # calculate the angle of the current road piece
+            # TODO: ensure that the road piece to calculate the angle has enough points!!!
+            # (e.g., use temporarily a longer road piece)
+            current_road_piece_length = (
+                min(current_road_piece_end_index + 1, nr_of_road_points) - current_road_piece_start_index
+            )
+            if current_road_piece_length == 2 and current_road_piece_start_index > 0:
+                current_angle_piece = (current_road_piece_start_index - 1, current_road_piece_end_index + 1)
+            else:
+                current_angle_piece = (current_road_piece_start_index, current_road_piece_end_index + 1)
+            current_angle = geometry_index.get_angle_sum(current_angle_piece[0], current_angle_piece[1] - 1)
+
+            # near the threshold boundaries the angles are recomputed exactly on the road pieces
+            if self.__is_close_to_threshold(previous_angle, current_angle, angle_tolerance):
+                previous_angle = self.__get_exact_angle(road_points, previous_angle_piece)
+                current_angle = self.__get_exact_angle(road_points, current_angle_piece)
+
+            # define start and end index of segment iff the angle of the current road piece is different
+            if (
+                self.__has_current_angle_changed(previous_angle, current_angle) and not is_first_piece
+            ) or is_last_iteration:
+                segment_end_index = i
+                segment_indexes.append((segment_start_index, segment_end_index))
+                segment_start_index = segment_end_index + 1
+                current_road_piece_start_index = segment_start_index
+            else:
+                current_road_piece_start_index = current_road_piece_end_index + 1
+                is_first_piece = False
+
+            i += 1
 
         return segment_indexes
 
         # decide type of segment based on angle and its threshold
         # define segment when the type of segment will change
 
+    def __get_road_piece_length(self, road_points, geometry_index, start_index, end_index, length_tolerance):
+        """
+        Length of road_points[start_index : end_index + 1]. The value is recomputed exactly on the road piece if it is
+        too close to the decision distance.
+
+        :param road_points: List of 2D points, defining the road to be segmented
+        :param geometry_index: Precomputed geometry of the road
+        :param start_index: Start index of the road piece
+        :param end_index: End index of the road piece (inclusive)
+        :param length_tolerance: Absolute tolerance of the lookup
+        :return: Length of the road piece
+        """
+        distance = geometry_index.get_length(start_index, end_index)
+        if abs(distance - self.__decision_distance) <= length_tolerance:
+            current_road_piece = road_points[start_index : end_index + 1]
+            distance = self.__road_geometry_calculator.get_road_length(current_road_piece)
+        return distance
+
+    def __get_next_decision_index(self, i, start_index, cumulative_lengths, length_tolerance):
+        """
+        Find the next iteration in which the road piece starting at the given index might be long enough for a
+        decision. All skipped iterations are guaranteed to be shorter than the decision distance.
+
+        :param i: Current iteration
+        :param start_index: Start index of the current road piece
+        :param cumulative_lengths: Cumulative length of the road
+        :param length_tolerance: Absolute tolerance of the cumulative lengths
+        :return: Next iteration to evaluate
+        """
+        nr_of_road_points = len(cumulative_lengths)
+        if self.__decision_distance <= length_tolerance or start_index >= nr_of_road_points:
+            return i + 1
+
+        # the road piece of iteration j ends at max(j + 1, start_index + 1) for all j >= start_index - 1
+        target_length = cumulative_lengths[start_index] + self.__decision_distance - length_tolerance
+        end_index = int(np.searchsorted(cumulative_lengths, target_length, side="left"))
+        if start_index + 1 >= end_index:
+            next_i = max(i + 1, start_index - 1)
+        else:
+            next_i = max(i + 1, end_index - 1)
+        return min(next_i, nr_of_road_points - 1)
+
+    def __is_close_to_threshold(self, previous_angle, current_angle, angle_tolerance):
+        """
+        Check if the angle comparison is too close to the threshold to rely on the looked up angles.
+
+        :param previous_angle: Previous angle
+        :param current_angle: Current angle
+        :param angle_tolerance: Absolute tolerance of the angles
+        :return: True if the angles need to be recomputed exactly
+        """
+        upper_bound = previous_angle + self.__angle_threshold
+        lower_bound = previous_angle - self.__angle_threshold
+        return (
+            abs(current_angle - upper_bound) <= angle_tolerance or abs(current_angle - lower_bound) <= angle_tolerance
+        )
+
+    def __get_exact_angle(self, road_points, angle_piece):
+        """
+        Sum of the turn angles of road_points[start:stop] computed point by point.
+
+        :param road_points: List of 2D points, defining the road to be segmented
+        :param angle_piece: Tuple of start and stop index or None for the initial angle
+        :return: Sum of the turn angles
+        """
+        if angle_piece is None:
+            return 0
+        start_index, stop_index = angle_piece
+        return sum(self.__road_geometry_calculator.extract_turn_angles(road_points[start_index:stop_index]))
+
+    def get_parameters(self) -> dict:
+        """
+        Parameters that influence the segmentation.
+
+        :return: Dictionary of parameter names and values
+        """
+        return {"angle_threshold": self.__angle_threshold, "decision_distance": self.__decision_distance}
+
     def __has_current_angle_changed(self, previous_angle, current_angle):
         """
         Check if there is a significant change of turn angles.
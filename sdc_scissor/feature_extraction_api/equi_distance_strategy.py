@@ -53,6 +53,14 @@ class EquiDistanceStrategy(SegmentationStrategy):
 
         return segments
 
+    def get_parameters(self) -> dict:
+        """
+        Parameters that influence the segmentation.
+
+        :return: Dictionary of parameter names and values
+        """
+        return {"number_of_segments": self.__number_of_segments}
+
 
 if __name__ == "__main__":
     import unittest
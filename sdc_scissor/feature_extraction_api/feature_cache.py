@@ -0,0 +1,214 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Increment whenever the feature extraction changes its results, so that stale cache entries are not served.
+FEATURE_VERSION = 1
+
+# Features that depend on the test execution and not on the road
+_TEST_SPECIFIC_FEATURES = ("test_duration", "safety")
+
+# connections inherited from the parent process, they are neither used nor closed since closing them would release the
+# locks of the parent
+_inherited_connections: list = []
+
+
+class FeatureCache:
+    def __init__(self, cache_path: Path):
+        """
+        On-disk cache of road features. Entries are addressed by a hash of the road points, the segmentation strategy
+        and its parameters, hence unchanged roads are served from the cache while new or modified roads are
+        recomputed. The cache is a SQLite database and can be shared by several processes. New entries are committed
+        right away and the accesses of cached entries are written on flush(), hence a process holds the write lock
+        of the database only for single short transactions. A forked process opens its own connection instead of
+        using the one of its parent.
+
+        :param cache_path: Path to the cache file
+        """
+        self.cache_path: Path = Path(cache_path)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__connection = None
+        # process that opened the connection and counted the hits, misses and accesses
+        self.__pid: int = os.getpid()
+        # last accesses of cached entries that are not written yet
+        self.__accesses: dict = {}
+
+    def __getstate__(self):
+        # connections cannot be shared with other processes, each process opens its own one
+        state = self.__dict__.copy()
+        state["_FeatureCache__connection"] = None
+        state["hits"] = 0
+        state["misses"] = 0
+        state["_FeatureCache__accesses"] = {}
+        return state
+
+    def __leave_parent_process(self):
+        # a forked process inherits the connection and the unflushed counts of its parent, neither belongs to it
+        if self.__pid == os.getpid():
+            return
+        if self.__connection is not None:
+            _inherited_connections.append(self.__connection)
+        self.__connection = None
+        self.hits, self.misses, self.__accesses = 0, 0, {}
+        self.__pid = os.getpid()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        self.__leave_parent_process()
+        if self.__connection is None:
+            # autocommit, every statement outside of an explicit transaction is committed right away
+            self.__connection = sqlite3.connect(self.cache_path, timeout=60, isolation_level=None)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS features "
+                "(key TEXT PRIMARY KEY, features TEXT NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS statistics (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+        return self.__connection
+
+    @contextlib.contextmanager
+    def __transaction(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    @staticmethod
+    def get_key(road_points, segmentation_strategy) -> str:
+        """
+        Content address of the road features of a road.
+
+        :param road_points: Points that define the road
+        :param segmentation_strategy: The segmentation strategy used to extract the features
+        :return: Hex digest identifying the road features
+        """
+        points = np.ascontiguousarray(np.asarray(road_points, dtype=np.float64))
+        strategy = {
+            "feature_version": FEATURE_VERSION,
+            "strategy": type(segmentation_strategy).__name__,
+            "parameters": segmentation_strategy.get_parameters(),
+            "shape": points.shape,
+        }
+        sha256 = hashlib.sha256(json.dumps(strategy, sort_keys=True).encode())
+        sha256.update(points.tobytes())
+        return sha256.hexdigest()
+
+    def get(self, key: str):
+        """
+        Look up the cached road features.
+
+        :param key: Content address of the road features
+        :return: Dictionary of the road features or None if they are not cached
+        """
+        row = self.connection.execute("SELECT features FROM features WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__accesses[key] = time.time()
+        return json.loads(row[0])
+
+    def put(self, key: str, road_features: dict):
+        """
+        Store road features in the cache, the entry is committed right away. Test specific features like the test
+        duration and outcome are omitted.
+
+        :param key: Content address of the road features
+        :param road_features: Dictionary of the road features
+        """
+        features = {name: value for name, value in road_features.items() if name not in _TEST_SPECIFIC_FEATURES}
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO features (key, features, created, last_access) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(features), now, now),
+        )
+
+    def flush(self):
+        """
+        Write the accesses of cached entries and add the hits and misses since the last flush to the persisted
+        statistics in a single transaction.
+        """
+        self.__leave_parent_process()
+        if self.hits == 0 and self.misses == 0 and not self.__accesses:
+            return
+        with self.__transaction() as connection:
+            connection.executemany(
+                "UPDATE features SET last_access = ? WHERE key = ?",
+                [(last_access, key) for key, last_access in self.__accesses.items()],
+            )
+            for name, value in (("hits", self.hits), ("misses", self.misses)):
+                connection.execute(
+                    "INSERT INTO statistics (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, value),
+                )
+        self.hits, self.misses = 0, 0
+        self.__accesses = {}
+
+    def close(self):
+        """
+        Flush and close the connection to the cache.
+        """
+        self.flush()
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def get_statistics(self) -> dict:
+        """
+        Statistics of the cache, including the hits and misses of all flushed lookups.
+
+        :return: Dictionary with the number of entries, hits, misses and the size of the cache file in bytes
+        """
+        statistics = {"entries": self.connection.execute("SELECT COUNT(*) FROM features").fetchone()[0]}
+        persisted = dict(self.connection.execute("SELECT name, value FROM statistics").fetchall())
+        statistics["hits"] = persisted.get("hits", 0) + self.hits
+        statistics["misses"] = persisted.get("misses", 0) + self.misses
+        statistics["size_in_bytes"] = self.cache_path.stat().st_size if self.cache_path.exists() else 0
+        return statistics
+
+    def evict(self, max_entries: int = None, max_age_in_days: float = None) -> int:
+        """
+        Remove the least recently used entries.
+
+        :param max_entries: Number of entries to keep at most
+        :param max_age_in_days: Remove entries that were not accessed within the given number of days
+        :return: Number of removed entries
+        """
+        # the recent accesses decide which entries are kept
+        self.flush()
+        nr_of_entries_before = self.connection.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+        with self.__transaction() as connection:
+            if max_age_in_days is not None:
+                oldest_last_access = time.time() - max_age_in_days * 24 * 60 * 60
+                connection.execute("DELETE FROM features WHERE last_access < ?", (oldest_last_access,))
+            if max_entries is not None:
+                connection.execute(
+                    "DELETE FROM features WHERE key NOT IN (SELECT key FROM features ORDER BY last_access DESC LIMIT ?)",
+                    (max_entries,),
+                )
+        nr_of_entries_after = self.connection.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+        logging.info("Evicted {} entries from the feature cache".format(nr_of_entries_before - nr_of_entries_after))
+        return nr_of_entries_before - nr_of_entries_after
+
+    def compact(self):
+        """
+        Reclaim the disk space of removed entries.
+        """
+        self.flush()
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.connection.execute("VACUUM")
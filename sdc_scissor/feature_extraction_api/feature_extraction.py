@@ -1,17 +1,70 @@
 import logging
-import math
+import operator
 import statistics
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
-from shapely.geometry import Point, Polygon
 
+from sdc_scissor.feature_extraction_api.feature_cache import FeatureCache
+from sdc_scissor.feature_extraction_api.road_features_writer import RoadFeaturesWriter
 from sdc_scissor.feature_extraction_api.road_geometry_calculator import RoadGeometryCalculator
+from sdc_scissor.feature_extraction_api.road_geometry_index import RoadGeometryIndex
 from sdc_scissor.testing_api.test import Test
 
+_FIELD_TYPES = {"num_l_turns": np.int64, "num_r_turns": np.int64, "num_straights": np.int64, "safety": object}
+
 
 class RoadFeatures:
+    # fixed order of the features, which is also the column order of the road_features.csv file
+    FIELDS = (
+        "direct_distance",
+        "full_road_diversity",
+        "max_angle",
+        "max_pivot_off",
+        "mean_angle",
+        "mean_pivot_off",
+        "mean_road_diversity",
+        "median_angle",
+        "median_pivot_off",
+        "min_angle",
+        "min_pivot_off",
+        "num_l_turns",
+        "num_r_turns",
+        "num_straights",
+        "road_distance",
+        "safety",
+        "std_angle",
+        "std_pivot_off",
+        "test_duration",
+        "total_angle",
+    )
+    __slots__ = FIELDS
+
+    # features the machine learning models are trained on, in the column order of the feature matrix
+    MODEL_FIELDS = (
+        "full_road_diversity",
+        "mean_road_diversity",
+        "direct_distance",
+        "max_angle",
+        "max_pivot_off",
+        "mean_angle",
+        "mean_pivot_off",
+        "median_angle",
+        "median_pivot_off",
+        "min_angle",
+        "min_pivot_off",
+        "num_l_turns",
+        "num_r_turns",
+        "num_straights",
+        "road_distance",
+        "std_angle",
+        "std_pivot_off",
+        "total_angle",
+    )
+
+    # structured array type holding the road features of many tests
+    DTYPE = np.dtype([(field, _FIELD_TYPES.get(field, np.float64)) for field in FIELDS])
+
     def __init__(self):
         """
         Class representing the road features as attributes
@@ -43,14 +96,50 @@ class RoadFeatures:
 
         :return: A dictionary with the road features
         """
-        members = [attr for attr in dir(self) if not callable(getattr(self, attr)) and not attr.startswith("__")]
-        res = {}
-        for member in members:
-            res[member] = [getattr(self, member)]
-        return res
+        return {field: [value] for field, value in zip(self.FIELDS, self.to_row())}
+
+    def to_row(self) -> tuple:
+        """
+        Serialize the road features to a tuple in the order of FIELDS.
+
+        :return: A tuple with the road features
+        """
+        return _get_road_features_row(self)
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Create road features from a sequence of values in the order of FIELDS.
+
+        :param row: Sequence of feature values
+        :return: A road features object
+        """
+        road_features = cls.__new__(cls)
+        for field, value in zip(cls.FIELDS, row):
+            setattr(road_features, field, value)
+        return road_features
+
+    @classmethod
+    def to_structured_array(cls, road_features: list) -> np.ndarray:
+        """
+        Convert the road features of many tests to a structured array with the type DTYPE.
+
+        :param road_features: List of road feature objects
+        :return: Structured array with one record per road features object
+        """
+        records = np.empty(len(road_features), dtype=cls.DTYPE)
+        columns = zip(*map(_get_road_features_row, road_features)) if road_features else ()
+        for field, column in zip(cls.FIELDS, columns):
+            records[field] = column
+        return records
+
+
+_get_road_features_row = operator.attrgetter(*RoadFeatures.FIELDS)
 
 
 class RoadSegment:
+    __slots__ = ("start_index", "end_index", "type", "angle", "radius", "segment_diversity")
+
     def __init__(self):
         """
         A class representing a road segment
@@ -70,14 +159,16 @@ class SegmentType:
 
 
 class FeatureExtractor:
-    def __init__(self, segmentation_strategy):
+    def __init__(self, segmentation_strategy, feature_cache: FeatureCache = None):
         """
         A class that is responsible for extracting road features of test scenarios.
 
         :param segmentation_strategy: A road segmentation strategy
+        :param feature_cache: Optional cache serving the features of roads that were extracted before
         """
         self.__road_geometry_calculator = RoadGeometryCalculator()
         self.__segmentation_strategy = segmentation_strategy
+        self.feature_cache: FeatureCache = feature_cache
 
     @staticmethod
     def save_to_csv(road_features: list, out_dir: Path):
@@ -88,18 +179,8 @@ class FeatureExtractor:
         :param out_dir: Path to store the csv file
         """
         logging.debug("save_to_csv")
-        dd = pd.DataFrame()
-        for test_id, rf in road_features:
-            rf_dict = rf.to_dict()
-            rf_dict["test_id"] = test_id
-            logging.debug(rf_dict)
-            rf_dd = pd.DataFrame(rf_dict)
-            logging.debug(rf_dd)
-            dd = pd.concat([dd, rf_dd], ignore_index=True)
-
-        logging.debug(dd)
-        out_path = out_dir / "road_features.csv"
-        dd.to_csv(out_path)
+        with RoadFeaturesWriter(out_dir) as road_features_writer:
+            road_features_writer.write_all(road_features)
 
     def extract_features(self, test: Test) -> RoadFeatures:
         """
@@ -107,23 +188,67 @@ class FeatureExtractor:
         This function extract the angles and radius of segments.
         Furthermore, the statistics of angles and radius are calculated.
 
+        :param test: A test object
+        :return: A road feature object
+        """
+        if self.feature_cache is None:
+            return self.__extract_features(test)
+
+        key = self.feature_cache.get_key(test.road_points, self.__segmentation_strategy)
+        cached_features: dict = self.feature_cache.get(key)
+        if cached_features is None:
+            road_features = self.__extract_features(test)
+            self.feature_cache.put(key, dict(zip(RoadFeatures.FIELDS, road_features.to_row())))
+            return road_features
+
+        road_features = RoadFeatures()
+        for name, value in cached_features.items():
+            setattr(road_features, name, value)
+        road_features.test_duration = test.test_duration
+        return road_features
+
+    def extract_features_batch(self, tests: list[Test], features=RoadFeatures.MODEL_FIELDS) -> tuple:
+        """
+        Extract the road features of many tests directly into a feature matrix that machine learning models can
+        consume without any data frame conversions.
+
+        :param tests: List of test objects
+        :param features: Names of the features to use as columns
+        :return: Tuple of the (len(tests), len(features)) float64 feature matrix and the list of column names
+        """
+        columns = list(features)
+        get_row = operator.attrgetter(*columns)
+        feature_matrix = np.empty((len(tests), len(columns)), dtype=np.float64)
+        for i, test in enumerate(tests):
+            feature_matrix[i] = get_row(self.extract_features(test))
+        return feature_matrix, columns
+
+    def __extract_features(self, test: Test) -> RoadFeatures:
+        """
+        Segment the road of the test and compute the road features.
+
         :param test: A test object
         :return: A road feature object
         """
         segments: list = []
+        geometry_index = RoadGeometryIndex(test.road_points)
         segment_indexes_list = self.__segmentation_strategy.extract_segments(test.road_points)
-        for indexes in segment_indexes_list:
-            segment: RoadSegment = self.__get_road_segment_with_features(test, indexes)
+        segment_diversities = self.__road_geometry_calculator.get_segment_diversities(
+            test.road_points, segment_indexes_list
+        )
+        for indexes, segment_diversity in zip(segment_indexes_list, segment_diversities):
+            segment: RoadSegment = self.__get_road_segment_with_features(geometry_index, indexes, segment_diversity)
             segments.append(segment)
 
-        road_features: RoadFeatures = self.__get_full_road_features_from(test, segments)
+        road_features: RoadFeatures = self.__get_full_road_features_from(test, geometry_index, segments)
         return road_features
 
-    def __get_full_road_features_from(self, test: Test, segments: list[RoadSegment]):
+    def __get_full_road_features_from(self, test: Test, geometry_index: RoadGeometryIndex, segments: list[RoadSegment]):
         """
         Compute full road features based on all segments.
 
         :param test: Test object.
+        :param geometry_index: Precomputed geometry of the test's road.
         :param segments: List of road segments.
         :return: An object containing road features as attributes.
         """
@@ -173,27 +298,20 @@ class FeatureExtractor:
         road_features.direct_distance = self.__road_geometry_calculator.get_distance_between(
             test.road_points[0], test.road_points[-1]
         )
-        road_features.road_distance = self.__road_geometry_calculator.get_road_length(test.road_points)
+        road_features.road_distance = geometry_index.road_length
 
         return road_features
 
-    def __get_segment_type(self, test: Test, road_segment, angle_threshold):
+    def __get_segment_type(self, geometry_index: RoadGeometryIndex, road_segment, angle_threshold):
         """
         Return the type of segment (straight, left turn, right turn). The segment
         is defined by its start and end index that are already specified.
-        :param test:
+        :param geometry_index:
         :param road_segment:
         :param angle_threshold:
         :return:
         """
-        start_index = road_segment.start_index
-        end_index = road_segment.end_index
-
-        segment_road_points = test.road_points[start_index : end_index + 1]
-
-        angles_lst = self.__road_geometry_calculator.extract_turn_angles(segment_road_points)
-
-        angles_sum = sum(angles_lst)
+        angles_sum = geometry_index.get_angle_sum(road_segment.start_index, road_segment.end_index)
 
         if angle_threshold > angles_sum > -angle_threshold:
             return SegmentType.straight
@@ -202,79 +320,36 @@ class FeatureExtractor:
         if angles_sum <= angle_threshold:
             return SegmentType.r_turn
 
-    def __get_segment_angle(self, test: Test, road_segment):
+    def __get_segment_angle(self, geometry_index: RoadGeometryIndex, road_segment):
         """
 
-        :param test:
+        :param geometry_index:
         :param road_segment:
         :return:
         """
-        start_index = road_segment.start_index
-        end_index = road_segment.end_index
-
-        segment_road_points = test.road_points[start_index : end_index + 1]
-
-        angles_lst = self.__road_geometry_calculator.extract_turn_angles(segment_road_points)
+        return geometry_index.get_angle_sum(road_segment.start_index, road_segment.end_index)
 
-        angles_sum = sum(angles_lst)
-
-        return angles_sum
-
-    def __get_segment_radius(self, test: Test, road_segment):
+    def __get_segment_radius(self, geometry_index: RoadGeometryIndex, road_segment):
         """
 
-        :param test:
+        :param geometry_index:
         :param road_segment:
         :return:
         """
         if road_segment.type == SegmentType.straight:
             return 0
 
-        start_index = road_segment.start_index
-        end_index = road_segment.end_index
-
-        segment_road_points = test.road_points[start_index : end_index + 1]
+        return geometry_index.get_radius(road_segment.start_index, road_segment.end_index)
 
-        angles_lst = self.__road_geometry_calculator.extract_turn_angles(segment_road_points)
-        segment_length = self.__road_geometry_calculator.get_road_length(segment_road_points)
-
-        angles_sum = sum(angles_lst)
-
-        unsigned_angle = abs(angles_sum)
-
-        # C=2*pi*r
-        proportion = unsigned_angle / 360
-        circle_length = segment_length / proportion
-        radius = circle_length / (2 * math.pi)
-
-        return radius
-
-    def __get_segment_diversity(self, test: Test, road_segment: RoadSegment) -> float:
-        """
-        Compute the diversity of the road segment compared to a straight trajectory.
-
-        :param test: A test object
-        :param road_segment: A road segment object
-        :return: The measure of diversity
-        """
-        road_points = test.road_points
-        start_index, end_index = road_segment.start_index, road_segment.end_index
-        segment_road_points = road_points[start_index : end_index + 1]
-        start_point, end_point = Point(segment_road_points[0][:2]), Point(segment_road_points[-1][:2])
-
-        polygon_points: list[Point] = [Point(rp[0], rp[1]) for rp in segment_road_points]
-        polygon_points.extend([end_point, start_point])
-        segment_diversity_polygon: Polygon = Polygon(polygon_points)
-
-        segment_diversity = segment_diversity_polygon.area
-        return segment_diversity
-
-    def __get_road_segment_with_features(self, test: Test, indexes) -> RoadSegment:
+    def __get_road_segment_with_features(
+        self, geometry_index: RoadGeometryIndex, indexes, segment_diversity: float
+    ) -> RoadSegment:
         """
         Compute segment features and create a segment object accordingly.
 
-        :param test: A test object
+        :param geometry_index: Precomputed geometry of the test's road
         :param indexes: Start and end index of a single segment of the road specified in the test.
+        :param segment_diversity: Diversity of the segment compared to a straight trajectory.
         :return: A road segment object with segment specific features.
         """
         road_segment = RoadSegment()
@@ -282,14 +357,14 @@ class FeatureExtractor:
         road_segment.end_index = indexes[1]
 
         # classify segment type
-        road_segment.type = self.__get_segment_type(test, road_segment, angle_threshold=5)
+        road_segment.type = self.__get_segment_type(geometry_index, road_segment, angle_threshold=5)
 
         # update angle
-        road_segment.angle = self.__get_segment_angle(test, road_segment)
+        road_segment.angle = self.__get_segment_angle(geometry_index, road_segment)
 
         # calculate radius
-        road_segment.radius = self.__get_segment_radius(test, road_segment)
+        road_segment.radius = self.__get_segment_radius(geometry_index, road_segment)
 
-        road_segment.segment_diversity = self.__get_segment_diversity(test, road_segment)
+        road_segment.segment_diversity = float(segment_diversity)
 
         return road_segment
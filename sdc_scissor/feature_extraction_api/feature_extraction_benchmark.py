@@ -0,0 +1,295 @@
+import json
+import logging
+import math
+import os
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from sdc_scissor.feature_extraction_api.angle_based_strategy import AngleBasedStrategy
+from sdc_scissor.feature_extraction_api.equi_distance_strategy import EquiDistanceStrategy
+from sdc_scissor.feature_extraction_api.feature_extraction import FeatureExtractor
+from sdc_scissor.feature_extraction_api.parameterized_uniform_strategy import ParameterizedUniformStrategy
+from sdc_scissor.feature_extraction_api.road_geometry_calculator import RoadGeometryCalculator
+from sdc_scissor.testing_api.test import Test
+from sdc_scissor.testing_api.test_loader import TestLoader
+from sdc_scissor.testing_api.test_validator import SimpleTestValidator
+
+BASELINE_VERSION = 1
+
+
+class FeatureExtractionBenchmark:
+    def __init__(
+        self,
+        tests_dir: Path = None,
+        nr_of_road_points: tuple = (50, 100, 200, 400, 800),
+        nr_of_synthetic_roads: int = 20,
+        repetitions: int = 3,
+        min_seconds: float = 0.2,
+        seed: int = 0,
+    ):
+        """
+        Benchmark of the feature extraction pipeline. Each phase, i.e., the road geometry computations, every
+        segmentation strategy and the full feature extraction, is timed on the tests of a directory and on synthetic
+        roads of growing length. Every timed run repeats the corpus until it took at least min_seconds, so that short
+        phases are measured reliably. The throughput of a phase is based on the fastest of the repetitions, its peak
+        memory is measured in an additional traced run.
+
+        :param tests_dir: Optional directory with tests, e.g., the sample tests
+        :param nr_of_road_points: Number of road points of the synthetic roads, one corpus per entry
+        :param nr_of_synthetic_roads: Number of synthetic roads per corpus
+        :param repetitions: Number of timed runs per phase
+        :param min_seconds: Minimum duration of a timed run
+        :param seed: Seed for generating the synthetic roads
+        """
+        self.tests_dir: Path = Path(tests_dir) if tests_dir else None
+        self.nr_of_road_points: tuple = tuple(nr_of_road_points)
+        self.nr_of_synthetic_roads: int = nr_of_synthetic_roads
+        self.repetitions: int = repetitions
+        self.min_seconds: float = min_seconds
+        self.seed: int = seed
+        self.__road_geometry_calculator = RoadGeometryCalculator()
+
+    @staticmethod
+    def get_synthetic_road(nr_of_road_points: int, rng: np.random.Generator, step_length: float = 2.0) -> list[list]:
+        """
+        Generate a smooth road consisting of straights and turns of random curvature.
+
+        :param nr_of_road_points: Number of road points
+        :param rng: Random number generator
+        :param step_length: Distance between two consecutive road points in meters
+        :return: List of road points
+        """
+        heading_changes = np.empty(nr_of_road_points - 1)
+        i = 0
+        while i < heading_changes.shape[0]:
+            piece_length = int(rng.integers(5, 30))
+            curvature = 0.0 if rng.random() < 0.3 else rng.uniform(-4.0, 4.0)
+            heading_changes[i : i + piece_length] = math.radians(curvature)
+            i += piece_length
+
+        headings = np.cumsum(heading_changes)
+        road_points = np.zeros((nr_of_road_points, 2))
+        road_points[1:, 0] = np.cumsum(step_length * np.cos(headings))
+        road_points[1:, 1] = np.cumsum(step_length * np.sin(headings))
+        return road_points.tolist()
+
+    def get_corpora(self) -> dict:
+        """
+        Load the tests of the tests directory and generate the synthetic roads.
+
+        :return: Dictionary mapping the name of a corpus to its list of tests
+        """
+        corpora = {}
+        if self.tests_dir is not None:
+            test_loader = TestLoader(self.tests_dir, test_validator=SimpleTestValidator())
+            tests = []
+            while test_loader.has_next():
+                test, _ = test_loader.next()
+                tests.append(test)
+            corpora[self.tests_dir.name] = tests
+
+        rng = np.random.default_rng(self.seed)
+        for nr_of_road_points in self.nr_of_road_points:
+            corpora["synthetic_{}".format(nr_of_road_points)] = [
+                Test(i, self.get_synthetic_road(nr_of_road_points, rng), "NOT_EXECUTED")
+                for i in range(self.nr_of_synthetic_roads)
+            ]
+        return corpora
+
+    def get_phases(self) -> dict:
+        """
+        Phases of the feature extraction pipeline that are benchmarked. Every phase processes a single test.
+
+        :return: Dictionary mapping the name of a phase to a callable
+        """
+
+        def compute_geometry(test: Test):
+            self.__road_geometry_calculator.get_turn_angles_array(test.road_points)
+            self.__road_geometry_calculator.get_cumulative_road_lengths(test.road_points)
+
+        angle_based_strategy = AngleBasedStrategy(angle_threshold=5, decision_distance=10)
+        equi_distance_strategy = EquiDistanceStrategy(number_of_segments=10)
+        parameterized_uniform_strategy = ParameterizedUniformStrategy(
+            risk_factor="1.5", max_seg_length_to_full_road=0.5
+        )
+        feature_extractor = FeatureExtractor(segmentation_strategy=angle_based_strategy)
+
+        return {
+            "geometry": compute_geometry,
+            "angle_based_segmentation": lambda test: angle_based_strategy.extract_segments(test.road_points),
+            "equi_distance_segmentation": lambda test: equi_distance_strategy.extract_segments(test.road_points),
+            "parameterized_uniform_segmentation": lambda test: parameterized_uniform_strategy.extract_segments(
+                test.road_points
+            ),
+            "feature_extraction": feature_extractor.extract_features,
+        }
+
+    def run(self) -> dict:
+        """
+        Run all phases on all corpora.
+
+        :return: Dictionary with the environment and per corpus and phase the seconds, the throughput in roads per
+            second and the peak memory in bytes
+        """
+        corpora = self.get_corpora()
+        results = {
+            "version": BASELINE_VERSION,
+            "environment": self.get_environment(),
+            "calibration_seconds": self.get_calibration_seconds(),
+            "corpora": {},
+        }
+        for corpus_name, tests in corpora.items():
+            logging.info("benchmark corpus {} with {} roads".format(corpus_name, len(tests)))
+            corpus_results = {}
+            for phase_name, phase in self.get_phases().items():
+                seconds = min(self.__time_phase(phase, tests) for _ in range(self.repetitions))
+                corpus_results[phase_name] = {
+                    "seconds": seconds,
+                    "roads_per_second": len(tests) / seconds if seconds > 0 else math.inf,
+                    "peak_memory_in_bytes": self.__trace_phase(phase, tests),
+                }
+            results["corpora"][corpus_name] = corpus_results
+        return results
+
+    def __time_phase(self, phase, tests: list[Test]) -> float:
+        """
+        Time a phase on a corpus.
+
+        :param phase: Callable processing a single test
+        :param tests: Tests of the corpus
+        :return: Seconds needed to process the corpus once
+        """
+        nr_of_runs = 0
+        start_time = time.perf_counter()
+        elapsed_time = 0.0
+        while nr_of_runs == 0 or elapsed_time < self.min_seconds:
+            for test in tests:
+                phase(test)
+            nr_of_runs += 1
+            elapsed_time = time.perf_counter() - start_time
+        return elapsed_time / nr_of_runs
+
+    @staticmethod
+    def __trace_phase(phase, tests: list[Test]) -> int:
+        """
+        Measure the peak memory a phase allocates while processing a corpus.
+
+        :param phase: Callable processing a single test
+        :param tests: Tests of the corpus
+        :return: Peak of the traced memory in bytes
+        """
+        tracemalloc.start()
+        try:
+            for test in tests:
+                phase(test)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak_memory
+
+    def get_calibration_seconds(self) -> float:
+        """
+        Time a fixed reference workload that does not depend on SDC-Scissor. Throughputs are compared relative to
+        it, hence a generally slower or faster machine state is not reported as a regression.
+
+        :return: Seconds of the reference workload
+        """
+        points = np.random.default_rng(0).random((1000, 2))
+
+        def reference_workload(_):
+            sum(math.hypot(x, y) for x, y in points.tolist())
+            np.cumsum(np.hypot(*np.diff(points, axis=0).T))
+
+        return min(self.__time_phase(reference_workload, [None] * 10) for _ in range(self.repetitions))
+
+    @staticmethod
+    def get_environment() -> dict:
+        """
+        Environment the benchmark runs in. Baselines are only comparable within the same environment.
+
+        :return: Dictionary describing the machine and the relevant package versions
+        """
+        return {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        }
+
+    @staticmethod
+    def save_baseline(results: dict, baseline_path: Path):
+        """
+        Store benchmark results as a baseline.
+
+        :param results: Results of a benchmark run
+        :param baseline_path: Path of the JSON file
+        """
+        with open(baseline_path, "w") as fp:
+            json.dump(results, fp, indent=2)
+
+    @staticmethod
+    def load_baseline(baseline_path: Path) -> dict:
+        """
+        Load a stored baseline.
+
+        :param baseline_path: Path of the JSON file
+        :return: Results of the baseline run
+        """
+        with open(baseline_path) as fp:
+            baseline = json.load(fp)
+        if baseline.get("version") != BASELINE_VERSION:
+            raise Exception("Unsupported benchmark baseline version: {}".format(baseline.get("version")))
+        return baseline
+
+    @staticmethod
+    def get_regressions(
+        results: dict, baseline: dict, tolerance: float = 0.2, min_memory_growth_in_bytes: int = 2**20
+    ) -> list[str]:
+        """
+        Compare benchmark results with a baseline. A phase regressed if its throughput dropped or its peak memory grew
+        by more than the tolerance. The baseline throughput is scaled by the speed of the reference workload in both
+        runs. Corpora and phases missing in either run are ignored.
+
+        :param results: Results of a benchmark run
+        :param baseline: Results of the baseline run
+        :param tolerance: Relative deviation that is accepted
+        :param min_memory_growth_in_bytes: Growth of the peak memory that is accepted regardless of the tolerance, so
+            that phases with a tiny or zero baseline peak memory do not regress by noise
+        :return: List of descriptions of the regressions
+        """
+        if results["environment"] != baseline["environment"]:
+            logging.warning("The baseline was recorded in a different environment, the comparison might be misleading")
+
+        machine_speed_factor = baseline["calibration_seconds"] / results["calibration_seconds"]
+        regressions = []
+        for corpus_name, corpus_results in results["corpora"].items():
+            baseline_corpus_results = baseline["corpora"].get(corpus_name, {})
+            for phase_name, phase_results in corpus_results.items():
+                baseline_phase_results = baseline_corpus_results.get(phase_name)
+                if baseline_phase_results is None:
+                    continue
+                throughput = phase_results["roads_per_second"]
+                baseline_throughput = machine_speed_factor * baseline_phase_results["roads_per_second"]
+                if throughput < (1 - tolerance) * baseline_throughput:
+                    regressions.append(
+                        "{}/{}: {:.1f} roads/s, baseline {:.1f} roads/s".format(
+                            corpus_name, phase_name, throughput, baseline_throughput
+                        )
+                    )
+                peak_memory = phase_results["peak_memory_in_bytes"]
+                baseline_peak_memory = baseline_phase_results["peak_memory_in_bytes"]
+                if (
+                    peak_memory > (1 + tolerance) * baseline_peak_memory
+                    and peak_memory - baseline_peak_memory > min_memory_growth_in_bytes
+                ):
+                    regressions.append(
+                        "{}/{}: {} bytes peak memory, baseline {} bytes".format(
+                            corpus_name, phase_name, peak_memory, baseline_peak_memory
+                        )
+                    )
+        return regressions
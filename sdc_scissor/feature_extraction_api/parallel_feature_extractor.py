@@ -0,0 +1,148 @@
+import functools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+from sdc_scissor.feature_extraction_api.feature_cache import FeatureCache
+from sdc_scissor.feature_extraction_api.feature_extraction import FeatureExtractor, RoadFeatures
+from sdc_scissor.testing_api.pipeline import Pipeline
+from sdc_scissor.testing_api.test_loader import TestLoader
+from sdc_scissor.testing_api.test_validator import TestValidator
+
+_worker_state: dict = {}
+
+
+def _init_worker(test_validator: TestValidator, segmentation_strategy, feature_cache: FeatureCache):
+    """
+    Set up the state every worker process reuses for all chunks it processes.
+
+    :param test_validator: Validator applied on every loaded test
+    :param segmentation_strategy: A road segmentation strategy
+    :param feature_cache: Optional feature cache
+    """
+    _worker_state["test_validator"] = test_validator
+    _worker_state["feature_extractor"] = FeatureExtractor(
+        segmentation_strategy=segmentation_strategy, feature_cache=feature_cache
+    )
+
+
+def _extract_features_in_worker(test_paths: list[Path]) -> tuple[list, list]:
+    """
+    Entry point of the worker processes.
+
+    :param test_paths: Paths to the JSON files of the tests
+    :return: Tuple of the (test_id, road_features) list in the order of the given paths and the (test_path, metadata)
+        list of the parsed tests
+    """
+    return _extract_features_from_paths(test_paths, _worker_state["test_validator"], _worker_state["feature_extractor"])
+
+
+def _extract_features_from_paths(
+    test_paths: list[Path], test_validator: TestValidator, feature_extractor: FeatureExtractor
+) -> tuple[list, list]:
+    """
+    Load, validate and extract the road features of a chunk of tests. Tests marked as invalid are skipped, the other
+    tests are validated as a batch.
+
+    :param test_paths: Paths to the JSON files of the tests
+    :param test_validator: Validator applied on every loaded test
+    :param feature_extractor: Feature extractor to use
+    :return: Tuple of the (test_id, road_features) list in the order of the given paths and the (test_path, metadata)
+        list of the parsed tests
+    """
+    tests = []
+    metadata_lst = []
+    for test_path in test_paths:
+        test_json = TestLoader.read_test_json(test_path)
+        metadata_lst.append((test_path, TestLoader.get_metadata(test_path, test_json)))
+        if not TestLoader.is_marked_as_valid(test_json):
+            continue
+        tests.append(TestLoader.get_test_from_json(test_path, test_json, test_validator=None))
+    # the tests of a chunk are validated together
+    test_validator.validate_batch(tests)
+    test_validator.flush()
+
+    road_features_lst = []
+    for test in tests:
+        road_features: RoadFeatures = feature_extractor.extract_features(test)
+        road_features.safety = test.test_outcome
+        road_features_lst.append((test.test_id, road_features))
+    if feature_extractor.feature_cache is not None:
+        feature_extractor.feature_cache.flush()
+    return road_features_lst, metadata_lst
+
+
+class ParallelFeatureExtractor:
+    def __init__(
+        self,
+        test_loader: TestLoader,
+        segmentation_strategy,
+        jobs: int = None,
+        chunk_size: int = 32,
+        feature_cache: FeatureCache = None,
+    ):
+        """
+        Extract the road features of all tests of a test loader on a pool of worker processes. Tests are sent to the
+        workers in chunks and the results are merged in the order the test loader provides the tests, hence the
+        result is identical to a serial extraction.
+
+        :param test_loader: Test loader providing the tests
+        :param segmentation_strategy: A road segmentation strategy
+        :param jobs: Number of worker processes (defaults to the number of CPUs)
+        :param chunk_size: Number of tests processed by a worker at once
+        :param feature_cache: Optional cache serving the features of roads that were extracted before
+        """
+        self.test_loader = test_loader
+        self.segmentation_strategy = segmentation_strategy
+        self.jobs: int = jobs if jobs else os.cpu_count()
+        self.chunk_size: int = chunk_size
+        self.feature_cache: FeatureCache = feature_cache
+
+    def extract_features(self) -> list[tuple]:
+        """
+        Extract the road features of all remaining tests of the test loader.
+
+        :return: List of (test_id, road_features) tuples
+        """
+        return list(self.iter_features())
+
+    def iter_features(self) -> Iterator[tuple]:
+        """
+        Extract the road features of all remaining tests of the test loader lazily. Chunks of test paths are only
+        taken from the test loader when the consumer requests more road features, hence the memory does not grow
+        with the number of tests.
+
+        :return: Iterator of (test_id, road_features) tuples
+        """
+        logging.debug("* extract_features with {} workers".format(self.jobs))
+        test_path_chunks = iter(lambda: self.test_loader.next_test_paths(self.chunk_size), [])
+        if self.jobs == 1:
+            feature_extractor = FeatureExtractor(
+                segmentation_strategy=self.segmentation_strategy, feature_cache=self.feature_cache
+            )
+            pipeline = Pipeline(test_path_chunks).map(
+                functools.partial(
+                    _extract_features_from_paths,
+                    test_validator=self.test_loader.test_validator,
+                    feature_extractor=feature_extractor,
+                )
+            )
+            yield from pipeline.map(self.__update_metadata).flatten()
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(self.test_loader.test_validator, self.segmentation_strategy, self.feature_cache),
+        ) as executor:
+            # bound the number of chunks in flight so that memory does not grow with the number of tests
+            pipeline = Pipeline(test_path_chunks, max_pending=2 * self.jobs)
+            pipeline.map(_extract_features_in_worker, executor=executor)
+            yield from pipeline.map(self.__update_metadata).flatten()
+
+    def __update_metadata(self, chunk_result: tuple) -> list[tuple]:
+        road_features_lst, metadata_lst = chunk_result
+        self.test_loader.update_metadata(metadata_lst)
+        return road_features_lst
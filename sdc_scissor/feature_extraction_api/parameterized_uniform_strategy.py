@@ -25,6 +25,17 @@ class ParameterizedUniformStrategy(SegmentationStrategy):
 
         self.__road_geometry_calculator = RoadGeometryCalculator()
 
+    def get_parameters(self) -> dict:
+        """
+        Parameters that influence the segmentation.
+
+        :return: Dictionary of parameter names and values
+        """
+        return {
+            "seg_length_in_meters": self.__seg_length_in_meters,
+            "max_seg_length_to_full_road": self.__max_seg_length_to_full_road,
+        }
+
     # TODO: formalize the clear segmentaion process
     def extract_segments(self, road_points):
         """
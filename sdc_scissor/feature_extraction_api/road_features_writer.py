@@ -0,0 +1,137 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_INTEGER_COLUMNS = ("num_l_turns", "num_r_turns", "num_straights")
+_STRING_COLUMNS = ("safety", "test_id")
+
+
+class RoadFeaturesWriter:
+    def __init__(self, out_dir: Path, batch_size: int = 10000, parquet: bool = False):
+        """
+        Columnar writer for road features. Features are appended to per-column buffers which are written to
+        road_features.csv in batches, hence the memory usage is bounded by the batch size and not by the number of
+        tests. Optionally, the same rows are also written to road_features.parquet (requires pyarrow).
+
+        :param out_dir: Directory to store the output files
+        :param batch_size: Number of rows buffered before they are written to disk
+        :param parquet: Additionally write a Parquet file
+        """
+        self.csv_path: Path = Path(out_dir) / "road_features.csv"
+        self.parquet_path: Path = Path(out_dir) / "road_features.parquet" if parquet else None
+        self.batch_size: int = batch_size
+        self.columns: list[str] = []
+        self.nr_of_rows: int = 0
+        self.__buffers: dict = {}
+        self.__parquet_writer = None
+        self.__is_header_written = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, test_id, road_features):
+        """
+        Append the road features of a single test. The columns are defined by the fields of the first written road
+        features.
+
+        :param test_id: Identifier of the test
+        :param road_features: Road features of the test
+        """
+        if not self.columns:
+            self.columns = list(road_features.FIELDS) + ["test_id"]
+            self.__buffers = {column: [] for column in self.columns}
+        for buffer, value in zip(self.__buffers.values(), road_features.to_row()):
+            buffer.append(value)
+        self.__buffers["test_id"].append(test_id)
+        if len(self.__buffers["test_id"]) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, road_features: list):
+        """
+        Append the road features of several tests.
+
+        :param road_features: List of (test_id, road_features) tuples
+        """
+        for test_id, rf in road_features:
+            self.write(test_id, rf)
+
+    def flush(self):
+        """
+        Write the buffered rows to disk.
+        """
+        if not self.columns:
+            if not self.__is_header_written:
+                pd.DataFrame().to_csv(self.csv_path)
+                self.__is_header_written = True
+            return
+        nr_of_buffered_rows = len(self.__buffers["test_id"])
+        if nr_of_buffered_rows == 0 and self.__is_header_written:
+            return
+        logging.debug("flush {} rows".format(nr_of_buffered_rows))
+
+        columns = {column: self.__to_array(column, values) for column, values in self.__buffers.items()}
+        dd = pd.DataFrame(columns, index=pd.RangeIndex(self.nr_of_rows, self.nr_of_rows + nr_of_buffered_rows))
+        dd.to_csv(self.csv_path, mode="a" if self.__is_header_written else "w", header=not self.__is_header_written)
+        self.__is_header_written = True
+
+        if self.parquet_path is not None:
+            self.__write_parquet(columns)
+
+        self.nr_of_rows += nr_of_buffered_rows
+        self.__buffers = {column: [] for column in self.columns}
+
+    def close(self):
+        """
+        Write the remaining rows and close the output files.
+        """
+        self.flush()
+        if self.__parquet_writer is not None:
+            self.__parquet_writer.close()
+            self.__parquet_writer = None
+
+    @staticmethod
+    def __to_array(column: str, values: list) -> np.ndarray:
+        """
+        Convert a column buffer to an array with a fixed type per column, so that all batches are formatted alike.
+
+        :param column: Name of the column
+        :param values: Buffered values of the column
+        :return: Typed array
+        """
+        if column in _STRING_COLUMNS:
+            return np.array(values, dtype=object)
+        if column in _INTEGER_COLUMNS:
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+    def __write_parquet(self, columns: dict):
+        """
+        Append a batch of rows to the Parquet file.
+
+        :param columns: Typed columns of the batch
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise Exception("Writing Parquet files requires the 'pyarrow' package.") from e
+
+        arrays = []
+        for column in self.columns:
+            if column in _STRING_COLUMNS:
+                values = [None if value is None else str(value) for value in columns[column]]
+                arrays.append(pa.array(values, type=pa.string()))
+            elif column in _INTEGER_COLUMNS:
+                arrays.append(pa.array(columns[column], type=pa.int64()))
+            else:
+                arrays.append(pa.array(columns[column], type=pa.float64()))
+        schema = pa.schema([(column, array.type) for column, array in zip(self.columns, arrays)])
+        table = pa.Table.from_arrays(arrays, schema=schema)
+        if self.__parquet_writer is None:
+            self.__parquet_writer = pq.ParquetWriter(self.parquet_path, schema)
+        self.__parquet_writer.write_table(table)
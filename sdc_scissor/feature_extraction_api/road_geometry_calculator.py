@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 class RoadGeometryCalculator:
     def extract_turn_angles(self, road_points):
@@ -91,3 +93,139 @@ class RoadGeometryCalculator:
             road_length += math.sqrt(c1**2 + c2**2)
 
         return road_length
+
+    @staticmethod
+    def pad_roads(roads):
+        """
+        Stack roads of different lengths into a single NaN-padded array.
+
+        :param roads: Sequence of roads, each given as a sequence of (x,y[,...]) points
+        :return: Tuple of the padded (num_roads, max_nr_of_road_points, 2) array and the number of points per road
+        """
+        lengths = np.array([len(road) for road in roads], dtype=np.intp)
+        max_length = int(lengths.max()) if len(lengths) else 0
+        padded = np.full((len(roads), max_length, 2), np.nan)
+        for i, road in enumerate(roads):
+            if lengths[i]:
+                padded[i, : lengths[i]] = np.asarray(road, dtype=float)[:, :2]
+        return padded, lengths
+
+    @staticmethod
+    def get_turn_angles_array(road_points) -> np.ndarray:
+        """
+        Vectorized counterpart of extract_turn_angles. Works on a single road of shape (n, 2) as well as on a batch of
+        roads of shape (num_roads, n, 2). NumPy's arctan2 may differ from math.atan2 in the last bits, hence the angles
+        agree with extract_turn_angles up to floating point rounding.
+
+        :param road_points: Array-like of road points
+        :return: Turn angles in degrees with shape (..., n-2)
+        """
+        points = np.asarray(road_points, dtype=float)[..., :2]
+        directions = np.diff(points, axis=-2)
+        headings = np.arctan2(directions[..., 1], directions[..., 0])
+        return np.degrees(headings[..., 1:] - headings[..., :-1])
+
+    @staticmethod
+    def get_segment_lengths(road_points) -> np.ndarray:
+        """
+        Vectorized Euclidean distances between consecutive road points.
+
+        :param road_points: Array-like of road points with shape (n, 2) or (num_roads, n, 2)
+        :return: Segment lengths with shape (..., n-1)
+        """
+        points = np.asarray(road_points, dtype=float)[..., :2]
+        directions = np.diff(points, axis=-2)
+        return np.sqrt(directions[..., 0] ** 2 + directions[..., 1] ** 2)
+
+    @staticmethod
+    def get_cumulative_road_lengths(road_points) -> np.ndarray:
+        """
+        Cumulative arc length along the road. The i-th entry equals get_road_length(road_points[: i + 1]).
+
+        :param road_points: Array-like of road points with shape (n, 2) or (num_roads, n, 2)
+        :return: Cumulative lengths with shape (..., n) starting with 0
+        """
+        segment_lengths = RoadGeometryCalculator.get_segment_lengths(road_points)
+        cumulative_lengths = np.zeros(segment_lengths.shape[:-1] + (segment_lengths.shape[-1] + 1,))
+        np.cumsum(segment_lengths, axis=-1, out=cumulative_lengths[..., 1:])
+        return cumulative_lengths
+
+    def get_batch_geometry(self, roads, lengths=None):
+        """
+        Compute turn angles, segment lengths and cumulative arc lengths of many roads in one vectorized pass.
+        Entries beyond the end of a road are NaN.
+
+        :param roads: Either a list of roads with different lengths or an already padded (num_roads, n, 2) array
+        :param lengths: Number of valid road points per road, required only for padded arrays with trailing garbage
+        :return: Tuple of turn angles (num_roads, n-2), segment lengths (num_roads, n-1) and cumulative lengths
+                 (num_roads, n)
+        """
+        if isinstance(roads, np.ndarray) and roads.ndim == 3:
+            padded = roads[..., :2].astype(float)
+            if lengths is None:
+                lengths = np.full(padded.shape[0], padded.shape[1], dtype=np.intp)
+        else:
+            padded, lengths = self.pad_roads(roads)
+        lengths = np.asarray(lengths, dtype=np.intp)
+
+        turn_angles = self.get_turn_angles_array(padded)
+        segment_lengths = self.get_segment_lengths(padded)
+        cumulative_lengths = self.get_cumulative_road_lengths(padded)
+
+        index = np.arange(padded.shape[1])
+        turn_angles[index[None, : turn_angles.shape[1]] >= (lengths - 2)[:, None]] = np.nan
+        segment_lengths[index[None, : segment_lengths.shape[1]] >= (lengths - 1)[:, None]] = np.nan
+        cumulative_lengths[index[None, :] >= lengths[:, None]] = np.nan
+
+        return turn_angles, segment_lengths, cumulative_lengths
+
+    @staticmethod
+    def get_segment_diversity(segment_road_points) -> float:
+        """
+        Area enclosed by the road segment and the straight line from its end back to its start, computed with the
+        shoelace formula. For self-intersecting segments the areas of lobes with opposite orientation cancel each
+        other, which is the same value Shapely reports for such (invalid) polygons.
+
+        :param segment_road_points: Road points of the segment
+        :return: The measure of diversity
+        """
+        nr_of_road_points = len(segment_road_points)
+        return float(
+            RoadGeometryCalculator.get_segment_diversities(segment_road_points, [(0, nr_of_road_points - 1)])[0]
+        )
+
+    @staticmethod
+    def get_segment_diversities(road_points, segment_indexes) -> np.ndarray:
+        """
+        Batch variant of get_segment_diversity computing the diversity of all segments of a road in one vectorized
+        pass.
+
+        :param road_points: Road points of the full road
+        :param segment_indexes: List of start and end indexes (both inclusive) of the segments
+        :return: Diversity of each segment
+        """
+        points = np.asarray(road_points, dtype=float).reshape(len(road_points), -1)[:, :2]
+        nr_of_segments = len(segment_indexes)
+        if nr_of_segments == 0 or points.shape[0] == 0:
+            return np.zeros(nr_of_segments)
+
+        indexes = np.asarray(segment_indexes, dtype=np.intp).reshape(nr_of_segments, 2)
+        start_indexes = indexes[:, 0]
+        end_indexes = np.minimum(indexes[:, 1], points.shape[0] - 1)
+        counts = np.maximum(end_indexes - start_indexes + 1, 0)
+
+        # gather the points of all segments into one flat array, each segment translated to its start point
+        segment_ids = np.repeat(np.arange(nr_of_segments), counts)
+        first_positions = np.cumsum(counts) - counts
+        flat_indexes = start_indexes[segment_ids] + np.arange(segment_ids.shape[0]) - first_positions[segment_ids]
+        relative_points = points[flat_indexes] - points[start_indexes[segment_ids]]
+
+        # the closing edge ends in the origin, hence only the edges along the segment contribute
+        cross_products = np.zeros(segment_ids.shape[0])
+        cross_products[:-1] = (
+            relative_points[:-1, 0] * relative_points[1:, 1] - relative_points[1:, 0] * relative_points[:-1, 1]
+        )
+        cross_products[first_positions[counts > 0] + counts[counts > 0] - 1] = 0
+
+        doubled_areas = np.bincount(segment_ids, weights=cross_products, minlength=nr_of_segments)
+        return np.abs(doubled_areas) / 2
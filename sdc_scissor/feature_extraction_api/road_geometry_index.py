@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+
+from sdc_scissor.feature_extraction_api.road_geometry_calculator import RoadGeometryCalculator
+
+
+class RoadGeometryIndex:
+    """
+    Precomputed geometry of a single road. Prefix sums of the turn angles and the cumulative arc length are computed
+    once so that the angle, length and radius of any road piece defined by its start and end index (both inclusive)
+    are constant time lookups.
+    """
+
+    def __init__(self, road_points):
+        """
+        Build the index for the given road.
+
+        :param road_points: Points that define the road in the test scenario.
+        """
+        points = np.asarray(road_points, dtype=float)[:, :2]
+        self.nr_of_road_points = points.shape[0]
+
+        turn_angles = RoadGeometryCalculator.get_turn_angles_array(points)
+        self.angle_prefix_sums = np.zeros(turn_angles.shape[0] + 1)
+        np.cumsum(turn_angles, out=self.angle_prefix_sums[1:])
+
+        self.cumulative_lengths = RoadGeometryCalculator.get_cumulative_road_lengths(points)
+
+    @property
+    def road_length(self) -> float:
+        """
+        Length of the full road.
+        """
+        return float(self.cumulative_lengths[-1])
+
+    def __clip(self, start_index, end_index):
+        # mimic the semantics of slicing road_points[start_index : end_index + 1]
+        return start_index, min(end_index, self.nr_of_road_points - 1)
+
+    def get_angle_sum(self, start_index, end_index) -> float:
+        """
+        Sum of the turn angles of the road piece, i.e., sum(extract_turn_angles(road_points[start:end + 1])).
+
+        :param start_index: Index of the first road point of the piece
+        :param end_index: Index of the last road point of the piece
+        :return: Sum of the turn angles in degrees
+        """
+        start_index, end_index = self.__clip(start_index, end_index)
+        if end_index - start_index < 2:
+            return 0.0
+        return float(self.angle_prefix_sums[end_index - 1] - self.angle_prefix_sums[start_index])
+
+    def get_length(self, start_index, end_index) -> float:
+        """
+        Length of the road piece, i.e., get_road_length(road_points[start:end + 1]).
+
+        :param start_index: Index of the first road point of the piece
+        :param end_index: Index of the last road point of the piece
+        :return: Length of the road piece
+        """
+        start_index, end_index = self.__clip(start_index, end_index)
+        if end_index <= start_index:
+            return 0.0
+        return float(self.cumulative_lengths[end_index] - self.cumulative_lengths[start_index])
+
+    def get_radius(self, start_index, end_index) -> float:
+        """
+        Radius of the circle whose arc has the same length and turn angle as the road piece.
+
+        :param start_index: Index of the first road point of the piece
+        :param end_index: Index of the last road point of the piece
+        :return: Radius of the road piece
+        """
+        unsigned_angle = abs(self.get_angle_sum(start_index, end_index))
+        segment_length = self.get_length(start_index, end_index)
+
+        # C=2*pi*r
+        proportion = unsigned_angle / 360
+        circle_length = segment_length / proportion
+        radius = circle_length / (2 * math.pi)
+
+        return radius
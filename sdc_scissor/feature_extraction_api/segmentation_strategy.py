@@ -14,3 +14,12 @@ class SegmentationStrategy(abc.ABC):
         :param road_points: Sequence of coordinates specifying the road.
         """
         pass
+
+    def get_parameters(self) -> dict:
+        """
+        Parameters that influence the segmentation. Two strategies of the same type with equal parameters must
+        produce the same segments.
+
+        :return: Dictionary of parameter names and values
+        """
+        return {}
@@ -5,6 +5,8 @@ import pandas as pd
 from sklearn.metrics import classification_report
 from sklearn.preprocessing import LabelEncoder
 
+from sdc_scissor.feature_extraction_api.feature_extraction import RoadFeatures
+
 
 class CostEffectivenessEvaluator:
     def __init__(self, classifier, data_frame: pd.DataFrame, label: str, time_attribute: str):
@@ -19,26 +21,7 @@ class CostEffectivenessEvaluator:
         self.data_frame = data_frame
         self.label = label
         self.time_attribute = time_attribute
-        self.X_model_attributes = [
-            "direct_distance",
-            "full_road_diversity",
-            "mean_road_diversity",
-            "max_angle",
-            "max_pivot_off",
-            "mean_angle",
-            "mean_pivot_off",
-            "median_angle",
-            "median_pivot_off",
-            "min_angle",
-            "min_pivot_off",
-            "num_l_turns",
-            "num_r_turns",
-            "num_straights",
-            "road_distance",
-            "std_angle",
-            "std_pivot_off",
-            "total_angle",
-        ]
+        self.X_model_attributes = list(RoadFeatures.MODEL_FIELDS)
 
     def evaluate_with_random_baseline(self, train_split=0.8, top_k=5):
         """
@@ -13,3 +13,15 @@ class CSVLoader:
         """
         dd = pd.read_csv(data_path)
         return dd
+
+    @staticmethod
+    def load_dataframe(data_path: Path):
+        """
+        Load the road features from a CSV file or, if the file has a .parquet suffix, from a Parquet file.
+
+        :param data_path: Path to the road features file
+        :return: Data frame with the road features
+        """
+        if Path(data_path).suffix == ".parquet":
+            return pd.read_parquet(data_path)
+        return CSVLoader.load_dataframe_from_csv(data_path)
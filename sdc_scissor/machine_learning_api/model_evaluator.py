@@ -14,32 +14,15 @@ from sklearn.naive_bayes import GaussianNB
 from sklearn.svm import LinearSVC
 from sklearn.tree import DecisionTreeClassifier
 
+from sdc_scissor.feature_extraction_api.feature_extraction import RoadFeatures
+
 
 class ModelEvaluator:
     def __init__(
         self,
         data_frame: pd.DataFrame,
         label: str,
-        features=(
-            "full_road_diversity",
-            "mean_road_diversity",
-            "direct_distance",
-            "max_angle",
-            "max_pivot_off",
-            "mean_angle",
-            "mean_pivot_off",
-            "median_angle",
-            "median_pivot_off",
-            "min_angle",
-            "min_pivot_off",
-            "num_l_turns",
-            "num_r_turns",
-            "num_straights",
-            "road_distance",
-            "std_angle",
-            "std_pivot_off",
-            "total_angle",
-        ),
+        features=RoadFeatures.MODEL_FIELDS,
     ):
         """
 
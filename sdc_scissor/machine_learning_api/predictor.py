@@ -1,9 +1,9 @@
+import itertools
 import logging
 from pathlib import Path
 
 import joblib
 import numpy as np
-import pandas as pd
 
 from sdc_scissor.feature_extraction_api.angle_based_strategy import AngleBasedStrategy
 from sdc_scissor.feature_extraction_api.feature_extraction import FeatureExtractor, RoadFeatures
@@ -11,56 +11,56 @@ from sdc_scissor.testing_api.test_loader import TestLoader
 
 
 class Predictor:
-    def __init__(self, test_loader: TestLoader, joblib_classifier: Path, label="safety"):
+    def __init__(
+        self,
+        test_loader: TestLoader,
+        joblib_classifier: Path,
+        label="safety",
+        batch_size: int = 256,
+        prefetch: int = 0,
+    ):
         """
 
         :param test_loader:
         :param joblib_classifier:
         :param label:
+        :param batch_size: Number of tests predicted at once
+        :param prefetch: Number of tests the test loader loads ahead in the background
         """
         self.test_loader = test_loader
         self.__classifier = joblib.load(joblib_classifier)
         self.feature_extractor = FeatureExtractor(segmentation_strategy=AngleBasedStrategy())
         self.label = label
-        self.X_model_attributes = [
-            "direct_distance",
-            "max_angle",
-            "max_pivot_off",
-            "mean_angle",
-            "mean_pivot_off",
-            "median_angle",
-            "median_pivot_off",
-            "min_angle",
-            "min_pivot_off",
-            "num_l_turns",
-            "num_r_turns",
-            "num_straights",
-            "road_distance",
-            "std_angle",
-            "std_pivot_off",
-            "total_angle",
-            "mean_road_diversity",
-            "full_road_diversity",
-        ]
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        self.X_model_attributes = list(RoadFeatures.MODEL_FIELDS)
 
     def predict(self):
         """
-        Predict the outcome of the tests and saves is as a json property to the test file.
+        Predict the outcome of the tests and saves is as a json property to the test file. The tests are predicted in
+        batches, i.e., the features of a batch are extracted into one feature matrix which is passed to the classifier
+        at once.
         """
         logging.info("predict")
-        while self.test_loader.has_next():
-            test, test_path = self.test_loader.next()
-            road_features: RoadFeatures = self.feature_extractor.extract_features(test)
-            road_features_dict = road_features.to_dict()
-            road_features_df = pd.DataFrame(road_features_dict)
-            X: np.ndarray = road_features_df[self.X_model_attributes].to_numpy()
-            y_pred: int = self.__classifier.predict(X)[0]
-            if y_pred == 1:
-                test.predicted_test_outcome = "FAIL"
-            elif y_pred == 0:
-                test.predicted_test_outcome = "PASS"
-            else:
-                logging.warning("Prediction failed!")
-                raise Exception("Prediction failed!")
-            logging.info("predicted outcome: {}".format(test.predicted_test_outcome))
-            test.save_as_json(file_path=test_path)
+        tests_with_paths_iterator = self.test_loader.iter_tests(prefetch=self.prefetch)
+        while True:
+            tests_with_paths = list(itertools.islice(tests_with_paths_iterator, self.batch_size))
+            if not tests_with_paths:
+                break
+
+            X, _ = self.feature_extractor.extract_features_batch(
+                [test for test, _ in tests_with_paths], features=self.X_model_attributes
+            )
+            y_pred: np.ndarray = self.__classifier.predict(X)
+
+            for (test, test_path), y in zip(tests_with_paths, y_pred):
+                if y == 1:
+                    test.predicted_test_outcome = "FAIL"
+                elif y == 0:
+                    test.predicted_test_outcome = "PASS"
+                else:
+                    logging.warning("Prediction failed!")
+                    raise Exception("Prediction failed!")
+                logging.info("predicted outcome: {}".format(test.predicted_test_outcome))
+                test.save_as_json(file_path=test_path)
+                self.test_loader.update_test_metadata(test_path, test)
@@ -0,0 +1,354 @@
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"SDCPACK1"
+CORPUS_VERSION = 1
+
+# footer layout: JSON header, its length as unsigned 64-bit integer and the magic bytes
+_FOOTER_STRUCT = struct.Struct("<Q8s")
+_ALIGNMENT = 64
+
+_POINT_ARRAYS = ("road_points", "interpolated_road_points")
+# keys of the former layout of the JSON test files, they are only part of the tests that have them
+_LEGACY_POINT_ARRAYS = ("interpolated_points",)
+_LEGACY_DURATIONS = ("simulation_time",)
+_CATEGORICAL_ARRAYS = ("test_outcome", "predicted_test_outcome")
+# encoding of the is_valid flag, tests without the flag are considered valid and null is considered invalid
+_VALIDITY_CODES = {False: 0, True: 1, None: 2}
+_MISSING_VALIDITY = -1
+
+_opened_corpora: dict = {}
+
+
+class PackedTestPath:
+    __slots__ = ("corpus_path", "index", "name")
+
+    def __init__(self, corpus_path: Path, index: int, name: str):
+        """
+        Reference to a test inside a packed test corpus. It takes the place of the path of a JSON test file, hence it
+        is cheap to pickle and send to worker processes.
+
+        :param corpus_path: Path to the packed test corpus
+        :param index: Position of the test in the corpus
+        :param name: Path of the original JSON file relative to the converted directory
+        """
+        self.corpus_path: Path = Path(corpus_path)
+        self.index: int = index
+        self.name: str = name
+
+    def __eq__(self, other):
+        return isinstance(other, PackedTestPath) and self.index == other.index and self.corpus_path == other.corpus_path
+
+    def __hash__(self):
+        return hash((self.corpus_path, self.index))
+
+    def __str__(self):
+        return str(self.corpus_path / self.name)
+
+    def __repr__(self):
+        return "PackedTestPath({!r}, {}, {!r})".format(str(self.corpus_path), self.index, self.name)
+
+    def read_test_json(self) -> dict:
+        """
+        Read the test from the corpus. The corpus is opened once per process and kept open.
+
+        :return: Dictionary of the test in the layout of the JSON test files
+        """
+        key = str(self.corpus_path)
+        if key not in _opened_corpora:
+            _opened_corpora[key] = PackedTestCorpus(self.corpus_path)
+        return _opened_corpora[key].get_test_json(self.index)
+
+
+class PackedTestCorpus:
+    def __init__(self, corpus_path: Path):
+        """
+        Read-only view of a packed test corpus. The file is memory-mapped and the road points of a test are zero-copy
+        slices of it, hence opening a corpus does not depend on its size and reading tests is bound by I/O only.
+
+        :param corpus_path: Path to the packed test corpus
+        """
+        self.corpus_path: Path = Path(corpus_path)
+        with open(self.corpus_path, "rb") as fp:
+            self.__mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.__mmap) < len(MAGIC) + _FOOTER_STRUCT.size or self.__mmap[: len(MAGIC)] != MAGIC:
+            raise Exception("Not a packed test corpus: {}".format(self.corpus_path))
+        header_length, magic = _FOOTER_STRUCT.unpack_from(self.__mmap, len(self.__mmap) - _FOOTER_STRUCT.size)
+        if magic != MAGIC:
+            raise Exception("Truncated packed test corpus: {}".format(self.corpus_path))
+        header_start = len(self.__mmap) - _FOOTER_STRUCT.size - header_length
+        header: dict = json.loads(self.__mmap[header_start : header_start + header_length])
+        if header["version"] != CORPUS_VERSION:
+            raise Exception("Unsupported packed test corpus version: {}".format(header["version"]))
+
+        self.nr_of_tests: int = header["nr_of_tests"]
+        self.categories: dict = header["categories"]
+        self.__arrays: dict = {}
+        for name, description in header["arrays"].items():
+            self.__arrays[name] = np.frombuffer(
+                self.__mmap,
+                dtype=np.dtype(description["dtype"]),
+                count=description["count"],
+                offset=description["offset"],
+            )
+
+    def __len__(self):
+        return self.nr_of_tests
+
+    @staticmethod
+    def is_packed_corpus(path: Path) -> bool:
+        """
+        Check the magic bytes of a file.
+
+        :param path: Path to a file
+        :return: True if the file is a packed test corpus
+        """
+        if not os.path.isfile(path):
+            return False
+        with open(path, "rb") as fp:
+            return fp.read(len(MAGIC)) == MAGIC
+
+    def get_name(self, index: int) -> str:
+        """
+
+        :param index: Position of the test in the corpus
+        :return: Path of the original JSON file relative to the converted directory
+        """
+        return self.__get_string("names", index)
+
+    def get_test_paths(self) -> list[PackedTestPath]:
+        """
+
+        :return: References to all tests of the corpus in their order
+        """
+        return [PackedTestPath(self.corpus_path, i, self.get_name(i)) for i in range(self.nr_of_tests)]
+
+    def is_marked_as_valid(self, index: int) -> bool:
+        """
+        Tests without a validity flag are considered valid.
+
+        :param index: Position of the test in the corpus
+        :return: False if the test is marked as invalid
+        """
+        return int(self.__arrays["is_valid"][index]) in (_VALIDITY_CODES[True], _MISSING_VALIDITY)
+
+    def get_points(self, name: str, index: int) -> np.ndarray:
+        """
+        Zero-copy view of the points of a test.
+
+        :param name: Either road_points or interpolated_road_points
+        :param index: Position of the test in the corpus
+        :return: Read-only array with one row per point
+        """
+        offsets = self.__arrays[name + "_offsets"]
+        width = int(self.__arrays[name + "_widths"][index])
+        points = self.__arrays[name][offsets[index] : offsets[index + 1]]
+        return points.reshape(-1, width) if width > 0 else points.reshape(0, 0)
+
+    def get_test_json(self, index: int) -> dict:
+        """
+        Dictionary of a test in the layout of the JSON test files. The points are zero-copy views of the corpus.
+
+        :param index: Position of the test in the corpus
+        :return: Dictionary of the test
+        """
+        test_json = {"test_id": json.loads(self.__get_string("test_ids", index))}
+        validity_code = int(self.__arrays["is_valid"][index])
+        for is_valid, code in _VALIDITY_CODES.items():
+            if code == validity_code:
+                test_json["is_valid"] = is_valid
+        for name in _CATEGORICAL_ARRAYS:
+            test_json[name] = self.categories[name][self.__arrays[name][index]]
+        test_duration = float(self.__arrays["test_duration"][index])
+        test_json["test_duration"] = None if np.isnan(test_duration) else test_duration
+        for name in _POINT_ARRAYS:
+            test_json[name] = self.get_points(name, index)
+        # corpora packed before the legacy keys were kept do not have their arrays
+        for name in _LEGACY_DURATIONS:
+            if name in self.__arrays and not np.isnan(self.__arrays[name][index]):
+                test_json[name] = float(self.__arrays[name][index])
+        for name in _LEGACY_POINT_ARRAYS:
+            if name in self.__arrays and self.__arrays[name + "_widths"][index] >= 0:
+                test_json[name] = self.get_points(name, index)
+        return test_json
+
+    def __get_string(self, name: str, index: int) -> str:
+        offsets = self.__arrays[name + "_offsets"]
+        return self.__arrays[name][offsets[index] : offsets[index + 1]].tobytes().decode("utf-8")
+
+    def close(self):
+        """
+        Release the memory map. If arrays returned by the corpus are still in use, the map is released as soon as
+        they are garbage collected.
+        """
+        self.__arrays = {}
+        try:
+            self.__mmap.close()
+        except BufferError:
+            pass
+
+    @staticmethod
+    def pack_tests(test_paths: list[Path], tests_dir: Path, corpus_path: Path) -> int:
+        """
+        Convert JSON test files into a packed test corpus. Simulation data is not part of the packed corpus.
+
+        :param test_paths: Paths to the JSON test files in the order they are stored
+        :param tests_dir: Directory containing the JSON test files, the names of the tests are relative to it
+        :param corpus_path: Path to the packed test corpus to create
+        :return: Number of packed tests
+        """
+        with PackedTestCorpusWriter(corpus_path) as writer:
+            for test_path in test_paths:
+                with open(test_path) as fp:
+                    test_json: dict = json.load(fp)
+                writer.write(os.path.relpath(test_path, tests_dir), test_json)
+        return writer.nr_of_tests
+
+    def unpack_tests(self, out_dir: Path) -> int:
+        """
+        Convert the packed test corpus into JSON test files.
+
+        :param out_dir: Directory to store the JSON test files
+        :return: Number of unpacked tests
+        """
+        for i in range(self.nr_of_tests):
+            test_path = Path(out_dir) / self.get_name(i)
+            test_path.parent.mkdir(parents=True, exist_ok=True)
+            test_json = self.get_test_json(i)
+            for name in _POINT_ARRAYS + _LEGACY_POINT_ARRAYS:
+                if name in test_json:
+                    test_json[name] = test_json[name].tolist()
+            with open(test_path, "w") as fp:
+                json.dump(test_json, fp, indent=2)
+        return self.nr_of_tests
+
+
+class PackedTestCorpusWriter:
+    def __init__(self, corpus_path: Path):
+        """
+        Streaming writer of a packed test corpus. Every array is appended to its own temporary file, which are
+        concatenated into the corpus on close.
+
+        :param corpus_path: Path to the packed test corpus to create
+        """
+        self.corpus_path: Path = Path(corpus_path)
+        self.nr_of_tests: int = 0
+        self.__tmp_dir = Path(tempfile.mkdtemp(prefix=".sdcpack-", dir=self.corpus_path.parent))
+        self.__dtypes: dict = {
+            "is_valid": np.dtype("<i1"),
+            "test_duration": np.dtype("<f8"),
+            "simulation_time": np.dtype("<f8"),
+            "names": np.dtype("u1"),
+            "names_offsets": np.dtype("<i8"),
+            "test_ids": np.dtype("u1"),
+            "test_ids_offsets": np.dtype("<i8"),
+        }
+        for name in _CATEGORICAL_ARRAYS:
+            self.__dtypes[name] = np.dtype("<i4")
+        for name in _POINT_ARRAYS + _LEGACY_POINT_ARRAYS:
+            self.__dtypes[name] = np.dtype("<f8")
+            self.__dtypes[name + "_offsets"] = np.dtype("<i8")
+            self.__dtypes[name + "_widths"] = np.dtype("<i4")
+        self.__files: dict = {name: open(self.__tmp_dir / name, "wb") for name in self.__dtypes}
+        self.__counts: dict = {name: 0 for name in self.__dtypes}
+        self.__categories: dict = {name: [] for name in _CATEGORICAL_ARRAYS}
+        for name in ("names", "test_ids") + _POINT_ARRAYS + _LEGACY_POINT_ARRAYS:
+            self.__append(name + "_offsets", [0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.__discard()
+
+    def __append(self, name: str, values):
+        array = np.ascontiguousarray(values, dtype=self.__dtypes[name]).ravel()
+        self.__files[name].write(array.tobytes())
+        self.__counts[name] += array.shape[0]
+
+    def __append_string(self, name: str, value: str):
+        encoded = value.encode("utf-8")
+        self.__append(name, np.frombuffer(encoded, dtype=np.uint8))
+        self.__append(name + "_offsets", [self.__counts[name]])
+
+    def __get_category(self, name: str, value) -> int:
+        categories = self.__categories[name]
+        if value not in categories:
+            categories.append(value)
+        return categories.index(value)
+
+    def write(self, name: str, test_json: dict):
+        """
+        Append a test.
+
+        :param name: Path of the JSON file relative to the converted directory
+        :param test_json: Dictionary of the test in the layout of the JSON test files
+        """
+        self.__append_string("names", name)
+        self.__append_string("test_ids", json.dumps(test_json.get("test_id", None)))
+        if "is_valid" in test_json:
+            is_valid = test_json["is_valid"]
+            self.__append("is_valid", [_VALIDITY_CODES[None if is_valid is None else bool(is_valid)]])
+        else:
+            self.__append("is_valid", [_MISSING_VALIDITY])
+        for category in _CATEGORICAL_ARRAYS:
+            self.__append(category, [self.__get_category(category, test_json.get(category, None))])
+        for duration_name in ("test_duration",) + _LEGACY_DURATIONS:
+            test_duration = test_json.get(duration_name, None)
+            self.__append(duration_name, [np.nan if test_duration is None else test_duration])
+        for points_name in _POINT_ARRAYS + _LEGACY_POINT_ARRAYS:
+            points = test_json.get(points_name, None)
+            points = np.asarray([] if points is None else points, dtype=np.float64)
+            if points.ndim != 2 and points.shape[0] > 0:
+                raise Exception("Invalid {} of test {}".format(points_name, name))
+            self.__append(points_name, points)
+            self.__append(points_name + "_offsets", [self.__counts[points_name]])
+            if points.shape[0] > 0:
+                width = points.shape[1]
+            else:
+                # a width of -1 marks legacy keys that the test does not have
+                width = -1 if points_name in _LEGACY_POINT_ARRAYS and test_json.get(points_name) is None else 0
+            self.__append(points_name + "_widths", [width])
+        self.nr_of_tests += 1
+
+    def close(self):
+        """
+        Assemble the packed test corpus and remove the temporary files.
+        """
+        header = {
+            "version": CORPUS_VERSION,
+            "nr_of_tests": self.nr_of_tests,
+            "categories": self.__categories,
+            "arrays": {},
+        }
+        for f in self.__files.values():
+            f.close()
+        with open(self.corpus_path, "wb") as fp:
+            fp.write(MAGIC)
+            for name, dtype in self.__dtypes.items():
+                # align every array so that it can be mapped without copying
+                fp.write(b"\0" * (-fp.tell() % _ALIGNMENT))
+                header["arrays"][name] = {"dtype": dtype.str, "offset": fp.tell(), "count": self.__counts[name]}
+                with open(self.__tmp_dir / name, "rb") as array_fp:
+                    shutil.copyfileobj(array_fp, fp)
+            encoded_header = json.dumps(header).encode("utf-8")
+            fp.write(encoded_header)
+            fp.write(_FOOTER_STRUCT.pack(len(encoded_header), MAGIC))
+        shutil.rmtree(self.__tmp_dir)
+        logging.info("Packed {} tests into {}".format(self.nr_of_tests, self.corpus_path))
+
+    def __discard(self):
+        for f in self.__files.values():
+            f.close()
+        shutil.rmtree(self.__tmp_dir)
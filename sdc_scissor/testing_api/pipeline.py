@@ -0,0 +1,104 @@
+import collections
+import itertools
+from concurrent.futures import Executor
+from typing import Callable, Iterable, Iterator
+
+
+def _map_concurrently(executor: Executor, function: Callable, items: Iterator, max_pending: int) -> Iterator:
+    """
+    Apply a function on the items with an executor. A new item is only taken from the source when less than max_pending
+    items are in flight, and the results are yielded in the order of the items.
+
+    :param executor: Executor running the function, e.g., a pool of worker processes
+    :param function: Function applied on every item, it needs to be picklable for process pools
+    :param items: Iterator of the items
+    :param max_pending: Maximum number of items that are submitted but not yet consumed
+    :return: Iterator of the results
+    """
+    pending_results = collections.deque()
+    try:
+        for item in items:
+            pending_results.append(executor.submit(function, item))
+            if len(pending_results) >= max_pending:
+                yield pending_results.popleft().result()
+        while pending_results:
+            yield pending_results.popleft().result()
+    finally:
+        for future in pending_results:
+            future.cancel()
+
+
+class Pipeline:
+    def __init__(self, source: Iterable, max_pending: int = 64):
+        """
+        Pull-based pipeline of stages, e.g., load -> validate -> extract features -> write. Every stage is a generator
+        that takes an item from its predecessor only when its successor requests the next one, hence the pipeline
+        keeps a constant number of items in memory regardless of the number of items the source provides. Stages that
+        run on an executor are the only ones buffering items, at most max_pending each.
+
+        :param source: Iterable providing the items, it is consumed lazily
+        :param max_pending: Maximum number of items in flight per concurrent stage
+        """
+        self.max_pending: int = max_pending
+        self.__items: Iterator = iter(source)
+
+    def __iter__(self) -> Iterator:
+        return self.__items
+
+    def map(self, function: Callable, executor: Executor = None) -> "Pipeline":
+        """
+        Add a stage transforming every item.
+
+        :param function: Function applied on every item
+        :param executor: Optional executor to run the function concurrently, the order of the items is kept
+        :return: The pipeline
+        """
+        if executor is None:
+            self.__items = map(function, self.__items)
+        else:
+            self.__items = _map_concurrently(executor, function, self.__items, self.max_pending)
+        return self
+
+    def filter(self, predicate: Callable) -> "Pipeline":
+        """
+        Add a stage dropping the items the predicate does not hold for.
+
+        :param predicate: Function deciding whether an item is kept
+        :return: The pipeline
+        """
+        self.__items = filter(predicate, self.__items)
+        return self
+
+    def batch(self, batch_size: int) -> "Pipeline":
+        """
+        Add a stage grouping consecutive items into lists, e.g., to process them on a worker at once.
+
+        :param batch_size: Maximum number of items of a list
+        :return: The pipeline
+        """
+        items = self.__items
+        self.__items = iter(lambda: list(itertools.islice(items, batch_size)), [])
+        return self
+
+    def flatten(self) -> "Pipeline":
+        """
+        Add a stage yielding the elements of every item, the inverse of batch().
+
+        :return: The pipeline
+        """
+        self.__items = itertools.chain.from_iterable(self.__items)
+        return self
+
+    def run(self, sink: Callable = None) -> int:
+        """
+        Pull all items through the pipeline.
+
+        :param sink: Optional function consuming every item that leaves the last stage, e.g., a writer
+        :return: Number of items that left the last stage
+        """
+        nr_of_items = 0
+        for item in self.__items:
+            if sink is not None:
+                sink(item)
+            nr_of_items += 1
+        return nr_of_items
@@ -0,0 +1,89 @@
+import numpy as np
+
+# decisions of the prefilter per road
+INVALID, VALID, UNDECIDED = 0, 1, -1
+# segments whose directions differ by less than this angle along the road cannot make the road lines intersect
+_MAX_WINDOW_TURN = np.radians(80.0)
+
+
+def _cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _get_point_segment_distances(points, segment_starts, segment_directions, squared_lengths) -> np.ndarray:
+    relative_points = points - segment_starts
+    t = np.einsum("...k,...k->...", relative_points, segment_directions) / squared_lengths
+    t = np.clip(t, 0, 1)
+    return np.hypot(*np.moveaxis(relative_points - t[..., np.newaxis] * segment_directions, -1, 0))
+
+
+def prefilter_roads(roads: np.ndarray, offset: float) -> np.ndarray:
+    """
+    Decide cheaply for many roads of the same number of points whether their center line and the two lines offset by
+    the given distance intersect. A road is invalid if two non-adjacent segments of its center line cross. A road is
+    valid if it turns less than 80 degrees per point, the offset lines do not fold at any point and every pair of
+    segments that is more than 80 degrees of turning apart is further apart than twice the offset. Road pieces that
+    turn less than 80 degrees in total are monotone along their mean direction, hence their lines cannot intersect,
+    and the lines of segments that are further apart than twice the offset cannot meet either. All other roads are
+    undecided.
+
+    :param roads: Array of shape (nr_of_roads, nr_of_points, 2) with the interpolated road points
+    :param offset: Distance of the offset lines to the center line
+    :return: Array with the decision per road, i.e., INVALID, VALID or UNDECIDED
+    """
+    nr_of_roads, nr_of_points, _ = roads.shape
+    decisions = np.full(nr_of_roads, UNDECIDED, dtype=np.int8)
+    nr_of_segments = nr_of_points - 1
+    if nr_of_segments < 3:
+        return decisions
+
+    starts, directions = roads[:, :-1], np.diff(roads, axis=1)
+    lengths = np.hypot(directions[..., 0], directions[..., 1])
+    squared_lengths = np.where(lengths > 0, lengths * lengths, 1.0)
+    i, j = np.triu_indices(nr_of_segments, k=2)
+    starts_i, ends_i, directions_i, squared_lengths_i = (
+        starts[:, i],
+        roads[:, i + 1],
+        directions[:, i],
+        squared_lengths[:, i],
+    )
+    starts_j, ends_j, directions_j, squared_lengths_j = (
+        starts[:, j],
+        roads[:, j + 1],
+        directions[:, j],
+        squared_lengths[:, j],
+    )
+
+    # non-adjacent segments cross if the end points of each segment lie on different sides of the other segment
+    is_crossing = (_cross(directions_i, starts_j - starts_i) * _cross(directions_i, ends_j - starts_i) < 0) & (
+        _cross(directions_j, starts_i - starts_j) * _cross(directions_j, ends_i - starts_j) < 0
+    )
+    has_crossing = np.any(is_crossing, axis=1)
+
+    headings = np.arctan2(directions[..., 1], directions[..., 0])
+    turns = np.abs((np.diff(headings, axis=1) + np.pi) % (2 * np.pi) - np.pi)
+    cumulative_turns = np.zeros((nr_of_roads, nr_of_segments))
+    np.cumsum(turns, axis=1, out=cumulative_turns[:, 1:])
+    is_far_pair = cumulative_turns[:, j] - cumulative_turns[:, i] >= _MAX_WINDOW_TURN
+
+    min_distance = 2 * offset * (1 + 1e-6)
+    are_far_pairs_apart = ~np.any(is_far_pair & is_crossing, axis=1)
+    for points, segment_starts, segment_directions, segment_squared_lengths in (
+        (starts_i, starts_j, directions_j, squared_lengths_j),
+        (ends_i, starts_j, directions_j, squared_lengths_j),
+        (starts_j, starts_i, directions_i, squared_lengths_i),
+        (ends_j, starts_i, directions_i, squared_lengths_i),
+    ):
+        distances = _get_point_segment_distances(points, segment_starts, segment_directions, segment_squared_lengths)
+        are_far_pairs_apart &= ~np.any(is_far_pair & (distances <= min_distance), axis=1)
+
+    # the inner offset line folds if the offset segments are shortened by more than their length at the turns
+    shortenings = np.zeros((nr_of_roads, nr_of_segments))
+    shortenings_at_turns = offset * np.tan(np.minimum(turns, _MAX_WINDOW_TURN) / 2)
+    shortenings[:, 1:] += shortenings_at_turns
+    shortenings[:, :-1] += shortenings_at_turns
+    have_no_folds = np.all(turns < _MAX_WINDOW_TURN, axis=1) & np.all(shortenings < 0.9 * lengths, axis=1)
+
+    decisions[has_crossing] = INVALID
+    decisions[~has_crossing & are_far_pairs_apart & have_no_folds] = VALID
+    return decisions
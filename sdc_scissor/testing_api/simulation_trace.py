@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+TRACE_VERSION = 1
+POSITION_COLUMNS = ("time", "x", "y", "z")
+
+_HEADER_NAME = "trace.json"
+# missing values of a signal in a tick are stored as these values
+_FILL_VALUES = {"<f8": np.nan, "|b1": False}
+
+
+def _get_dtype(value):
+    """
+    Column type of a signal value. Numbers are always stored as floats since a simulator reports a numeric signal as
+    an integer when it is zero, e.g., the wheel speed at standstill.
+
+    :param value: Value of the signal
+    :return: Numpy type string or None if the value cannot be stored in a column
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return "|b1"
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return "<f8"
+    return None
+
+
+class SimulationTraceWriter:
+    def __init__(self, trace_path: Path, chunk_size: int = 50):
+        """
+        Writes the trace of a simulation column by column. Every column is a binary file of a single type inside the
+        trace directory, the rows are appended in chunks so that only the current chunk is kept in memory. The columns
+        are time, x, y and z followed by one column per scalar signal of the first state, numeric signals are stored
+        as floats and boolean signals as booleans. Signals that appear later are ignored and missing signals are
+        filled with NaN or False.
+
+        :param trace_path: Directory of the trace, it is replaced if it exists
+        :param chunk_size: Number of rows that are buffered before they are appended to the column files
+        """
+        self.trace_path: Path = Path(trace_path)
+        self.chunk_size: int = chunk_size
+        self.nr_of_rows: int = 0
+        self.__columns: dict = {}
+        self.__buffers: dict = {}
+        self.__nr_of_buffered_rows = 0
+        self.__ignored_signals: set = set()
+        self.trace_path.mkdir(parents=True, exist_ok=True)
+        for file_path in self.trace_path.iterdir():
+            file_path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __declare_columns(self, signals: dict):
+        columns = {name: "<f8" for name in POSITION_COLUMNS}
+        for name, value in signals.items():
+            dtype = _get_dtype(value)
+            if dtype is None or name in columns:
+                logging.debug("signal {} is not stored in the simulation trace".format(name))
+                self.__ignored_signals.add(name)
+                continue
+            columns[name] = dtype
+        for i, (name, dtype) in enumerate(columns.items()):
+            self.__columns[name] = {"dtype": dtype, "file": "{}.bin".format(i)}
+            self.__buffers[name] = []
+
+    def append(self, time: float, position: tuple, signals: dict):
+        """
+        Append the state of a simulation tick.
+
+        :param time: Seconds since the start of the test
+        :param position: Position of the car as x, y and z
+        :param signals: Dictionary of signal names and values, e.g., the electrics sensor data
+        """
+        if not self.__columns:
+            self.__declare_columns(signals)
+        x_pos, y_pos, z_pos = position
+        row = dict(signals, time=time, x=x_pos, y=y_pos, z=z_pos)
+        for name, column in self.__columns.items():
+            self.__buffers[name].append(row.get(name, _FILL_VALUES[column["dtype"]]))
+        unknown_signals = signals.keys() - self.__columns.keys() - self.__ignored_signals
+        if unknown_signals:
+            logging.warning("Signals {} are not stored in the simulation trace".format(sorted(unknown_signals)))
+            self.__ignored_signals.update(unknown_signals)
+
+        self.__nr_of_buffered_rows += 1
+        if self.__nr_of_buffered_rows >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Append the buffered rows to the column files and update the header, hence the trace of an interrupted run is
+        readable up to the last chunk.
+        """
+        if self.__nr_of_buffered_rows == 0:
+            return
+        for name, column in self.__columns.items():
+            with open(self.trace_path / column["file"], "ab") as fp:
+                np.asarray(self.__buffers[name], dtype=column["dtype"]).tofile(fp)
+            self.__buffers[name] = []
+        self.nr_of_rows += self.__nr_of_buffered_rows
+        self.__nr_of_buffered_rows = 0
+
+        tmp_path = self.trace_path / (_HEADER_NAME + ".tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump({"version": TRACE_VERSION, "nr_of_rows": self.nr_of_rows, "columns": self.__columns}, fp)
+        os.replace(tmp_path, self.trace_path / _HEADER_NAME)
+
+    def close(self):
+        """
+        Write the remaining rows.
+        """
+        self.flush()
+
+
+class SimulationTrace:
+    def __init__(self, trace_path: Path):
+        """
+        Read access to a simulation trace written by the SimulationTraceWriter. Only the files of the requested
+        columns are read.
+
+        :param trace_path: Directory of the trace
+        """
+        self.trace_path: Path = Path(trace_path)
+        with open(self.trace_path / _HEADER_NAME) as fp:
+            header = json.load(fp)
+        if header.get("version") != TRACE_VERSION:
+            raise Exception("Unsupported simulation trace version: {}".format(header.get("version")))
+        self.nr_of_rows: int = header["nr_of_rows"]
+        self.__columns: dict = header["columns"]
+
+    def __len__(self):
+        return self.nr_of_rows
+
+    def get_column_names(self) -> list[str]:
+        """
+        :return: Names of all columns in the trace
+        """
+        return list(self.__columns.keys())
+
+    def read_columns(self, names: list[str] = None) -> dict:
+        """
+        Read columns of the trace.
+
+        :param names: Names of the columns, all columns if None
+        :return: Dictionary mapping the column names to one dimensional arrays
+        """
+        names = self.get_column_names() if names is None else names
+        columns = {}
+        for name in names:
+            column = self.__columns.get(name)
+            if column is None:
+                raise Exception("Simulation trace has no column {}".format(name))
+            columns[name] = np.fromfile(self.trace_path / column["file"], dtype=column["dtype"], count=self.nr_of_rows)
+        return columns
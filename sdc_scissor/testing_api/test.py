@@ -5,9 +5,13 @@ from pathlib import Path
 import numpy as np
 from scipy.interpolate import splev, splprep
 
+_NUM_NODES = 50
+
 
 class Test:
-    def __init__(self, test_id, road_points: list[list], test_outcome, test_duration=None):
+    def __init__(
+        self, test_id, road_points: list[list], test_outcome, test_duration=None, interpolated_road_points=None
+    ):
         """
         Class representing a test case.
 
@@ -15,6 +19,7 @@ class Test:
         :param road_points: Road points defining the test
         :param test_outcome: Outcome of the test execution
         :param test_duration: The duration of the test execution
+        :param interpolated_road_points: Already known interpolation of the road points, e.g., from a test file
         """
         self.test_id = test_id
         self.is_valid = None
@@ -22,8 +27,40 @@ class Test:
         self.predicted_test_outcome = None
         self.test_duration = test_duration
         self.road_points = road_points
-        self.interpolated_road_points = self.__interpolate(road_points)
+        self.__interpolated_road_points = interpolated_road_points
         self.simulation_data = []
+        self.simulation_trace = None
+
+    @property
+    def interpolated_road_points(self) -> list[list]:
+        """
+        Spline interpolation of the road points. It is computed on first access and reused afterwards.
+        """
+        if self.__interpolated_road_points is None:
+            self.__interpolated_road_points = self.__interpolate(self.road_points)
+        return self.__interpolated_road_points
+
+    @interpolated_road_points.setter
+    def interpolated_road_points(self, interpolated_road_points: list[list]):
+        self.__interpolated_road_points = interpolated_road_points
+
+    @property
+    def is_interpolated(self) -> bool:
+        """
+        Whether the interpolation of the road points is already known.
+        """
+        return self.__interpolated_road_points is not None
+
+    def to_dict(self) -> dict:
+        """
+        Dictionary of all test attributes including the interpolated road points. The data recorded during a
+        simulation is not part of it, it is referenced by the simulation trace.
+
+        :return: Dictionary in the layout of the JSON test files
+        """
+        # make sure the interpolation is part of the dictionary
+        _ = self.interpolated_road_points
+        return {name.removeprefix("_Test__"): value for name, value in vars(self).items() if name != "simulation_data"}
 
     def save_as_json(self, file_path: Path):
         """
@@ -35,7 +72,7 @@ class Test:
         logging.info("Save test as a JSON file")
         nr_whitespaces_for_indentation_in_json_file = 2
         with open(file_path, "w") as fp:
-            test_dict = vars(self)
+            test_dict = self.to_dict()
             json.dump(test_dict, fp, indent=nr_whitespaces_for_indentation_in_json_file)
 
     @staticmethod
@@ -49,7 +86,7 @@ class Test:
         road_matrix = np.array(road_points)
         x = road_matrix[:, 0]
         y = road_matrix[:, 1]
-        num_nodes = 50
+        num_nodes = _NUM_NODES
 
         if len(x) == 2:
             # With two points the only option is a straight segment
@@ -69,6 +106,18 @@ class Test:
 
         return new_road_points
 
+    @staticmethod
+    def interpolate_batch(tests: list) -> None:
+        """
+        Interpolate the road points of many tests, e.g., on a worker process before the tests are passed on. Tests
+        whose interpolation is already known are skipped.
+
+        :param tests: List of test objects
+        """
+        for test in tests:
+            if not test.is_interpolated:
+                test.interpolated_road_points = Test.__interpolate(test.road_points)
+
 
 if __name__ == "__main__":
     logging.info("* test.py")
@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+CATALOG_VERSION = 1
+METADATA_COLUMNS = ("test_id", "is_valid", "test_outcome", "predicted_test_outcome", "test_duration")
+
+_IDENTIFIER_PATTERN = r"[A-Za-z_][A-Za-z0-9_]*"
+# number of modified rows after which the changes are committed, so that an interrupted run keeps most of them
+_COMMIT_INTERVAL = 256
+
+
+def _get_content_hash(test_path: Path) -> str:
+    with open(test_path, "rb") as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+def _get_column_type(value) -> str:
+    if isinstance(value, (bool, int)):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    return "TEXT"
+
+
+class TestCatalog:
+    def __init__(self, catalog_path: Path, tests_dir: Path):
+        """
+        SQLite catalog of the test files in a directory. Every test has a row with its path relative to the tests
+        directory, the hash and the modification time of its content, its metadata, i.e., test_id, is_valid,
+        test_outcome, predicted_test_outcome and test_duration, and the road features once they are extracted. Like
+        the manifest, an entry is only served as long as its file is unchanged. Subsets of the tests are selected
+        with SQL expressions over these columns without walking the directory.
+
+        :param catalog_path: Path to the SQLite file of the catalog
+        :param tests_dir: Directory containing the tests, paths are stored relative to it
+        """
+        self.catalog_path: Path = Path(catalog_path)
+        self.tests_dir: Path = Path(tests_dir)
+        self.__nr_of_pending_rows = 0
+        self.__entries: dict = None
+        self.__connection = sqlite3.connect(self.catalog_path, timeout=60)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS catalog_info (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        version = self.__connection.execute("SELECT value FROM catalog_info WHERE key = 'version'").fetchone()
+        if version is not None and version[0] != CATALOG_VERSION:
+            logging.warning("Rebuild test catalog of version {}".format(version[0]))
+            self.__connection.execute("DROP TABLE IF EXISTS tests")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS tests (path TEXT PRIMARY KEY, content_hash TEXT NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, test_id TEXT, is_valid INTEGER NOT NULL DEFAULT 1, "
+            "test_outcome TEXT, predicted_test_outcome TEXT, test_duration REAL)"
+        )
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO catalog_info (key, value) VALUES ('version', ?)", (CATALOG_VERSION,)
+        )
+        self.__connection.commit()
+
+    def __len__(self):
+        return self.__connection.execute("SELECT COUNT(*) FROM tests").fetchone()[0]
+
+    def __get_key(self, test_path: Path) -> str:
+        return Path(os.path.relpath(test_path, self.tests_dir)).as_posix()
+
+    def get_column_names(self) -> list[str]:
+        """
+        :return: Names of all columns that can be used in queries
+        """
+        return [row[1] for row in self.__connection.execute("PRAGMA table_info(tests)")]
+
+    def get(self, test_path: Path, stat_result: os.stat_result = None):
+        """
+        Look up the metadata of a test file. The entries of all tests are read at the first call, hence checking a
+        whole directory does not query the database once per file. A file whose modification time changed but whose
+        content is unchanged is still served.
+
+        :param test_path: Path to the JSON file of the test
+        :param stat_result: Result of os.stat for the test file, if already available
+        :return: Dictionary of the metadata or None if the file is unknown or was modified
+        """
+        if self.__entries is None:
+            rows = self.__connection.execute(
+                "SELECT path, content_hash, mtime_ns, size, {} FROM tests".format(", ".join(METADATA_COLUMNS))
+            ).fetchall()
+            self.__entries = {row[0]: row[1:] for row in rows}
+        key = self.__get_key(test_path)
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        content_hash, mtime_ns, size, *metadata_values = entry
+        stat_result = stat_result if stat_result else os.stat(test_path)
+        if size != stat_result.st_size:
+            return None
+        if mtime_ns != stat_result.st_mtime_ns:
+            if content_hash != _get_content_hash(test_path):
+                return None
+            self.__execute_update("UPDATE tests SET mtime_ns = ? WHERE path = ?", (stat_result.st_mtime_ns, key))
+            self.__entries[key] = (content_hash, stat_result.st_mtime_ns, size, *metadata_values)
+
+        metadata = dict(zip(METADATA_COLUMNS, metadata_values))
+        metadata["is_valid"] = bool(metadata["is_valid"])
+        return metadata
+
+    def put(self, test_path: Path, metadata: dict, stat_result: os.stat_result = None):
+        """
+        Store the metadata of a test file. The hash and the modification time of the file are taken when the metadata
+        is stored, hence the file must not be modified afterwards without storing its metadata again. Road features
+        of the test are kept as long as its content hash is unchanged.
+
+        :param test_path: Path to the JSON file of the test
+        :param metadata: Dictionary with is_valid, test_id, test_outcome, predicted_test_outcome and test_duration
+        :param stat_result: Result of os.stat for the test file, if already available
+        """
+        stat_result = stat_result if stat_result else os.stat(test_path)
+        key = self.__get_key(test_path)
+        content_hash = _get_content_hash(test_path)
+        row = self.__connection.execute("SELECT content_hash FROM tests WHERE path = ?", (key,)).fetchone()
+        if row is not None and row[0] != content_hash:
+            # the road features of a modified test are outdated
+            self.__connection.execute("DELETE FROM tests WHERE path = ?", (key,))
+
+        values = {
+            "content_hash": content_hash,
+            "mtime_ns": stat_result.st_mtime_ns,
+            "size": stat_result.st_size,
+            "test_id": metadata.get("test_id", None),
+            "is_valid": int(bool(metadata.get("is_valid", True))),
+            "test_outcome": metadata.get("test_outcome", None),
+            "predicted_test_outcome": metadata.get("predicted_test_outcome", None),
+            "test_duration": metadata.get("test_duration", None),
+        }
+        self.__execute_update(
+            "INSERT INTO tests (path, {columns}) VALUES (?, {placeholders}) ON CONFLICT(path) DO UPDATE SET "
+            "{assignments}".format(
+                columns=", ".join(values.keys()),
+                placeholders=", ".join("?" * len(values)),
+                assignments=", ".join("{0} = excluded.{0}".format(name) for name in values.keys()),
+            ),
+            (key, *values.values()),
+        )
+        if self.__entries is not None:
+            self.__entries[key] = tuple(values.values())
+
+    def put_features(self, features_by_test_path: dict):
+        """
+        Store the road features of tests that are in the catalog. A column is added for every new feature.
+
+        :param features_by_test_path: Dictionary mapping test paths to dictionaries of feature names and values
+        """
+        column_names = set(self.get_column_names())
+        for test_path, features in features_by_test_path.items():
+            features = {
+                name: value.item() if isinstance(value, np.generic) else value for name, value in features.items()
+            }
+            for name, value in features.items():
+                if name in column_names:
+                    continue
+                if not re.fullmatch(_IDENTIFIER_PATTERN, name):
+                    raise Exception("Invalid feature name for the test catalog: {}".format(name))
+                self.__connection.execute("ALTER TABLE tests ADD COLUMN {} {}".format(name, _get_column_type(value)))
+                column_names.add(name)
+            if not features:
+                continue
+            self.__execute_update(
+                "UPDATE tests SET {} WHERE path = ?".format(", ".join("{} = ?".format(name) for name in features)),
+                (*features.values(), self.__get_key(test_path)),
+            )
+
+    def select_test_paths(self, query: str = None, parameters: tuple = ()) -> list[Path]:
+        """
+        Select the tests matching a query, e.g., "is_valid AND test_outcome IS NULL AND road_distance > 200". The
+        files are not accessed.
+
+        :param query: SQL expression over the columns of the catalog, all tests if None
+        :param parameters: Values of the ? placeholders of the query
+        :return: List of the test paths ordered by path
+        """
+        sql = "SELECT path FROM tests"
+        if query:
+            sql += " WHERE {}".format(query)
+        try:
+            rows = self.__connection.execute(sql + " ORDER BY path", parameters).fetchall()
+        except sqlite3.Error as err:
+            raise Exception("Invalid test catalog query '{}': {}".format(query, err))
+        return [self.tests_dir / row[0] for row in rows]
+
+    def remove_missing(self, test_paths: list[Path]) -> int:
+        """
+        Drop the entries of all tests that are not in the given list, e.g., deleted tests.
+
+        :param test_paths: Paths of all existing tests
+        :return: Number of dropped entries
+        """
+        keys = {self.__get_key(test_path) for test_path in test_paths}
+        missing_keys = [
+            (key,) for (key,) in self.__connection.execute("SELECT path FROM tests").fetchall() if key not in keys
+        ]
+        self.__connection.executemany("DELETE FROM tests WHERE path = ?", missing_keys)
+        self.__connection.commit()
+        if self.__entries is not None:
+            for (key,) in missing_keys:
+                self.__entries.pop(key, None)
+        return len(missing_keys)
+
+    def __execute_update(self, sql: str, parameters: tuple):
+        self.__connection.execute(sql, parameters)
+        self.__nr_of_pending_rows += 1
+        if self.__nr_of_pending_rows >= _COMMIT_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """
+        Commit the changes.
+        """
+        self.__connection.commit()
+        self.__nr_of_pending_rows = 0
+
+    def close(self):
+        """
+        Commit the changes and close the connection to the catalog.
+        """
+        self.flush()
+        self.__connection.close()
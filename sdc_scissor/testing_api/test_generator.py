@@ -1,8 +1,15 @@
 import abc
-import json
+import functools
 import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
+import numpy as np
+
+from sdc_scissor.testing_api.pipeline import Pipeline
 from sdc_scissor.testing_api.test import Test
 from sdc_scissor.testing_api.test_generators.ambiegen.ambiegen_generator import CustomAmbieGenGenerator
 from sdc_scissor.testing_api.test_generators.frenetic.src.generators.random_frenet_generator import (
@@ -12,6 +19,13 @@ from sdc_scissor.testing_api.test_generators.frenetic_v.src.generators.random_fr
     CustomFrenetVGenerator,
 )
 from sdc_scissor.testing_api.test_validator import TestValidator
+from sdc_scissor.testing_api.test_writer import ShardedTestWriter, TestWriter
+
+_GENERATOR_TOOLS = {
+    "frenetic": CustomFrenetGenerator,
+    "freneticv": CustomFrenetVGenerator,
+    "ambiegen": CustomAmbieGenGenerator,
+}
 
 
 def _id_generator():
@@ -21,6 +35,74 @@ def _id_generator():
         cnt += 1
 
 
+def _add_sine_bumps(generated_tests_as_list_of_road_points):
+    for road_as_points in generated_tests_as_list_of_road_points:
+        pass
+    return generated_tests_as_list_of_road_points
+
+
+def _extract_valid_roads(road_points):
+    """
+    Check if the road points are actual valid roads without intersections or too sharp turns.
+
+    :param road_points: List of road points specifying potential roads
+    :return: List of road points that define proper valid roads
+    """
+    # TODO
+    return road_points
+
+
+def _generate_tests(task: tuple, tool: str, test_validator: TestValidator, tool_jobs: int = 1) -> list[Test]:
+    """
+    Run a generator tool and turn its roads into validated tests without ids, runs on the workers of the test
+    generator. With a seed, the state of the global random number generators is restored afterwards since a single
+    job runs the tool in the process of the caller.
+
+    :param task: Tuple of the number of roads and the seed of the random number generators, None continues the random
+        state of the process
+    :param tool: Name of the generator tool
+    :param test_validator: Validator of the tests
+    :param tool_jobs: Number of worker processes of the generator tool, used by AmbieGen to evaluate the fitness
+    :return: List of the tests in the order the tool generated their roads
+    """
+    count, seed = task
+    if seed is None:
+        return _run_generator_tool(count, seed, tool, test_validator, tool_jobs)
+    random_state = random.getstate()
+    np_random_state = np.random.get_state()
+    try:
+        # the generator tools draw from the global random number generators
+        random.seed(seed)
+        np.random.seed(seed)
+        return _run_generator_tool(count, seed, tool, test_validator, tool_jobs)
+    finally:
+        random.setstate(random_state)
+        np.random.set_state(np_random_state)
+
+
+def _run_generator_tool(count: int, seed: int, tool: str, test_validator: TestValidator, tool_jobs: int) -> list[Test]:
+    kwargs: dict = {"map_size": 200, "time_budget": 100, "count": count}
+    if tool == "ambiegen":
+        kwargs["seed"] = seed
+        kwargs["jobs"] = tool_jobs
+    random_generator = _GENERATOR_TOOLS[tool](**kwargs)
+    generated_tests_as_list_of_road_points = random_generator.start()
+    generated_tests_as_list_of_road_points = _extract_valid_roads(generated_tests_as_list_of_road_points)
+
+    generated_tests_as_list_of_road_points = _add_sine_bumps(generated_tests_as_list_of_road_points)
+
+    tests = []
+    for road_points in generated_tests_as_list_of_road_points:
+        if road_points is None:
+            continue
+        test = Test(test_id=None, road_points=road_points, test_outcome="NOT_EXECUTED")
+        test_validator.validate(test)
+        tests.append(test)
+    # interpolate on the worker, the consumer only assigns the ids and writes the tests
+    Test.interpolate_batch(tests)
+    return tests
+
+
 class TestKeepingBehavior(abc.ABC):
     @abc.abstractmethod
     def keep(self, test: Test, collection: list):
@@ -56,99 +138,115 @@ class TestGenerator:
         tool: str,
         validator: TestValidator,
         test_keeping_behavior: TestKeepingBehavior,
+        test_writer: TestWriter = None,
+        jobs: int = 1,
+        seed: int = None,
+        chunk_size: int = 100,
     ):
         """
         This class is used to generate tests for a virtual environment.
+
+        With a seed or several jobs, the count is split into chunks of chunk_size roads. Every chunk runs its own
+        instance of the generator tool seeded with a seed derived from the given seed and the index of the chunk, the
+        chunks run on a pool of worker processes and are merged in their order before the ids are assigned. Hence, the
+        generated tests depend on the seed but not on the number of jobs.
+
+        :param test_writer: Writer storing the tests, by default the tests are written one by one as JSON files
+            directly into the destination directory
+        :param jobs: Number of worker processes generating the tests, 0 uses all CPUs
+        :param seed: Seed of the generation, None continues the random state of this process with a single job and
+            draws a random seed otherwise
+        :param chunk_size: Number of roads a worker generates at once
         """
 
         self.keeping_behavior = test_keeping_behavior
         self.count: int = count
         self.test_validator = validator
         self.__id_generator = _id_generator()
-        self.__nr_prefix_digits: int = 5
         self.destination: Path = destination
+        self.test_writer: TestWriter = (
+            test_writer if test_writer else ShardedTestWriter(destination, shard_size=0, nr_of_threads=0, count=count)
+        )
         self.generated_tests: list[Test] = []
         self.tool: str = tool
-        kwargs: dict = {"map_size": 200, "time_budget": 100, "count": count}
+        self.jobs: int = jobs if jobs else os.cpu_count()
+        self.seed: int = seed
+        self.chunk_size: int = chunk_size
         # TODO: Pass generator as dependency through the constructor (Dependency Injection)!
         # Types of test generator
-        if self.tool.lower() == "frenetic":
-            self.random_generator = CustomFrenetGenerator(**kwargs)
-        elif self.tool.lower() == "freneticv":
-            self.random_generator = CustomFrenetVGenerator(**kwargs)
-        elif self.tool.lower() == "ambiegen":
-            self.random_generator = CustomAmbieGenGenerator(**kwargs)
-        else:
+        if self.tool.lower() not in _GENERATOR_TOOLS:
             raise Exception(" Invalid tool name. Supported tools [frenetic, freneticv, ambiegen]")
 
     def generate(self):
         """
         Generate tests according to the parameters set while instantiating this object.
         """
-        logging.debug("* generate")
-        generated_tests_as_list_of_road_points = self.random_generator.start()
-        generated_tests_as_list_of_road_points = self.__extract_valid_roads(generated_tests_as_list_of_road_points)
-
-        generated_tests_as_list_of_road_points = self.__add_sine_bumps(generated_tests_as_list_of_road_points)
-
-        for road_points in generated_tests_as_list_of_road_points:
-            if road_points is None:
-                continue
-            test = Test(test_id=None, road_points=road_points, test_outcome="NOT_EXECUTED")
-            self.test_validator.validate(test)
-            test.test_id = self.keeping_behavior.generate_id(test, self.__id_generator)
-            self.keeping_behavior.keep(test, self.generated_tests)
-        logging.info(
-            "In total, {} tests (valid and invalid roads) were generated.".format(
-                len(generated_tests_as_list_of_road_points)
-            )
-        )
+        self.generated_tests.extend(self.iter_tests())
         logging.info("The test generator has {} tests in its collection".format(len(self.generated_tests)))
 
-    def __add_sine_bumps(self, generated_tests_as_list_of_road_points):
-        for road_as_points in generated_tests_as_list_of_road_points:
-            pass
-        return generated_tests_as_list_of_road_points
-
-    def __extract_valid_roads(self, road_points):
+    def iter_tests(self) -> Iterator[Test]:
         """
-        Check if the road points are actual valid roads without intersections or too sharp turns.
+        Generate tests lazily. The roads are turned into tests chunk by chunk when the consumer requests more tests,
+        and the tests are not added to the collection of the test generator. Hence, a consumer that saves every test,
+        see save_test(), keeps only the chunks in flight in memory. The ids are assigned in the order of the chunks.
 
-        :param road_points: List of road points specifying potential roads
-        :return: List of road points that define proper valid roads
+        :return: Iterator of the tests that are kept according to the test keeping behavior
         """
-        # TODO
-        return road_points
-
-    def save_tests(self):
+        logging.debug("* generate")
+        nr_of_generated_tests = 0
+        for tests in self.__iter_test_chunks():
+            for test in tests:
+                nr_of_generated_tests += 1
+                test.test_id = self.keeping_behavior.generate_id(test, self.__id_generator)
+                kept_tests = []
+                self.keeping_behavior.keep(test, kept_tests)
+                yield from kept_tests
+        logging.info("In total, {} tests (valid and invalid roads) were generated.".format(nr_of_generated_tests))
+
+    def __iter_test_chunks(self) -> Iterator[list[Test]]:
+        tool = self.tool.lower()
+        generate_tests = functools.partial(_generate_tests, tool=tool, test_validator=self.test_validator)
+        if self.jobs == 1 and self.seed is None:
+            # a single run of the tool continuing the random state of this process
+            yield generate_tests((self.count, None))
+            return
+
+        chunk_counts = [min(self.chunk_size, self.count - start) for start in range(0, self.count, self.chunk_size)]
+        seed_sequences = np.random.SeedSequence(self.seed).spawn(len(chunk_counts))
+        tasks = [
+            (chunk_count, int(seed_sequence.generate_state(1)[0]))
+            for chunk_count, seed_sequence in zip(chunk_counts, seed_sequences)
+        ]
+        nr_of_chunk_jobs = min(self.jobs, len(tasks))
+        if tool == "ambiegen":
+            # the workers that are not needed for the chunks evaluate the individuals of AmbieGen's search
+            generate_tests = functools.partial(generate_tests, tool_jobs=self.jobs // nr_of_chunk_jobs)
+        if nr_of_chunk_jobs <= 1:
+            yield from Pipeline(tasks).map(generate_tests)
+            return
+        with ProcessPoolExecutor(max_workers=nr_of_chunk_jobs) as executor:
+            yield from Pipeline(tasks, max_pending=2 * nr_of_chunk_jobs).map(generate_tests, executor=executor)
+
+    def save_tests(self) -> list[Path]:
         """
-        Save the tests as json files in a separate directory.
+        Save the generated tests with the test writer.
+
+        :return: List of the paths of the saved tests in the order of the generated tests
         """
         logging.debug("* save_tests")
+        saved_test_paths = [self.save_test(test) for test in self.generated_tests]
+        self.test_writer.flush()
+        return saved_test_paths
 
-        file_post_fix: str = "_test.json"
-        for i, test in enumerate(self.generated_tests):
-            filename = self.__get_next_filename(test, file_post_fix)
-            full_path: Path = self.destination / filename
-            with open(full_path, "w") as fp:
-                test_dict = vars(test)
-                json.dump(test_dict, fp, indent=2)
-
-    def __get_next_filename(self, test: Test, file_post_fix):
+    def save_test(self, test: Test) -> Path:
         """
+        Save a single test with the test writer. The test may not be written yet when this method returns, see
+        TestWriter.flush().
 
-        :param test:
-        :param file_post_fix:
-        :return:
+        :param test: The generated test
+        :return: Path of the saved test
         """
-        test_id: str = str(test.test_id)
-        nr_zeros: int = self.__nr_prefix_digits - len(test_id)
-        file_pre_fix: str = ""
-        for i in range(nr_zeros):
-            file_pre_fix += "0"
-        file_pre_fix += test_id
-        file_name: str = file_pre_fix + file_post_fix
-        return file_name
+        return self.test_writer.write(test)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,50 @@
+import random
+
+import numpy as np
 from pymoo.model.problem import Problem
 
 
+def _evaluate_solution(s):
+    s.get_points()  # transform the states into actual points (mutation and crossover operations are performed on states)
+    s.remove_invalid_cases()
+    s.eval_fitness()
+    return s
+
+
 class TestCaseProblem(Problem):
     """
     Module to calculate the fitnes of the individuals
     """
 
-    def __init__(self):
-        super().__init__(n_var=1, n_obj=2, n_constr=1, elementwise_evaluation=True)
+    def __init__(self, executor=None):
+        """
+        :param executor: Optional executor, e.g., a pool of worker processes, evaluating the individuals of a
+            population concurrently. Without an executor every individual is evaluated on its own.
+        """
+        self.executor = executor
+        super().__init__(
+            n_var=1,
+            n_obj=2,
+            n_constr=1,
+            elementwise_evaluation=executor is None,
+            exclude_from_serialization=["parallelization", "executor"],
+        )
 
     def _evaluate(self, x, out, *args, **kwargs):
-        s = x[0]
-        s.get_points()  # transform the states into actual points (mutation and crossover operations are performed on states)
-        s.remove_invalid_cases()
-        s.eval_fitness()
-        out["F"] = [s.fitness, s.novelty]
-        out["G"] = 4 - s.fitness * (-1)
+        if self.executor is None:
+            s = _evaluate_solution(x[0])
+            out["F"] = [s.fitness, s.novelty]
+            out["G"] = 4 - s.fitness * (-1)
+            return
+
+        solutions = x[:, 0]
+        # The evaluation draws the (unused) initial side of the road from the global random number generator. The
+        # draws of the workers are lost, hence they are repeated here to keep the same random state as without
+        # an executor, which makes the search independent of the number of workers.
+        for _ in solutions:
+            random.randint(0, 3)
+        for s, evaluated_s in zip(solutions, self.executor.map(_evaluate_solution, solutions)):
+            # the population keeps its individuals, only their state is updated
+            s.__dict__.update(evaluated_s.__dict__)
+        out["F"] = np.array([[s.fitness, s.novelty] for s in solutions])
+        out["G"] = np.array([4 - s.fitness * (-1) for s in solutions])
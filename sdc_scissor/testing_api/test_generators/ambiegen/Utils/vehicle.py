@@ -6,6 +6,46 @@ from scipy.interpolate import splev, splprep
 from shapely.geometry import LineString, Point
 
 
+class _Polyline:
+    """
+    Polyline with precomputed segment arrays to compute the distances of points to it with NumPy instead of creating
+    Shapely geometries. The distances and the length are computed with the same floating point operations as GEOS,
+    hence they are the same as Point(x, y).distance(LineString(nodes)) and LineString(nodes).length.
+    """
+
+    def __init__(self, nodes):
+        points = np.array([(t[0], t[1]) for t in nodes], dtype=float)
+        self.xs, self.ys = points[:, 0], points[:, 1]
+        self.dxs = np.diff(self.xs)
+        self.dys = np.diff(self.ys)
+        squared_lengths = self.dxs * self.dxs + self.dys * self.dys
+        # a segment of length zero has a zero dot product, hence the point is measured from its start
+        self.divisors = np.where(squared_lengths == 0, 1.0, squared_lengths)
+        self.segment_lengths = np.sqrt(squared_lengths)
+        self.length = 0.0
+        for segment_length in self.segment_lengths:
+            self.length += segment_length
+
+    def distances(self, xs, ys) -> np.ndarray:
+        """
+        :param xs: Array of the x coordinates of the points
+        :param ys: Array of the y coordinates of the points
+        :return: Array of the distances of the points to the polyline
+        """
+        # the points are the rows and the vertices or segments are the columns
+        relative_xs = np.asarray(xs, dtype=float)[:, np.newaxis] - self.xs
+        relative_ys = np.asarray(ys, dtype=float)[:, np.newaxis] - self.ys
+        vertex_distances = np.sqrt(relative_xs * relative_xs + relative_ys * relative_ys)
+        relative_xs, relative_ys = relative_xs[:, :-1], relative_ys[:, :-1]
+        r = (relative_xs * self.dxs + relative_ys * self.dys) / self.divisors
+        # GEOS negates the relative coordinates in the cross product, which does not change its magnitude
+        s = (relative_xs * self.dys - relative_ys * self.dxs) / self.divisors
+        distances = np.abs(s) * self.segment_lengths
+        distances = np.where(r >= 1.0, vertex_distances[:, 1:], distances)
+        distances = np.where(r <= 0.0, vertex_distances[:, :-1], distances)
+        return distances.min(axis=1)
+
+
 class Car:
     """Class that conducts transformations to vectors automatically,
     using the commads "go straight", "turn left", "turn right".
@@ -113,9 +153,7 @@ class Car:
         mini_nodes2 = nodes[round(len(nodes) / 2) :]
         if (len(mini_nodes1) < 2) or (len(mini_nodes2) < 2):
             return 0, []
-        mini_road1 = LineString([(t[0], t[1]) for t in mini_nodes1])
-        mini_road2 = LineString([(t[0], t[1]) for t in mini_nodes2])
-        road_split = [mini_road1, mini_road2]
+        road_split = [_Polyline(mini_nodes1), _Polyline(mini_nodes2)]
 
         if (road.is_simple is False) or (is_too_sharp(_interpolate(nodes)) is True):
             fitness = 0
@@ -138,42 +176,38 @@ class Car:
                     self.y = mini_nodes2[0][1]
                     self.angle = self.get_angle(mini_nodes1[-1], mini_nodes2[0])
 
-                current_pos = [(self.x, self.y)]
+                # the length of the path of the car on this half of the road is summed up step by step
+                last_x, last_y = self.x, self.y
 
                 while (current_length < mini_road.length) and i < 1000:
-                    distance = self.get_distance(mini_road, self.x, self.y)
+                    # the points probing the road to the right and to the left are measured with the car at once
+                    angle = -1 + self.angle
+                    x_right = self.speed * np.cos(m.radians(angle)) + self.x
+                    y_right = self.speed * np.sin(m.radians(angle)) + self.y
+                    angle = 1 + self.angle
+                    x_left = self.speed * np.cos(m.radians(angle)) + self.x
+                    y_left = self.speed * np.sin(m.radians(angle)) + self.y
+                    distance, distance_right, distance_left = mini_road.distances(
+                        [self.x, x_right, x_left], [self.y, y_right, y_left]
+                    )
                     self.distance = distance
 
                     self.tot_dist.append(distance)
                     if distance <= 1:
                         self.go_straight()
-                        current_pos.append((self.x, self.y))
                         self.speed += 0.3
 
                     else:
-                        angle = -1 + self.angle
-                        x = self.speed * np.cos(m.radians(angle)) + self.x
-                        y = self.speed * np.sin(m.radians(angle)) + self.y
-
-                        distance_right = self.get_distance(mini_road, x, y)
-
-                        angle = 1 + self.angle
-                        x = self.speed * np.cos(m.radians(angle)) + self.x
-                        y = self.speed * np.sin(m.radians(angle)) + self.y
-
-                        distance_left = self.get_distance(mini_road, x, y)
-
                         if distance_right < distance_left:
                             self.turn_right()
-                            current_pos.append((self.x, self.y))
                         else:
                             self.turn_left()
-                            current_pos.append((self.x, self.y))
 
                         self.speed -= 0.1
 
-                    current_road = LineString(current_pos)
-                    current_length = current_road.length
+                    dx, dy = self.x - last_x, self.y - last_y
+                    current_length += m.sqrt(dx * dx + dy * dy)
+                    last_x, last_y = self.x, self.y
 
                     i += 1
 
@@ -211,13 +245,24 @@ def find_circle(p1, p2, p3):
 def min_radius(x, w=5):
     mr = np.inf
     nodes = x
-    for i in range(len(nodes) - w):
-        p1 = nodes[i]
-        p2 = nodes[i + int((w - 1) / 2)]
-        p3 = nodes[i + (w - 1)]
-        radius = find_circle(p1, p2, p3)
-        if radius < mr:
-            mr = radius
+    nr_of_circles = len(nodes) - w
+    if nr_of_circles > 0:
+        # the circles of all windows are found at once, see find_circle()
+        points = np.array([(t[0], t[1]) for t in nodes], dtype=float)
+        p1 = points[:nr_of_circles]
+        p2 = points[int((w - 1) / 2) : int((w - 1) / 2) + nr_of_circles]
+        p3 = points[w - 1 : w - 1 + nr_of_circles]
+        temp = p2[:, 0] * p2[:, 0] + p2[:, 1] * p2[:, 1]
+        bc = (p1[:, 0] * p1[:, 0] + p1[:, 1] * p1[:, 1] - temp) / 2
+        cd = (temp - p3[:, 0] * p3[:, 0] - p3[:, 1] * p3[:, 1]) / 2
+        det = (p1[:, 0] - p2[:, 0]) * (p2[:, 1] - p3[:, 1]) - (p2[:, 0] - p3[:, 0]) * (p1[:, 1] - p2[:, 1])
+        is_line = np.abs(det) < 1.0e-6
+        det = np.where(is_line, 1.0, det)
+        cx = (bc * (p2[:, 1] - p3[:, 1]) - cd * (p1[:, 1] - p2[:, 1])) / det
+        cy = ((p1[:, 0] - p2[:, 0]) * cd - (p2[:, 0] - p3[:, 0]) * bc) / det
+        # squares like the power of the scalars, which differs from x * x in the last bit of some values
+        radii = np.sqrt(np.float_power(cx - p1[:, 0], 2) + np.float_power(cy - p1[:, 1], 2))
+        mr = np.where(is_line, np.inf, radii).min()
     if mr == np.inf:
         mr = 0
 
@@ -265,8 +310,8 @@ def _interpolate(the_test):
     # Return the 4-tuple with default z and defatul road width
     return list(
         zip(
-            [round(v, rounding_precision) for v in new_x_vals],
-            [round(v, rounding_precision) for v in new_y_vals],
+            list(np.round(new_x_vals, rounding_precision)),
+            list(np.round(new_y_vals, rounding_precision)),
             [-28.0 for v in new_x_vals],
             [8.0 for v in new_x_vals],
         )
@@ -1,6 +1,8 @@
 # from code_pipeline.tests_generation import RoadTestFactory
+import contextlib
 import logging as log
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 from pymoo.algorithms.nsga2 import NSGA2
 from pymoo.configuration import Configuration
@@ -33,6 +35,9 @@ class CustomAmbieGenGenerator:
         self.map_size = kwargs.get("map_size", map_size)
         self.executor = executor
         self.count = kwargs.get("count", None)
+        self.seed = kwargs.get("seed", None)
+        # number of worker processes evaluating the fitness of the individuals
+        self.jobs = kwargs.get("jobs", 1)
 
     def start(self):
         """
@@ -50,17 +55,31 @@ class CustomAmbieGenGenerator:
             eliminate_duplicates=DuplicateElimination(),
         )
 
+        # the pool of workers is kept for all runs of the algorithm
+        with ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else contextlib.nullcontext() as executor:
+            test_suite = self.__run(algorithm, executor)
+        return test_suite
+
+    def __run(self, algorithm, executor):
         generated_tests_count = 0
         test_suite = []
         start = time.time()
         tests_per_run = 10
+        run = 0
         while generated_tests_count < self.count:
-            t = int(time.time() * 1000)
-            seed = (
-                ((t & 0xFF000000) >> 24) + ((t & 0x00FF0000) >> 8) + ((t & 0x0000FF00) << 8) + ((t & 0x000000FF) << 24)
-            )
+            if self.seed is not None:
+                seed = (self.seed + run) % 2**32
+            else:
+                t = int(time.time() * 1000)
+                seed = (
+                    ((t & 0xFF000000) >> 24)
+                    + ((t & 0x00FF0000) >> 8)
+                    + ((t & 0x0000FF00) << 8)
+                    + ((t & 0x000000FF) << 24)
+                )
+            run += 1
             res = minimize(
-                TestCaseProblem(),
+                TestCaseProblem(executor=executor),
                 algorithm,
                 ("n_gen", cf.ga["n_gen"]),
                 seed=seed,
@@ -32,6 +32,32 @@ class BaseFrenetGenerator(BaseGenerator):
         road_points = self.reframe_road(xs, ys)
         return road_points
 
+    def kappas_to_road_points_batch(self, kappas_list, frenet_step=10, theta0=1.57):
+        """
+        Batch variant of kappas_to_road_points(), the roads with the same number of kappas are transformed at once.
+
+        Args:
+            kappas_list: list of lists of kappa values
+            frenet_step: The distance between to points.
+            theta0: The initial angle of the line. (1.57 == 90 degrees)
+        Returns:
+            list of the road points in cartesian coordinates in the order of the kappas
+        """
+        y0 = self.margin
+        x0 = self.map_size / 2
+        indices_by_length = {}
+        for index, kappas in enumerate(kappas_list):
+            indices_by_length.setdefault(len(kappas), []).append(index)
+
+        road_points_list = [None] * len(kappas_list)
+        for length, indices in indices_by_length.items():
+            ss = np.arange(y0, (length * frenet_step), frenet_step)
+            kappas_matrix = np.array([kappas_list[index] for index in indices], dtype=float).reshape(len(indices), -1)
+            (xs_matrix, ys_matrix) = frenet.frenet_to_cartesian_batch(x0, y0, theta0, ss, kappas_matrix)
+            for index, xs, ys in zip(indices, xs_matrix, ys_matrix):
+                road_points_list[index] = self.reframe_road(xs, ys)
+        return road_points_list
+
     def execute_frenet_test(self, kappas, method="random", frenet_step=10, theta0=1.57, parent_info={}, extra_info={}):
         extra_info["kappas"] = kappas
         road_points = self.kappas_to_road_points(kappas, frenet_step=frenet_step, theta0=theta0)
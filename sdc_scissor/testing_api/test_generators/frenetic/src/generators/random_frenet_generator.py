@@ -6,6 +6,24 @@ import numpy as np
 from sdc_scissor.testing_api.test_generators.frenetic.src.generators.base_frenet_generator import BaseFrenetGenerator
 
 
+def _choice_of_linspace(start, stop, num=50):
+    """
+    Same as random.choice(np.linspace(start, stop, num)) without creating the array. The random index is drawn like
+    random.choice() does and the value is computed like np.linspace() does, hence the random state and the value are
+    the same.
+    """
+    i = random.randrange(num)
+    if i == num - 1:
+        return float(stop)
+    # Python floats are IEEE doubles like np.float64 but faster for scalar arithmetic
+    start = float(start)
+    delta = float(stop) - start
+    step = delta / (num - 1)
+    if step == 0:
+        return i / (num - 1) * delta + start
+    return i * step + start
+
+
 class CustomFrenetGenerator(BaseFrenetGenerator):
     """
     Generates tests using the frenet framework to determine curvatures.
@@ -64,16 +82,15 @@ class CustomFrenetGenerator(BaseFrenetGenerator):
 
     def generate_initial_population(self):
         # while self.executor.get_remaining_time() > (self.time_budget - self.random_gen_budget):
-        road_points_collection = []
+        kappas_list = []
         cnt = 0
         while cnt < self.count:
             # print(cnt)
             cnt += 1
             log.debug("Random generation. Remaining time %s", 10)
-            kappas = self.generate_random_test()
-            road_points = self.execute_frenet_test(kappas, frenet_step=self.frenet_step)
-            road_points_collection.append(road_points)
-            # print(road_points)
+            kappas_list.append(self.generate_random_test())
+        # the roads are transformed at once, the random kappas are drawn in the same order as before
+        road_points_collection = self.kappas_to_road_points_batch(kappas_list, frenet_step=self.frenet_step)
         return road_points_collection
 
     def generate_mutants(self):
@@ -255,8 +272,8 @@ class CustomFrenetGenerator(BaseFrenetGenerator):
 
     @staticmethod
     def get_next_kappa(last_kappa, kappa_bound=0.05, kappa_delta=0.07):
-        return random.choice(
-            np.linspace(max(-kappa_bound, last_kappa - kappa_delta), min(kappa_bound, last_kappa + kappa_delta))
+        return _choice_of_linspace(
+            max(-kappa_bound, last_kappa - kappa_delta), min(kappa_bound, last_kappa + kappa_delta)
         )
 
     @staticmethod
@@ -7,14 +7,39 @@ def frenet_to_cartesian(x0, y0, theta0, ss, kappas):
     Numerical integration with trapezoidal rule to transform curvature samples
     given in Frenet frame to points in Cartesian frame
     """
-    xs = np.zeros(ss.shape[0])
-    ys = np.zeros(ss.shape[0])
-    thetas = np.zeros(ss.shape[0])
-    xs[0] = x0
-    ys[0] = y0
-    thetas[0] = theta0
-    for i in range(thetas.shape[0] - 1):
-        thetas[i + 1] = thetas[i] + (kappas[i + 1] + kappas[i]) * (ss[i + 1] - ss[i]) / 2.0
-        xs[i + 1] = xs[i] + (ss[i + 1] - ss[i]) * np.cos(thetas[i])
-        ys[i + 1] = ys[i] + (ss[i + 1] - ss[i]) * np.sin(thetas[i])
+    (xs, ys) = frenet_to_cartesian_batch(x0, y0, theta0, ss, np.asarray(kappas, dtype=float)[np.newaxis, :])
+    return (xs[0], ys[0])
+
+
+def frenet_to_cartesian_batch(x0, y0, theta0, ss, kappas):
+    """
+    Vectorized frenet_to_cartesian() for several roads with the same arc lengths. The integration runs over all roads
+    at once with cumulative sums, the sums start with the initial values and accumulate in the same order as the
+    step-by-step integration, hence both give the same points.
+
+    :param x0: Initial x coordinate of all roads
+    :param y0: Initial y coordinate of all roads
+    :param theta0: Initial angle of all roads
+    :param ss: Arc lengths of the points
+    :param kappas: Matrix of the curvatures with a row per road and at least as many columns as arc lengths
+    :return: Tuple of the matrices of the x and y coordinates with a row per road
+    """
+    ss = np.asarray(ss, dtype=float)
+    kappas = np.asarray(kappas, dtype=float)
+    nr_of_roads = kappas.shape[0]
+    nr_of_points = ss.shape[0]
+    if nr_of_points == 0:
+        return (np.zeros((nr_of_roads, 0)), np.zeros((nr_of_roads, 0)))
+    ss_diff = np.diff(ss)
+    kappas = kappas[:, :nr_of_points]
+    thetas = _cumsum_from(theta0, (kappas[:, 1:] + kappas[:, :-1]) * ss_diff / 2.0)
+    xs = _cumsum_from(x0, ss_diff * np.cos(thetas[:, :-1]))
+    ys = _cumsum_from(y0, ss_diff * np.sin(thetas[:, :-1]))
     return (xs, ys)
+
+
+def _cumsum_from(initial_value, increments):
+    values = np.empty((increments.shape[0], increments.shape[1] + 1))
+    values[:, 0] = initial_value
+    values[:, 1:] = increments
+    return np.cumsum(values, axis=1, out=values)
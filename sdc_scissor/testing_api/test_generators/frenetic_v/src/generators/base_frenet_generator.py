@@ -1,11 +1,48 @@
 import logging as log
+from collections import defaultdict
+from math import cos, pi, sin
 
 import numpy as np
 from shapely import affinity, geometry
 
+from sdc_scissor.testing_api.road_prefilter import INVALID, UNDECIDED, prefilter_roads
 from sdc_scissor.testing_api.test_generators.frenetic_v.src.generators.base_generator import BaseGenerator
 from sdc_scissor.testing_api.test_generators.frenetic_v.src.utils import frenet
 
+# cosines and sines of the orientations tried to fit a road into the map, 0, 1, ..., 89 degrees, as a column,
+# computed like shapely.affinity.rotate() does
+_COS_ORIENTATIONS = np.array([[cos(orientation * pi / 180.0)] for orientation in range(0, 90, 1)])
+_SIN_ORIENTATIONS = np.array([[sin(orientation * pi / 180.0)] for orientation in range(0, 90, 1)])
+_COS_ORIENTATIONS[np.abs(_COS_ORIENTATIONS) < 2.5e-16] = 0.0
+_SIN_ORIENTATIONS[np.abs(_SIN_ORIENTATIONS) < 2.5e-16] = 0.0
+# roads that are wider than the map by less than this distance are checked for every orientation
+_WIDTH_TOLERANCE = 1e-6
+
+
+def _are_within(points: np.ndarray, low: float, high: float) -> bool:
+    # a rectangle contains a line if it contains all its points
+    return bool(np.all((points >= low) & (points <= high)))
+
+
+def _get_minimum_width(points: np.ndarray) -> float:
+    """
+    Minimum width of a set of points, i.e., the smallest distance between two parallel lines enclosing the points. As
+    with rotating calipers, one of the lines is incident to an edge of the convex hull of the points. The edges are
+    among the connections of all pairs of points, hence the width is taken across the normals of all connections at
+    once instead of computing the hull.
+
+    :param points: Array of shape (n, 2)
+    :return: The minimum width, 0 for less than three points
+    """
+    if len(points) < 3:
+        return 0.0
+    i, j = np.triu_indices(len(points), k=1)
+    connections = points[j] - points[i]
+    lengths = np.hypot(connections[:, 0], connections[:, 1])
+    normals = np.column_stack([-connections[:, 1], connections[:, 0]])[lengths > 0] / lengths[lengths > 0, np.newaxis]
+    projections = normals @ points.T
+    return float(np.min(projections.max(axis=1) - projections.min(axis=1)))
+
 
 class BaseFrenetVGenerator(BaseGenerator):
     def __init__(
@@ -47,13 +84,52 @@ class BaseFrenetVGenerator(BaseGenerator):
 
         return np.column_stack([xs, ys])
 
+    def kappas_to_road_points_batch(self, kappas_list) -> list:
+        """
+        Batch variant of kappas_to_road_points(), the roads with the same number of kappas are transformed at once.
+
+        :param kappas_list: list of lists of kappa values
+        :return: list of the road points in cartesian coordinates in the order of the kappas
+        """
+        y0 = self.margin
+        x0 = self.map_size / 2
+        indices_by_length = defaultdict(list)
+        for index, kappas in enumerate(kappas_list):
+            indices_by_length[len(kappas)].append(index)
+
+        road_points_list = [None] * len(kappas_list)
+        for length, indices in indices_by_length.items():
+            ss = np.cumsum([self.segment_length] * length) - self.segment_length
+            kappas_matrix = np.array([kappas_list[index] for index in indices], dtype=float).reshape(len(indices), -1)
+            (xs_matrix, ys_matrix) = frenet.frenetv_to_cartesian_batch(x0, y0, self.theta0, ss, kappas_matrix)
+            for index, xs, ys in zip(indices, xs_matrix, ys_matrix):
+                road_points_list[index] = np.column_stack([xs, ys])
+        return road_points_list
+
     def execute_frenet_test(self, kappas, method="random", parent_info={}, extra_info={}):
         extra_info["kappas"] = kappas
         road_points = self.kappas_to_road_points(kappas)
+        return self.__execute_road_points(road_points, self.is_likely_self_intersecting(road_points))
+
+    def execute_frenet_tests(self, kappas_list) -> list:
+        """
+        Batch variant of execute_frenet_test() for the random generation, the roads are transformed and checked for
+        self-intersections at once.
 
+        :param kappas_list: list of lists of kappa values
+        :return: list of the results of execute_frenet_test() in the order of the kappas
+        """
+        road_points_list = self.kappas_to_road_points_batch(kappas_list)
+        are_self_intersecting = self.are_likely_self_intersecting(road_points_list)
+        return [
+            self.__execute_road_points(road_points, is_self_intersecting)
+            for road_points, is_self_intersecting in zip(road_points_list, are_self_intersecting)
+        ]
+
+    def __execute_road_points(self, road_points, is_self_intersecting):
         # Pre-validation
         # 1. check self-intersection
-        if self.is_likely_self_intersecting(road_points):
+        if is_self_intersecting:
             return "LIKELY_SELF_INTERSECTING", None
 
         # 2. check if it a) fits into map-dimensions and b) if we can transform it to be inside the map
@@ -69,6 +145,32 @@ class BaseFrenetVGenerator(BaseGenerator):
             return "CANNOT_REFRAME", None
 
     def is_likely_self_intersecting(self, road_points) -> bool:
+        return self.are_likely_self_intersecting([road_points])[0]
+
+    def are_likely_self_intersecting(self, road_points_list) -> list[bool]:
+        """
+        Check roads for self-intersections of their center line and their lane lines. The roads are decided by the
+        vectorized prefilter of the road validation, which rejects roads whose center line crosses itself and accepts
+        roads that turn too little for their lane lines to meet. Only the remaining roads are checked with Shapely.
+
+        :param road_points_list: list of the road points in cartesian coordinates
+        :return: list telling for every road whether it is likely self-intersecting
+        """
+        indices_by_nr_of_points = defaultdict(list)
+        for index, road_points in enumerate(road_points_list):
+            indices_by_nr_of_points[len(road_points)].append(index)
+
+        results = [None] * len(road_points_list)
+        for indices in indices_by_nr_of_points.values():
+            road_matrices = np.array([road_points_list[index] for index in indices], dtype=float)
+            for index, decision in zip(indices, prefilter_roads(road_matrices, self.lane_width)):
+                if decision == UNDECIDED:
+                    results[index] = self.__is_likely_self_intersecting_with_shapely(road_points_list[index])
+                else:
+                    results[index] = decision == INVALID
+        return results
+
+    def __is_likely_self_intersecting_with_shapely(self, road_points) -> bool:
         center_line = geometry.LineString(road_points)
 
         left_line = center_line.parallel_offset(self.lane_width, "left")
@@ -100,37 +202,47 @@ class BaseFrenetVGenerator(BaseGenerator):
         return new_center_line
 
     def reframe_road(self, road_points):
-        center_line = geometry.LineString(road_points)
+        """
+        Place the road inside the map without its margin. A road that already fits is kept, otherwise the road is
+        rotated by the first of the orientations 0, 1, ..., 89 degrees around the center of its bounding box for which
+        its bounding box fits and moved to the lower left corner of the map.
 
-        reduced_map_rect = geometry.Polygon(
-            [
-                (self.margin, self.margin),
-                (self.margin, self.map_size - self.margin),
-                (self.map_size - self.margin, self.map_size - self.margin),
-                (self.map_size - self.margin, self.margin),
-            ]
-        )
+        All orientations are evaluated at once with NumPy, using the same arithmetic as Shapely's rotate() and
+        translate(), hence the placement is the same as with Shapely. Roads that are wider than the map in every
+        direction, i.e., their minimum width exceeds the map, cannot fit in any orientation and are rejected without
+        trying the orientations.
+
+        :param road_points: road points in cartesian coordinates
+        :return: the placed road points or None if the road cannot be fit within the map
+        """
+        points = np.asarray(road_points, dtype=float)
+        low, high = self.margin, self.map_size - self.margin
 
         # check if the line is in the map already
-        if reduced_map_rect.contains(center_line):
+        if _are_within(points, low, high):
             log.debug("The road already fits.")
             return road_points
 
-        # rotation and alignment
+        if _get_minimum_width(points) > (high - low) + _WIDTH_TOLERANCE:
+            log.info("The road could not be fit within the boundaries.")
+            return None
 
-        # Aligning based on best-fit orientation of two rectangles
-        # https://math.stackexchange.com/questions/3179927/determining-best-angle-of-rotation-to-fit-a-rectangle-inside-a-rectangle
-        # l = geometry.LineString(rectangular_hull_coords[0:2]).length
-        # b = geometry.LineString(rectangular_hull_coords[1:3]).length
-        # orientation = math.acos(self.map_size / math.sqrt(l ** 2 + b ** 2)) + math.atan(b / l)
-        # new_center_line = self.rotate_and_relocate_line(center_line, orientation)
-
-        # If aligning rectangles does not always work...
-        for orientation in range(0, 90, 1):
-            new_center_line = self.rotate_and_relocate_line(center_line, orientation)
-            if reduced_map_rect.contains(new_center_line):
-                log.info("Road was relocated and rotated")
-                return np.array(new_center_line.coords)
-
-        log.info("The road could not be fit within the boundaries.")
-        return None
+        # rotation and alignment
+        # Shapely moves the road by the bounds of its convex hull, which are the bounds of its points
+        x0 = (points[:, 0].max() + points[:, 0].min()) / 2.0
+        y0 = (points[:, 1].max() + points[:, 1].min()) / 2.0
+        xs = _COS_ORIENTATIONS * points[:, 0] + -_SIN_ORIENTATIONS * points[:, 1]
+        xs += x0 - x0 * _COS_ORIENTATIONS + y0 * _SIN_ORIENTATIONS
+        ys = _SIN_ORIENTATIONS * points[:, 0] + _COS_ORIENTATIONS * points[:, 1]
+        ys += y0 - x0 * _SIN_ORIENTATIONS - y0 * _COS_ORIENTATIONS
+        # the bounding box of the road is moved to the lower left corner of the map
+        xs += low - xs.min(axis=1, keepdims=True)
+        ys += low - ys.min(axis=1, keepdims=True)
+        fits = np.all((xs >= low) & (xs <= high) & (ys >= low) & (ys <= high), axis=1)
+        if not fits.any():
+            log.info("The road could not be fit within the boundaries.")
+            return None
+
+        i = np.argmax(fits)
+        log.info("Road was relocated and rotated")
+        return np.column_stack([xs[i], ys[i]])
@@ -75,16 +75,18 @@ class CustomFrenetVGenerator(BaseFrenetVGenerator):
 
     def generate_initial_population(self):
         # while self.executor.get_remaining_time() > (self.time_budget - self.random_gen_budget):
-        road_points_collection = []
+        kappas_list = []
         cnt = 0
         while cnt < self.count:
             # print(cnt)
             cnt += 1
             log.info("Random generation. Remaining time %s", 10)
-            kappas = self.generate_random_test()
-            road_points = self.execute_frenet_test(kappas)
-            road_points_collection.append(road_points)
-            # print(road_points)
+            kappas_list.append(self.generate_random_test())
+        # rejected roads are reported as (reason, None), the test generator skips roads that are None
+        road_points_collection = [
+            road_points if isinstance(road_points, list) else None
+            for road_points in self.execute_frenet_tests(kappas_list)
+        ]
         return road_points_collection
 
     def generate_mutants(self):
@@ -131,6 +133,11 @@ class CustomFrenetVGenerator(BaseFrenetVGenerator):
             kappas = self.normalize_test(kappas)
         return super().execute_frenet_test(kappas, method, parent_info, extra_info)
 
+    def execute_frenet_tests(self, kappas_list):
+        if self.normalize:
+            kappas_list = [self.normalize_test(kappas) for kappas in kappas_list]
+        return super().execute_frenet_tests(kappas_list)
+
     def mutate_test(self, parent):
         # Parent info to be added to the dataframe
         ancestors = []
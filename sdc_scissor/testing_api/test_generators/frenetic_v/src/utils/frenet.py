@@ -5,15 +5,38 @@ def frenetv_to_cartesian(x0, y0, theta0, ss, kappas):
     """
     Trapezoidal integration to compute Cartesian coordinates from given curvature values.
     """
-    xs = np.zeros(len(kappas))
-    ys = np.zeros(len(kappas))
-    thetas = np.zeros(len(kappas))
-    xs[0] = x0
-    ys[0] = y0
-    thetas[0] = theta0
-    for i in range(thetas.shape[0] - 1):
-        ss_diff_half = (ss[i + 1] - ss[i]) / 2.0
-        thetas[i + 1] = thetas[i] + (kappas[i + 1] + kappas[i]) * ss_diff_half
-        xs[i + 1] = xs[i] + (np.cos(thetas[i + 1]) + np.cos(thetas[i])) * ss_diff_half
-        ys[i + 1] = ys[i] + (np.sin(thetas[i + 1]) + np.sin(thetas[i])) * ss_diff_half
+    (xs, ys) = frenetv_to_cartesian_batch(x0, y0, theta0, ss, np.asarray(kappas, dtype=float)[np.newaxis, :])
+    return (xs[0], ys[0])
+
+
+def frenetv_to_cartesian_batch(x0, y0, theta0, ss, kappas):
+    """
+    Vectorized frenetv_to_cartesian() for several roads with the same arc lengths. The integration runs over all
+    roads at once with cumulative sums, the sums start with the initial values and accumulate in the same order as
+    the step-by-step integration, hence both give the same points.
+
+    :param x0: Initial x coordinate of all roads
+    :param y0: Initial y coordinate of all roads
+    :param theta0: Initial angle of all roads
+    :param ss: Arc lengths of the points, at least as many as curvatures
+    :param kappas: Matrix of the curvatures with a row per road and a column per point
+    :return: Tuple of the matrices of the x and y coordinates with a row per road
+    """
+    kappas = np.asarray(kappas, dtype=float)
+    nr_of_roads, nr_of_points = kappas.shape
+    if nr_of_points == 0:
+        return (np.zeros((nr_of_roads, 0)), np.zeros((nr_of_roads, 0)))
+    ss_diff_half = np.diff(np.asarray(ss, dtype=float)[:nr_of_points]) / 2.0
+    thetas = _cumsum_from(theta0, (kappas[:, 1:] + kappas[:, :-1]) * ss_diff_half)
+    cos_thetas = np.cos(thetas)
+    sin_thetas = np.sin(thetas)
+    xs = _cumsum_from(x0, (cos_thetas[:, 1:] + cos_thetas[:, :-1]) * ss_diff_half)
+    ys = _cumsum_from(y0, (sin_thetas[:, 1:] + sin_thetas[:, :-1]) * ss_diff_half)
     return (xs, ys)
+
+
+def _cumsum_from(initial_value, increments):
+    values = np.empty((increments.shape[0], increments.shape[1] + 1))
+    values[:, 0] = initial_value
+    values[:, 1:] = increments
+    return np.cumsum(values, axis=1, out=values)
@@ -1,48 +1,172 @@
+import collections
 import json
 import logging
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
+from sdc_scissor.testing_api.packed_test_corpus import PackedTestCorpus, PackedTestPath
 from sdc_scissor.testing_api.test import Test
+from sdc_scissor.testing_api.test_catalog import TestCatalog
+from sdc_scissor.testing_api.test_manifest import TestManifest
 from sdc_scissor.testing_api.test_validator import TestValidator
 
 
+def _load_test(test_path: Path, test_validator: TestValidator, with_metadata: bool) -> tuple:
+    """
+    Load and validate a test if it is not marked as invalid. Runs on the workers of the prefetching iterator.
+
+    :param test_path: Path to the JSON file of the test
+    :param test_validator: Validator to apply on the loaded test
+    :param with_metadata: Whether to return the metadata for the manifest
+    :return: Tuple of the test, or None if it is marked as invalid, and the metadata, or None
+    """
+    test_json = TestLoader.read_test_json(test_path)
+    metadata = TestLoader.get_metadata(test_path, test_json) if with_metadata else None
+    if not TestLoader.is_marked_as_valid(test_json):
+        return None, metadata
+    return TestLoader.get_test_from_json(test_path, test_json, test_validator), metadata
+
+
 class TestLoader:
-    def __init__(self, tests_dir: Path, test_validator: TestValidator):
+    def __init__(
+        self,
+        tests_dir: Path,
+        test_validator: TestValidator,
+        manifest_path: Path = None,
+        catalog_path: Path = None,
+        catalog_query: str = None,
+    ):
         """
+        Every test file is parsed at most once. Whether a test is marked as invalid is checked when it is about to be
+        loaded, not while scanning the directory. With a manifest or a catalog, the metadata of unchanged test files is
+        persisted across runs and tests that are known to be invalid are skipped without parsing them. With a catalog
+        query, the tests are selected from the catalog without walking the directory.
 
-        :param tests_dir:
+        :param tests_dir: Directory containing JSON test files or a packed test corpus
+        :param test_validator:
+        :param manifest_path: Optional path to a manifest file, not supported for packed test corpora
+        :param catalog_path: Optional path to a test catalog, not supported for packed test corpora
+        :param catalog_query: Optional SQL expression selecting the valid tests of the catalog to load, e.g.,
+            "test_outcome IS NULL AND road_distance > 200"
         """
         self.tests_dir: Path = tests_dir
         self.test_validator: TestValidator = test_validator
+        self.test_manifest: TestManifest = None
+        self.test_catalog: TestCatalog = None
         self.test_paths: list[Path] = []
-        self.__set_test_paths(self.test_paths)
+        self.__unchecked_test_paths: set = set()
+        self.__test_jsons: dict = {}
+        if PackedTestCorpus.is_packed_corpus(tests_dir):
+            if manifest_path or catalog_path or catalog_query is not None:
+                raise Exception(
+                    "Manifests, test catalogs and catalog queries are not supported for packed test corpora!"
+                )
+            self.__set_test_paths_from_corpus(self.test_paths)
+            return
+        self.test_manifest = TestManifest(manifest_path, tests_dir) if manifest_path else None
+        self.test_catalog = TestCatalog(catalog_path, tests_dir) if catalog_path else None
+        if catalog_query is not None:
+            if self.test_catalog is None:
+                raise Exception("A catalog query requires a test catalog!")
+            self.__set_test_paths_from_catalog(self.test_paths, catalog_query)
+        else:
+            self.__set_test_paths(self.test_paths)
 
-    def __set_test_paths(self, tests_paths: list):
+    def __get_metadata_stores(self) -> list:
+        return [store for store in (self.test_manifest, self.test_catalog) if store is not None]
+
+    def __put_metadata(self, test_path: Path, metadata: dict):
+        for store in self.__get_metadata_stores():
+            store.put(test_path, metadata)
+
+    @staticmethod
+    def find_test_paths(tests_dir: Path) -> list[Path]:
         """
+        Find the JSON test files of a directory without parsing them. Tests in unlabeled directories are ignored.
 
-        :param tests_paths:
+        :param tests_dir: Directory containing the tests
+        :return: List of the paths, next() loads them from the last to the first
         """
-        logging.debug("* _test_loader_gen")
+        test_paths: list[Path] = []
         pattern: str = r".*test.*.json"
-        for root, dirs, files in os.walk(self.tests_dir):
+        for root, dirs, files in os.walk(tests_dir):
             if "unlabeled" in str(root):
                 continue
             for file in files:
                 if re.fullmatch(pattern, file):
-                    full_path = Path(root) / file
-                    with open(full_path) as fp:
-                        test_json: dict = json.load(fp)
-                        is_valid = test_json.get("is_valid", True)
-                    if is_valid:
-                        tests_paths.append(full_path)
+                    test_paths.append(Path(root) / file)
+        return test_paths
+
+    def __set_test_paths(self, tests_paths: list):
+        """
+
+        :param tests_paths:
+        """
+        logging.debug("* _test_loader_gen")
+        found_test_paths = []
+        metadata_stores = self.__get_metadata_stores()
+        for full_path in self.find_test_paths(self.tests_dir):
+            if self.test_manifest is not None:
+                if full_path.resolve() == self.test_manifest.manifest_path.resolve():
+                    continue
+            found_test_paths.append(full_path)
+            metadata_lst = [store.get(full_path) for store in metadata_stores]
+            if not metadata_lst or any(metadata is None for metadata in metadata_lst):
+                self.__unchecked_test_paths.add(full_path)
+                tests_paths.append(full_path)
+            elif metadata_lst[0]["is_valid"]:
+                tests_paths.append(full_path)
+        if self.test_catalog is not None:
+            self.test_catalog.remove_missing(found_test_paths)
+
+    def __set_test_paths_from_catalog(self, tests_paths: list, catalog_query: str):
+        """
+        Reference the valid tests of the catalog matching the query. Neither the directory nor the tests are accessed,
+        hence the catalog has to be in sync with the directory.
+
+        :param tests_paths:
+        :param catalog_query: SQL expression over the columns of the catalog
+        """
+        query = "is_valid AND ({})".format(catalog_query) if catalog_query else "is_valid"
+        tests_paths.extend(reversed(self.test_catalog.select_test_paths(query)))
+
+    def __set_test_paths_from_corpus(self, tests_paths: list):
+        """
+        Reference the valid tests of a packed test corpus. The validity flags are read from the corpus index, so no
+        test is parsed.
+
+        :param tests_paths:
+        """
+        test_corpus = PackedTestCorpus(self.tests_dir)
+        for test_path in reversed(test_corpus.get_test_paths()):
+            if test_corpus.is_marked_as_valid(test_path.index):
+                tests_paths.append(test_path)
+        test_corpus.close()
+
+    def __skip_invalid_tests(self):
+        """
+        Parse the next test if it was not checked yet and drop it if it is marked as invalid. The parsed JSON is kept
+        until the test is loaded.
+        """
+        while self.test_paths and self.test_paths[-1] in self.__unchecked_test_paths:
+            test_path = self.test_paths[-1]
+            self.__unchecked_test_paths.discard(test_path)
+            test_json = self.read_test_json(test_path)
+            self.__put_metadata(test_path, self.get_metadata(test_path, test_json))
+            if self.is_marked_as_valid(test_json):
+                self.__test_jsons[test_path] = test_json
+            else:
+                self.test_paths.pop()
 
     def has_next(self) -> bool:
         """
 
         :return:
         """
+        self.__skip_invalid_tests()
         return len(self.test_paths) > 0
 
     def next(self) -> tuple[Test, Path]:
@@ -55,23 +179,197 @@ class TestLoader:
             raise Exception("There are no remaining tests!")
 
         test_path: Path = self.test_paths.pop()
-        test: Test = self.__load_test_from_path(test_path)
+        test_json = self.__test_jsons.pop(test_path, None)
+        if test_json is None:
+            test_json = self.read_test_json(test_path)
+        test: Test = self.get_test_from_json(test_path, test_json, self.test_validator)
         return test, test_path
 
-    def __load_test_from_path(self, test_path: Path):
+    def iter_tests(self, prefetch: int = 0, use_processes: bool = False) -> Iterator[tuple[Test, Path]]:
         """
+        Iterate over the remaining tests in the same order as consecutive calls of next() would load them. With
+        prefetching, the next tests are loaded and validated by a pool of workers while the consumer processes the
+        current test. At most prefetch tests are loaded ahead, which bounds the memory. Tests that are loaded ahead but
+        not consumed, because the iteration is stopped early, are dropped from the test loader.
 
-        :param test_path:
-        :return:
+        :param prefetch: Number of tests to load ahead, 0 loads every test when it is requested
+        :param use_processes: Load on worker processes instead of threads, the validator needs to be picklable
+        :return: Iterator of (test, test_path) tuples
+        """
+        if prefetch <= 0:
+            while self.has_next():
+                yield self.next()
+            return
+
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=min(prefetch, os.cpu_count() or 1))
+        else:
+            executor = ThreadPoolExecutor(max_workers=prefetch)
+        pending_tests = collections.deque()
+        try:
+            while self.test_paths or pending_tests:
+                while self.test_paths and len(pending_tests) < prefetch:
+                    test_path = self.test_paths.pop()
+                    # tests that were peeked at are loaded again on the workers
+                    self.__test_jsons.pop(test_path, None)
+                    with_metadata = len(self.__get_metadata_stores()) > 0 and test_path in self.__unchecked_test_paths
+                    self.__unchecked_test_paths.discard(test_path)
+                    future = executor.submit(_load_test, test_path, self.test_validator, with_metadata)
+                    pending_tests.append((test_path, future))
+
+                test_path, future = pending_tests.popleft()
+                test, metadata = future.result()
+                if metadata is not None:
+                    self.__put_metadata(test_path, metadata)
+                if test is not None:
+                    yield test, test_path
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def has_next_test_path(self) -> bool:
+        """
+        Check for remaining test paths without parsing any test, see next_test_paths().
+
+        :return: True if there are remaining test paths
+        """
+        return len(self.test_paths) > 0
+
+    def next_test_paths(self, n: int) -> list[Path]:
+        """
+        Take up to n of the remaining test paths without loading them. The paths are returned in the same order as
+        consecutive calls of next() would load them. Tests that were not checked yet are included without parsing
+        them, hence consumers have to skip tests that are not marked as valid themselves.
+
+        :param n: Maximum number of test paths to take
+        :return: List of test paths
+        """
+        test_paths: list[Path] = []
+        while self.test_paths and len(test_paths) < n:
+            test_path = self.test_paths.pop()
+            self.__test_jsons.pop(test_path, None)
+            test_paths.append(test_path)
+        return test_paths
+
+    def update_metadata(self, metadata_lst: list[tuple]):
+        """
+        Add the metadata of tests that were parsed outside of the test loader, e.g., by worker processes, to the
+        manifest and the catalog.
+
+        :param metadata_lst: List of (test_path, metadata) tuples
+        """
+        for test_path, metadata in metadata_lst:
+            self.__put_metadata(test_path, metadata)
+
+    def update_test_metadata(self, test_path: Path, test: Test):
+        """
+        Update the metadata of a test whose file was rewritten, e.g., after labeling or predicting it.
+
+        :param test_path: Path to the JSON file of the test
+        :param test: The saved test
+        """
+        if not self.__get_metadata_stores():
+            return
+        test_json = {
+            "is_valid": test.is_valid,
+            "test_outcome": test.test_outcome,
+            "predicted_test_outcome": test.predicted_test_outcome,
+            "test_duration": test.test_duration,
+        }
+        self.__put_metadata(test_path, self.get_metadata(test_path, test_json))
+
+    def save_metadata(self):
+        """
+        Persist the manifest and the catalog, if there are any.
+        """
+        if self.test_manifest is not None:
+            self.test_manifest.save()
+        if self.test_catalog is not None:
+            self.test_catalog.flush()
+
+    @staticmethod
+    def read_test_json(test_path: Path) -> dict:
+        """
+        Parse the JSON file of a test.
+
+        :param test_path: Path to the JSON file of the test
+        :return: Dictionary of the test
         """
         logging.debug(str(test_path))
+        if isinstance(test_path, PackedTestPath):
+            return test_path.read_test_json()
         with open(test_path, "r") as fp:
-            test_json: dict = json.load(fp)
+            return json.load(fp)
+
+    @staticmethod
+    def is_marked_as_valid(test_json: dict) -> bool:
+        """
+        Tests without a validity flag are considered valid.
+
+        :param test_json: Dictionary of the test
+        :return: False if the test is marked as invalid
+        """
+        return bool(test_json.get("is_valid", True))
 
+    @staticmethod
+    def get_test_id(test_path: Path) -> str:
+        """
+
+        :param test_path: Path to the JSON file of the test
+        :return: Identifier of the test
+        """
+        id_pattern = r"(.*test.*)"
+        match_obj = re.match(pattern=id_pattern, string=str(test_path))
+        return match_obj.group(1)
+
+    @staticmethod
+    def get_metadata(test_path: Path, test_json: dict) -> dict:
+        """
+        Metadata of a test as stored in the manifest.
+
+        :param test_path: Path to the JSON file of the test
+        :param test_json: Dictionary of the test
+        :return: Dictionary with is_valid, test_id, test_outcome, predicted_test_outcome and test_duration
+        """
+        test_duration = test_json.get("test_duration", None)
+        if not test_duration:
+            test_duration = test_json.get("simulation_time", None)
+        return {
+            "is_valid": TestLoader.is_marked_as_valid(test_json),
+            "test_id": TestLoader.get_test_id(test_path),
+            "test_outcome": test_json.get("test_outcome", None),
+            "predicted_test_outcome": test_json.get("predicted_test_outcome", None),
+            "test_duration": test_duration,
+        }
+
+    @staticmethod
+    def load_test_from_path(test_path: Path, test_validator: TestValidator) -> Test:
+        """
+        Load and validate a single test.
+
+        :param test_path: Path to the JSON file of the test
+        :param test_validator: Validator to apply on the loaded test
+        :return: The test object
+        """
+        return TestLoader.get_test_from_json(test_path, TestLoader.read_test_json(test_path), test_validator)
+
+    @staticmethod
+    def get_test_from_json(test_path: Path, test_json: dict, test_validator: TestValidator) -> Test:
+        """
+        Create and validate a test from its parsed JSON file.
+
+        :param test_path: Path to the JSON file of the test
+        :param test_json: Dictionary of the test
+        :param test_validator: Validator to apply on the test, None to leave the test unvalidated
+        :return: The test object
+        """
         road_points = test_json.get("interpolated_road_points", None)
-        if not road_points:
+        # the stored interpolation is reused, hence loading a test does not fit a spline
+        interpolated_road_points = None
+        if road_points is not None and len(road_points) > 0:
+            interpolated_road_points = [list(road_point[:2]) for road_point in road_points]
+        if road_points is None or len(road_points) == 0:
             road_points = test_json.get("interpolated_points", None)
-        if not road_points:
+        if road_points is None or len(road_points) == 0:
             road_points = test_json.get("road_points", None)
         if road_points is None:
             raise Exception("No road points")
@@ -80,14 +378,19 @@ class TestLoader:
         if not sim_time:
             sim_time = test_json.get("simulation_time", None)
 
-        id_pattern = r"(.*test.*)"
         logging.debug("test_path: {}".format(str(test_path)))
-        match_obj = re.match(pattern=id_pattern, string=str(test_path))
-        test_id = match_obj.group(1)
+        test_id = TestLoader.get_test_id(test_path)
         logging.debug("test_id: {}".format(test_id))
         logging.debug("road_points: {}".format(road_points))
 
-        test = Test(test_id=test_id, road_points=road_points, test_outcome=test_outcome, test_duration=sim_time)
-        self.test_validator.validate(test)
+        test = Test(
+            test_id=test_id,
+            road_points=road_points,
+            test_outcome=test_outcome,
+            test_duration=sim_time,
+            interpolated_road_points=interpolated_road_points,
+        )
+        if test_validator is not None:
+            test_validator.validate(test)
 
         return test
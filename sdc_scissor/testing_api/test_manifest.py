@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+class TestManifest:
+    def __init__(self, manifest_path: Path, tests_dir: Path):
+        """
+        Persisted metadata of the test files in a directory. An entry is only served as long as the modification time
+        and the size of its file are unchanged, hence modified tests are parsed again.
+
+        :param manifest_path: Path to the JSON file of the manifest
+        :param tests_dir: Directory containing the tests, entries are stored relative to it
+        """
+        self.manifest_path: Path = Path(manifest_path)
+        self.tests_dir: Path = Path(tests_dir)
+        self.__entries: dict = {}
+        self.__seen_keys: set = set()
+        self.__is_modified = False
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as fp:
+                manifest_json: dict = json.load(fp)
+            if manifest_json.get("version") == MANIFEST_VERSION:
+                self.__entries = manifest_json["tests"]
+            else:
+                logging.warning("Ignore test manifest of version {}".format(manifest_json.get("version")))
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __get_key(self, test_path: Path) -> str:
+        return os.path.relpath(test_path, self.tests_dir)
+
+    def get(self, test_path: Path, stat_result: os.stat_result = None):
+        """
+        Look up the metadata of a test file.
+
+        :param test_path: Path to the JSON file of the test
+        :param stat_result: Result of os.stat for the test file, if already available
+        :return: Dictionary of the metadata or None if the file is unknown or was modified
+        """
+        key = self.__get_key(test_path)
+        self.__seen_keys.add(key)
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        stat_result = stat_result if stat_result else os.stat(test_path)
+        if entry["mtime_ns"] != stat_result.st_mtime_ns or entry["size"] != stat_result.st_size:
+            return None
+        return entry
+
+    def put(self, test_path: Path, metadata: dict, stat_result: os.stat_result = None):
+        """
+        Store the metadata of a test file.
+
+        :param test_path: Path to the JSON file of the test
+        :param metadata: Dictionary with is_valid, test_id, test_outcome and test_duration
+        :param stat_result: Result of os.stat for the test file, if already available
+        """
+        stat_result = stat_result if stat_result else os.stat(test_path)
+        key = self.__get_key(test_path)
+        self.__seen_keys.add(key)
+        self.__entries[key] = dict(metadata, mtime_ns=stat_result.st_mtime_ns, size=stat_result.st_size)
+        self.__is_modified = True
+
+    def save(self):
+        """
+        Write the manifest if it changed. Entries of files that were not seen since the manifest was loaded, e.g.,
+        deleted tests, are dropped.
+        """
+        unseen_keys = self.__entries.keys() - self.__seen_keys
+        if not self.__is_modified and not unseen_keys:
+            return
+        for key in unseen_keys:
+            del self.__entries[key]
+
+        # write to a temporary file first so that an interrupted run does not leave a corrupt manifest behind
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump({"version": MANIFEST_VERSION, "tests": self.__entries}, fp)
+        os.replace(tmp_path, self.manifest_path)
+        self.__is_modified = False
@@ -1,12 +1,13 @@
-import copy
 import logging
 import time
+from pathlib import Path
 
 from scipy.spatial import distance
 from shapely.geometry import box
 
 from sdc_scissor.can_api.can_bus_handler import CanBusHandler
 from sdc_scissor.simulator_api.abstract_simulator import AbstractSimulator
+from sdc_scissor.testing_api.simulation_trace import SimulationTraceWriter
 
 
 def _get_t_previous_data(data, time_delta) -> tuple:
@@ -59,13 +60,11 @@ class TestMonitor:
         logging.debug(sensor_data)
         current_time = time.time() - self.start_time
         logging.debug("time: {}\tx: {}\ty: {}\tz: {}".format(current_time, x_pos, y_pos, z_pos))
-        # TODO: Cannot append a dictionary to the sim_data list. Why?!
-        current_simulation_data: dict = {
-            "time": current_time,
-            "position": (x_pos, y_pos, z_pos),
-            "sensors": sensor_data,
-        }
-        self.test.simulation_data.append(copy.deepcopy(current_simulation_data))
+        # only the positions are kept in memory, the sensor data is written to the simulation trace
+        self.test.simulation_data.append({"time": current_time, "position": (x_pos, y_pos, z_pos)})
+        if self.trace_writer is not None:
+            signals = sensor_data["_data"] if isinstance(sensor_data["_data"], dict) else {}
+            self.trace_writer.append(current_time, (x_pos, y_pos, z_pos), signals)
 
         self.cbh.transmit_sensor_data_to_can_bus(sensor_data["_data"])
 
@@ -124,10 +123,26 @@ class TestMonitor:
         logging.debug("stop_timer")
         self.end_time = time.time()
 
+    def start_trace(self, trace_path: Path):
+        """
+        Write the states of the car during the test execution to a simulation trace.
+
+        :param trace_path: Directory of the simulation trace
+        """
+        logging.debug("start_trace")
+        self.trace_writer = SimulationTraceWriter(trace_path)
+
     def dump_data(self):
-        """ """
+        """
+        Write the remaining data of the simulation trace and reference it in the test. The reference is the name of
+        the trace directory, which is located next to the test file.
+        """
         logging.debug("dump_data")
-        # TODO
+        if self.trace_writer is None:
+            return
+        self.trace_writer.close()
+        self.test.simulation_trace = self.trace_writer.trace_path.name
+        self.trace_writer = None
 
     def __is_car_out_of_lane(self, x_pos: float, y_pos: float) -> bool:
         """
@@ -192,3 +207,4 @@ def _reset_test_monitor(test_monitor: TestMonitor):
     test_monitor.road_model = None
     test_monitor.has_test_failed = None
     test_monitor.current_test_outcome = "UNDEFINED"
+    test_monitor.trace_writer = None
@@ -1,6 +1,7 @@
 import logging
 import math
 import time
+from pathlib import Path
 
 import numpy as np
 from beamngpy import BNGError, Scenario
@@ -108,8 +109,9 @@ class TestRunner:
             try:
                 self.test_monitor.reset()
                 total_test_runs += 1
-                self.run(test)
+                self.run(test, trace_path=Path(str(test_filename)).with_suffix(".trace"))
                 test.save_as_json(file_path=test_filename)
+                self.test_loader.update_test_metadata(test_filename, test)
                 has_execution_failed = False
                 time.sleep(5)
             except BNGError as err:
@@ -132,11 +134,12 @@ class TestRunner:
 
         self.simulator.close()
 
-    def run(self, test: Test) -> None:
+    def run(self, test: Test, trace_path: Path = None) -> None:
         """
         Runs the test with the simulator given by instantiation of the test runner.
 
         :param test: Test object that needs to be executed in simulation
+        :param trace_path: Optional directory to write the simulation trace to
         """
         logging.info("Run test: {}".format(test.test_id))
         logging.debug("* run")
@@ -161,6 +164,8 @@ class TestRunner:
         # test_monitor = TestMonitor(self.simulator, test, oob=self.oob, road_model=road_model, can_bus_handler=CanBusHandler(self.can_output))
         self.test_monitor.test = test
         self.test_monitor.road_model = road_model
+        if trace_path is not None:
+            self.test_monitor.start_trace(trace_path)
         self.test_monitor.start_timer()
         self.simulator.start_scenario()
 
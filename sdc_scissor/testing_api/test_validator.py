@@ -1,9 +1,13 @@
 import abc
+from collections import defaultdict
 
+import numpy as np
 from shapely.geometry import LineString, MultiLineString
 
 from sdc_scissor.feature_extraction_api.road_geometry_calculator import RoadGeometryCalculator
+from sdc_scissor.testing_api.road_prefilter import UNDECIDED, prefilter_roads
 from sdc_scissor.testing_api.test import Test
+from sdc_scissor.testing_api.validation_cache import ValidationCache
 
 
 class TestIsNotValidException(Exception):
@@ -15,6 +19,21 @@ class TestValidator(abc.ABC):
     def validate(self, test: Test) -> bool:
         pass
 
+    def validate_batch(self, tests: list[Test]) -> list[bool]:
+        """
+        Validate many tests at once. Validators that can share work between tests override it.
+
+        :param tests: List of tests
+        :return: List of the validation results
+        """
+        return [self.validate(test) for test in tests]
+
+    def flush(self):
+        """
+        Persist cached validation results, if there are any.
+        """
+        pass
+
 
 class SimpleTestValidator(TestValidator):
     def validate(self, test: Test) -> bool:
@@ -29,6 +48,9 @@ class TestValidatorDecorator(TestValidator):
     def validate(self, test: Test) -> bool:
         return self.wrappee.validate(test)
 
+    def flush(self):
+        self.wrappee.flush()
+
 
 class MakeTestInvalidValidator(TestValidatorDecorator):
     def __init__(self, wrappee: TestValidator):
@@ -41,30 +63,82 @@ class MakeTestInvalidValidator(TestValidatorDecorator):
 
 
 class NoIntersectionValidator(TestValidatorDecorator):
-    def __init__(self, wrappee: TestValidator):
+    def __init__(self, wrappee: TestValidator, validation_cache: ValidationCache = None, offset: float = 5):
+        """
+        A test is invalid if its interpolated road line or the two lines offset to its left and right intersect. Most
+        roads are decided by a vectorized prefilter, only the remaining ones are checked with Shapely.
+
+        :param wrappee: Validator that is applied first
+        :param validation_cache: Optional cache of the results of earlier validations
+        :param offset: Distance of the offset lines to the road line
+        """
         super().__init__(wrappee)
+        self.validation_cache: ValidationCache = validation_cache
+        self.offset: float = offset
 
     def validate(self, test: Test) -> bool:
         self.wrappee.validate(test)
         if not test.is_valid:
             return False
 
-        road_points_line_string: LineString = LineString(
-            coordinates=[(node[0], node[1]) for node in test.interpolated_road_points]
-        )
-        left_bound_line_string = road_points_line_string.parallel_offset(distance=5, side="left")
-        right_bound_line_string = road_points_line_string.parallel_offset(distance=5, side="right")
+        test.is_valid = self.__are_road_lines_simple([test.interpolated_road_points])[0]
+        return test.is_valid
+
+    def validate_batch(self, tests: list[Test]) -> list[bool]:
+        self.wrappee.validate_batch(tests)
+        valid_tests = [test for test in tests if test.is_valid]
+        results = self.__are_road_lines_simple([test.interpolated_road_points for test in valid_tests])
+        for test, is_valid in zip(valid_tests, results):
+            test.is_valid = is_valid
+        return [test.is_valid for test in tests]
+
+    def flush(self):
+        if self.validation_cache is not None:
+            self.validation_cache.flush()
+        self.wrappee.flush()
+
+    def __are_road_lines_simple(self, roads: list[list]) -> list[bool]:
+        """
+        Check the road lines of many roads. Cached results are reused, the other roads are grouped by their number of
+        points and prefiltered together.
+
+        :param roads: List of interpolated road points
+        :return: List with True for every road whose lines do not intersect
+        """
+        results = [None] * len(roads)
+        keys = None
+        if self.validation_cache is not None:
+            keys = [ValidationCache.get_key(road, type(self).__name__, {"offset": self.offset}) for road in roads]
+            cached_results = self.validation_cache.get_many(keys)
+            results = [cached_results.get(key) for key in keys]
+
+        indices_by_nr_of_points = defaultdict(list)
+        for index, (road, result) in enumerate(zip(roads, results)):
+            if result is None:
+                indices_by_nr_of_points[len(road)].append(index)
+        for indices in indices_by_nr_of_points.values():
+            road_matrices = np.array([np.asarray(roads[index], dtype=float)[:, :2] for index in indices])
+            for index, decision in zip(indices, prefilter_roads(road_matrices, self.offset)):
+                results[index] = bool(decision) if decision != UNDECIDED else self.__is_road_line_simple(roads[index])
+
+        if self.validation_cache is not None:
+            self.validation_cache.put_many(
+                {keys[index]: results[index] for indices in indices_by_nr_of_points.values() for index in indices}
+            )
+        return results
+
+    def __is_road_line_simple(self, road: list) -> bool:
+        road_points_line_string: LineString = LineString(coordinates=[(node[0], node[1]) for node in road])
+        left_bound_line_string = road_points_line_string.parallel_offset(distance=self.offset, side="left")
+        right_bound_line_string = road_points_line_string.parallel_offset(distance=self.offset, side="right")
 
         if left_bound_line_string.geom_type != "LineString" or right_bound_line_string.geom_type != "LineString":
-            test.is_valid = False
-            return test.is_valid
+            return False
 
         road_lines: MultiLineString = MultiLineString(
             (left_bound_line_string, road_points_line_string, right_bound_line_string)
         )
-
-        test.is_valid = True if road_lines.is_simple else False
-        return test.is_valid
+        return True if road_lines.is_simple else False
 
 
 class NoTooSharpTurnsValidator(TestValidatorDecorator):
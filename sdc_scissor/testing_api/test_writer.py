@@ -0,0 +1,217 @@
+import abc
+import collections
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from sdc_scissor.testing_api.packed_test_corpus import PackedTestCorpusWriter, PackedTestPath
+from sdc_scissor.testing_api.test import Test
+
+_MIN_ID_WIDTH = 5
+
+
+def get_id_width(count: int = None) -> int:
+    """
+    Number of digits the test ids are padded to, it fits the largest id of count tests and is at least five.
+
+    :param count: Number of tests, None if it is unknown
+    :return: Number of digits
+    """
+    if not count:
+        return _MIN_ID_WIDTH
+    return max(_MIN_ID_WIDTH, len(str(count - 1)))
+
+
+def get_test_file_name(test: Test, id_width: int = _MIN_ID_WIDTH) -> str:
+    """
+    File name of a generated test. The test id is padded to id_width digits, hence the files sort by their id as long
+    as no id has more digits, see get_id_width().
+
+    :param test: The generated test
+    :param id_width: Number of digits the test id is padded to
+    :return: File name of the JSON file
+    """
+    if isinstance(test.test_id, int):
+        return "{:0{}d}_test.json".format(test.test_id, id_width)
+    return "{}_test.json".format(test.test_id)
+
+
+def get_relative_test_path(test: Test, shard_size: int, id_width: int = _MIN_ID_WIDTH) -> Path:
+    """
+    Path of a generated test relative to the destination. With sharding, the tests are grouped into subdirectories of
+    shard_size consecutive test ids, hence no directory holds more than shard_size tests. The subdirectories are padded
+    like the file names.
+
+    :param test: The generated test
+    :param shard_size: Number of tests per subdirectory, 0 stores all tests in the destination directory
+    :param id_width: Number of digits the test id is padded to
+    :return: Relative path of the JSON file
+    """
+    file_name = get_test_file_name(test, id_width)
+    if shard_size <= 0 or not isinstance(test.test_id, int):
+        return Path(file_name)
+    return Path("{:0{}d}".format(test.test_id // shard_size, id_width)) / file_name
+
+
+def _write_test_json(test_path: Path, test_dict: dict, indent: int):
+    # json.dumps encodes the whole test at once in C, json.dump encodes it chunk by chunk in Python
+    test_json = json.dumps(test_dict, indent=indent)
+    with open(test_path, "w") as fp:
+        fp.write(test_json)
+
+
+class TestWriter(abc.ABC):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @abc.abstractmethod
+    def write(self, test: Test):
+        """
+        Store a test.
+
+        :param test: The test to store
+        :return: Path of the stored test
+        """
+        pass
+
+    def flush(self):
+        """
+        Wait until all tests are stored.
+        """
+        pass
+
+    def close(self):
+        """
+        Store the remaining tests and release the resources of the writer.
+        """
+        self.flush()
+
+
+class ShardedTestWriter(TestWriter):
+    def __init__(
+        self,
+        destination: Path,
+        shard_size: int = 1000,
+        nr_of_threads: int = 4,
+        indent: int = None,
+        max_pending: int = 256,
+        on_write: Callable = None,
+        count: int = None,
+    ):
+        """
+        Writes tests as JSON files into subdirectories of the destination, see get_relative_test_path(). The files
+        are serialized and written on a pool of threads while the caller continues generating tests. At most
+        max_pending tests are waiting to be written, a call of write() blocks until the oldest of them is written.
+
+        :param destination: Directory to store the tests
+        :param shard_size: Number of tests per subdirectory, 0 stores all tests in the destination directory
+        :param nr_of_threads: Number of writing threads, 0 writes every test in the calling thread
+        :param indent: Indentation of the JSON files, None writes compact files
+        :param max_pending: Maximum number of tests that are not written yet
+        :param on_write: Optional function called with the path and the dictionary of every written test, it is
+            called in the thread that calls write() or flush()
+        :param count: Number of tests to write, if known, the file names are padded to the digits of the largest id
+        """
+        self.destination: Path = Path(destination)
+        self.shard_size: int = shard_size
+        self.indent: int = indent
+        self.max_pending: int = max_pending
+        self.on_write: Callable = on_write
+        self.id_width: int = get_id_width(count)
+        self.nr_of_tests: int = 0
+        self.__executor = ThreadPoolExecutor(max_workers=nr_of_threads) if nr_of_threads > 0 else None
+        self.__pending_tests = collections.deque()
+        self.__created_dirs: set = set()
+
+    def write(self, test: Test) -> Path:
+        """
+        Store a test, the file may not be written yet when this method returns.
+
+        :param test: The test to store
+        :return: Path of the JSON file of the test
+        """
+        test_path = self.destination / get_relative_test_path(test, self.shard_size, self.id_width)
+        if test_path.parent not in self.__created_dirs:
+            test_path.parent.mkdir(parents=True, exist_ok=True)
+            self.__created_dirs.add(test_path.parent)
+        # the dictionary is taken in the calling thread since the test may be modified afterwards
+        test_dict = test.to_dict()
+        self.nr_of_tests += 1
+        if self.__executor is None:
+            _write_test_json(test_path, test_dict, self.indent)
+            self.__notify(test_path, test_dict)
+            return test_path
+
+        while len(self.__pending_tests) >= self.max_pending:
+            self.__wait_for_oldest_test()
+        future = self.__executor.submit(_write_test_json, test_path, test_dict, self.indent)
+        self.__pending_tests.append((test_path, test_dict, future))
+        return test_path
+
+    def __wait_for_oldest_test(self):
+        test_path, test_dict, future = self.__pending_tests.popleft()
+        future.result()
+        self.__notify(test_path, test_dict)
+
+    def __notify(self, test_path: Path, test_dict: dict):
+        if self.on_write is not None:
+            self.on_write(test_path, test_dict)
+
+    def flush(self):
+        """
+        Wait until all tests are written.
+        """
+        while self.__pending_tests:
+            self.__wait_for_oldest_test()
+
+    def close(self):
+        """
+        Write the remaining tests and stop the threads.
+        """
+        self.flush()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+        logging.info("Wrote {} tests to {}".format(self.nr_of_tests, self.destination))
+
+
+class PackedTestWriter(TestWriter):
+    def __init__(self, corpus_path: Path, shard_size: int = 1000, count: int = None):
+        """
+        Writes tests into a packed test corpus. The tests are named like the files of the ShardedTestWriter, hence
+        unpacking the corpus restores the same directory layout.
+
+        :param corpus_path: Path to the packed test corpus to create
+        :param shard_size: Number of tests per subdirectory of the names, 0 uses no subdirectories
+        :param count: Number of tests to write, if known, the names are padded to the digits of the largest id
+        """
+        self.corpus_path: Path = Path(corpus_path)
+        self.shard_size: int = shard_size
+        self.id_width: int = get_id_width(count)
+        self.__corpus_writer = PackedTestCorpusWriter(self.corpus_path)
+
+    @property
+    def nr_of_tests(self) -> int:
+        return self.__corpus_writer.nr_of_tests
+
+    def write(self, test: Test) -> PackedTestPath:
+        """
+        Append a test to the corpus.
+
+        :param test: The test to store
+        :return: Reference to the test inside the corpus
+        """
+        name = get_relative_test_path(test, self.shard_size, self.id_width).as_posix()
+        index = self.__corpus_writer.nr_of_tests
+        self.__corpus_writer.write(name, test.to_dict())
+        return PackedTestPath(self.corpus_path, index, name)
+
+    def close(self):
+        """
+        Assemble the packed test corpus.
+        """
+        self.__corpus_writer.close()
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Increment whenever a validator changes its results, so that stale cache entries are not served.
+VALIDATION_VERSION = 1
+
+# connections inherited from the parent process, they are neither used nor closed since closing them would release the
+# locks of the parent
+_inherited_connections: list = []
+
+
+class ValidationCache:
+    def __init__(self, cache_path: Path):
+        """
+        On-disk cache of road validation results. Entries are addressed by a hash of the road points, the validator and
+        its parameters, hence every road is validated once across commands. The cache is a SQLite database and can be
+        shared by several processes and threads. A forked process opens its own connection instead of using the one of
+        its parent.
+
+        :param cache_path: Path to the cache file
+        """
+        self.cache_path: Path = Path(cache_path)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__connection = None
+        self.__lock = threading.Lock()
+        # process that opened the connection and created the lock
+        self.__pid: int = os.getpid()
+
+    def __getstate__(self):
+        # connections and locks cannot be shared with other processes, each process opens its own one
+        state = self.__dict__.copy()
+        state["_ValidationCache__connection"] = None
+        state["_ValidationCache__lock"] = None
+        state["hits"] = 0
+        state["misses"] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __leave_parent_process(self):
+        # a forked process inherits the connection of its parent and its lock, which may be held by another thread
+        if self.__pid == os.getpid():
+            return
+        if self.__connection is not None:
+            _inherited_connections.append(self.__connection)
+        self.__connection = None
+        self.__lock = threading.Lock()
+        self.hits, self.misses = 0, 0
+        self.__pid = os.getpid()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        self.__leave_parent_process()
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.cache_path, timeout=60, check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS validations (key TEXT PRIMARY KEY, is_valid INTEGER NOT NULL)"
+            )
+            self.__connection.commit()
+        return self.__connection
+
+    @staticmethod
+    def get_key(road_points, validator_name: str, parameters: dict) -> str:
+        """
+        Content address of the validation result of a road.
+
+        :param road_points: Points of the validated road
+        :param validator_name: Name of the validator
+        :param parameters: Parameters of the validator that influence its result
+        :return: Hex digest identifying the validation result
+        """
+        points = np.ascontiguousarray(np.asarray(road_points, dtype=np.float64)[:, :2])
+        validator = {
+            "validation_version": VALIDATION_VERSION,
+            "validator": validator_name,
+            "parameters": parameters,
+            "shape": points.shape,
+        }
+        sha256 = hashlib.sha256(json.dumps(validator, sort_keys=True).encode())
+        sha256.update(points.tobytes())
+        return sha256.hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict:
+        """
+        Look up cached validation results.
+
+        :param keys: Content addresses of the validation results
+        :return: Dictionary mapping the keys that are cached to their validation result
+        """
+        results = {}
+        self.__leave_parent_process()
+        with self.__lock:
+            # stay below the limit of SQLite for the number of query parameters
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = self.connection.execute(
+                    "SELECT key, is_valid FROM validations WHERE key IN ({})".format(",".join("?" * len(chunk))),
+                    chunk,
+                ).fetchall()
+                results.update((key, bool(is_valid)) for key, is_valid in rows)
+            self.hits += len(results)
+            self.misses += len(keys) - len(results)
+        return results
+
+    def put_many(self, results: dict):
+        """
+        Store validation results in the cache.
+
+        :param results: Dictionary mapping content addresses to validation results
+        """
+        self.__leave_parent_process()
+        with self.__lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO validations (key, is_valid) VALUES (?, ?)",
+                [(key, int(is_valid)) for key, is_valid in results.items()],
+            )
+
+    def flush(self):
+        """
+        Commit the new entries.
+        """
+        self.__leave_parent_process()
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.commit()
+
+    def close(self):
+        """
+        Flush and close the connection to the cache.
+        """
+        self.flush()
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __len__(self):
+        self.__leave_parent_process()
+        with self.__lock:
+            return self.connection.execute("SELECT COUNT(*) FROM validations").fetchone()[0]
@@ -178,3 +178,22 @@ class TestAngleBasedSegmentation:
 
         # TODO: Add assertions
         # assert False
+
+    def test_road_pieces_exactly_as_long_as_the_decision_distance(self):
+        road_points = [(10 * x, 0) for x in range(8)]
+
+        strategy = AngleBasedStrategy(angle_threshold=5, decision_distance=10)
+
+        segment_indexes = strategy.extract_segments(road_points)
+
+        assert segment_indexes == [(0, 7)]
+
+    def test_straight_then_parabola(self):
+        road_points = [(x, 0) for x in range(30)]
+        road_points.extend([(30 + i, i * i * 0.05) for i in range(1, 30)])
+
+        strategy = AngleBasedStrategy(angle_threshold=5, decision_distance=10)
+
+        segment_indexes = strategy.extract_segments(road_points)
+
+        assert segment_indexes == [(0, 30), (31, 39), (40, 45), (46, 58)]
@@ -0,0 +1,85 @@
+import math
+import sqlite3
+
+from sdc_scissor.feature_extraction_api.angle_based_strategy import AngleBasedStrategy
+from sdc_scissor.feature_extraction_api.feature_cache import FeatureCache
+from sdc_scissor.feature_extraction_api.feature_extraction import FeatureExtractor
+from sdc_scissor.testing_api.test import Test
+
+
+def _get_road_points(radius):
+    road_points = [[x, 0] for x in range(-30, 0)]
+    for i in range(0, 91, 1):
+        road_points.append([radius * math.sin(math.radians(i)), radius - radius * math.cos(math.radians(i))])
+    return road_points
+
+
+class TestFeatureCache:
+    def test_key_depends_on_road_and_strategy_parameters(self):
+        road_points = _get_road_points(50)
+        key = FeatureCache.get_key(road_points, AngleBasedStrategy(angle_threshold=5, decision_distance=10))
+
+        assert key == FeatureCache.get_key(road_points, AngleBasedStrategy(angle_threshold=5, decision_distance=10))
+        assert key != FeatureCache.get_key(road_points, AngleBasedStrategy(angle_threshold=5, decision_distance=11))
+        assert key != FeatureCache.get_key(road_points, AngleBasedStrategy(angle_threshold=4, decision_distance=10))
+        assert key != FeatureCache.get_key(_get_road_points(51), AngleBasedStrategy())
+
+    def test_cached_features_are_equal_to_extracted_features(self, tmp_path):
+        feature_cache = FeatureCache(tmp_path / "cache.db")
+        feature_extractor = FeatureExtractor(AngleBasedStrategy(), feature_cache=feature_cache)
+        expected = FeatureExtractor(AngleBasedStrategy()).extract_features(Test(0, _get_road_points(50), "PASS", 3.5))
+
+        first = feature_extractor.extract_features(Test(0, _get_road_points(50), "PASS", 3.5))
+        second = feature_extractor.extract_features(Test(1, _get_road_points(50), "FAIL", 7.0))
+
+        assert first.to_dict() == expected.to_dict()
+        assert second.test_duration == 7.0
+        second.test_duration = 3.5
+        assert second.to_dict() == expected.to_dict()
+        assert (feature_cache.hits, feature_cache.misses) == (1, 1)
+
+    def test_statistics_are_persisted(self, tmp_path):
+        feature_cache = FeatureCache(tmp_path / "cache.db")
+        feature_extractor = FeatureExtractor(AngleBasedStrategy(), feature_cache=feature_cache)
+        for radius in (40, 50, 40):
+            feature_extractor.extract_features(Test(0, _get_road_points(radius), "PASS"))
+        feature_cache.close()
+
+        statistics = FeatureCache(tmp_path / "cache.db").get_statistics()
+
+        assert statistics["entries"] == 2
+        assert statistics["hits"] == 1
+        assert statistics["misses"] == 2
+
+    def test_eviction_keeps_most_recently_used_entries(self, tmp_path):
+        feature_cache = FeatureCache(tmp_path / "cache.db")
+        for i in range(5):
+            feature_cache.put(str(i), {"road_distance": i})
+        feature_cache.flush()
+        feature_cache.get("0")
+
+        nr_of_evicted_entries = feature_cache.evict(max_entries=2)
+        feature_cache.compact()
+
+        assert nr_of_evicted_entries == 3
+        assert feature_cache.get("0") == {"road_distance": 0}
+        assert feature_cache.get("1") is None
+        assert feature_cache.get_statistics()["entries"] == 2
+
+    def test_write_lock_is_not_held_between_flushes(self, tmp_path):
+        feature_cache = FeatureCache(tmp_path / "cache.db")
+        feature_cache.put("0", {"road_distance": 0})
+        feature_cache.get("0")
+        feature_cache.put("1", {"road_distance": 1})
+        other_connection = sqlite3.connect(tmp_path / "cache.db", timeout=0)
+
+        # fails with "database is locked" if the cache holds the write lock
+        other_connection.execute("BEGIN IMMEDIATE")
+        assert other_connection.execute("SELECT COUNT(*) FROM features").fetchone()[0] == 2
+        other_connection.rollback()
+        last_access = other_connection.execute("SELECT last_access FROM features WHERE key = '0'").fetchone()[0]
+        feature_cache.flush()
+
+        assert other_connection.execute("SELECT last_access FROM features WHERE key = '0'").fetchone()[0] > last_access
+        other_connection.close()
+        feature_cache.close()
@@ -2,6 +2,7 @@ import math
 import shutil
 from pathlib import Path
 
+import numpy as np
 import pytest
 from parameterized import parameterized
 from pytest import approx
@@ -292,3 +293,77 @@ class TestFeatureExtraction:
         id_string = "id"
         file_dir = tmp_dir
         FeatureExtractor.save_to_csv(road_features=[(id_string, road_features)], out_dir=file_dir)
+
+    def test_extract_features_batch(self):
+        feature_extractor = FeatureExtractor(AngleBasedStrategy(angle_threshold=5, decision_distance=10))
+        tests = []
+        for radius in (30, 60):
+            road_points = [
+                [radius * math.cos(math.radians(i)), radius * math.sin(math.radians(i))] for i in range(0, 181, 2)
+            ]
+            tests.append(Test(radius, road_points, "NOT_EXECUTED"))
+
+        X, columns = feature_extractor.extract_features_batch(tests)
+
+        assert columns == list(RoadFeatures.MODEL_FIELDS)
+        assert X.shape == (len(tests), len(columns))
+        assert X.dtype == np.float64
+        for row, test in zip(X, tests):
+            road_features = feature_extractor.extract_features(test)
+            assert list(row) == [getattr(road_features, column) for column in columns]
+
+    def test_extract_features_batch_with_selected_features(self):
+        feature_extractor = FeatureExtractor(EquiDistanceStrategy(2))
+        test = Test(0, [[x, 0] for x in range(20)], "NOT_EXECUTED")
+
+        X, columns = feature_extractor.extract_features_batch([test], features=["road_distance"])
+
+        assert columns == ["road_distance"]
+        assert X.shape == (1, 1)
+        assert X[0, 0] == approx(19)
+
+
+class TestRoadFeatures:
+    def test_to_dict_has_the_fixed_field_order(self):
+        road_features = RoadFeatures()
+
+        assert list(road_features.to_dict().keys()) == list(RoadFeatures.FIELDS)
+        assert list(RoadFeatures.FIELDS) == sorted(RoadFeatures.FIELDS)
+
+    def test_road_features_have_no_instance_dict(self):
+        road_features = RoadFeatures()
+
+        assert not hasattr(road_features, "__dict__")
+        with pytest.raises(AttributeError):
+            road_features.unknown_feature = 1
+
+    def test_row_round_trip(self):
+        road_features = RoadFeatures()
+        road_features.road_distance = 123.5
+        road_features.num_l_turns = 3
+        road_features.safety = "FAIL"
+
+        row = road_features.to_row()
+        actual = RoadFeatures.from_row(row)
+
+        assert row[RoadFeatures.FIELDS.index("road_distance")] == 123.5
+        assert actual.to_dict() == road_features.to_dict()
+
+    def test_to_structured_array(self):
+        road_features_lst = []
+        for i in range(3):
+            road_features = RoadFeatures()
+            road_features.num_straights = i
+            road_features.mean_angle = i / 2
+            road_features.test_duration = None
+            road_features.safety = "PASS"
+            road_features_lst.append(road_features)
+
+        records = RoadFeatures.to_structured_array(road_features_lst)
+
+        assert records.dtype.names == RoadFeatures.FIELDS
+        assert list(records["num_straights"]) == [0, 1, 2]
+        assert list(records["mean_angle"]) == [0, 0.5, 1]
+        assert all(math.isnan(value) for value in records["test_duration"])
+        assert list(records["safety"]) == ["PASS", "PASS", "PASS"]
+        assert len(RoadFeatures.to_structured_array([])) == 0
@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+from pytest import approx
+
+from sdc_scissor.feature_extraction_api.feature_extraction_benchmark import BASELINE_VERSION, FeatureExtractionBenchmark
+
+
+class TestFeatureExtractionBenchmark:
+    def setup_class(self):
+        self.benchmark = FeatureExtractionBenchmark(
+            nr_of_road_points=(40, 60), nr_of_synthetic_roads=2, repetitions=1, min_seconds=0
+        )
+
+    @staticmethod
+    def __get_results(calibration_seconds, roads_per_second, peak_memory_in_bytes):
+        return {
+            "version": BASELINE_VERSION,
+            "environment": FeatureExtractionBenchmark.get_environment(),
+            "calibration_seconds": calibration_seconds,
+            "corpora": {
+                "synthetic_20": {
+                    "feature_extraction": {
+                        "seconds": 1 / roads_per_second,
+                        "roads_per_second": roads_per_second,
+                        "peak_memory_in_bytes": peak_memory_in_bytes,
+                    }
+                }
+            },
+        }
+
+    def test_synthetic_road(self):
+        road_points = FeatureExtractionBenchmark.get_synthetic_road(100, np.random.default_rng(1), step_length=2)
+
+        assert len(road_points) == 100
+        for p1, p2 in zip(road_points, road_points[1:]):
+            assert math.dist(p1, p2) == approx(2)
+
+    def test_run_reports_all_corpora_and_phases(self):
+        results = self.benchmark.run()
+
+        assert list(results["corpora"].keys()) == ["synthetic_40", "synthetic_60"]
+        for corpus_results in results["corpora"].values():
+            assert list(corpus_results.keys()) == list(self.benchmark.get_phases().keys())
+            for phase_results in corpus_results.values():
+                assert phase_results["roads_per_second"] > 0
+                assert phase_results["peak_memory_in_bytes"] >= 0
+
+    def test_baseline_round_trip(self, tmp_path):
+        results = self.__get_results(0.1, 100, 1000)
+        baseline_path = tmp_path / "baseline.json"
+
+        FeatureExtractionBenchmark.save_baseline(results, baseline_path)
+
+        assert FeatureExtractionBenchmark.load_baseline(baseline_path)["corpora"] == results["corpora"]
+
+    def test_no_regression_within_tolerance(self):
+        baseline = self.__get_results(0.1, 100, 1000)
+        results = self.__get_results(0.1, 90, 1100)
+
+        assert FeatureExtractionBenchmark.get_regressions(results, baseline, tolerance=0.2) == []
+
+    def test_throughput_and_memory_regressions(self):
+        baseline = self.__get_results(0.1, 100, 10 * 2**20)
+        results = self.__get_results(0.1, 50, 20 * 2**20)
+
+        regressions = FeatureExtractionBenchmark.get_regressions(results, baseline, tolerance=0.2)
+
+        assert len(regressions) == 2
+
+    def test_slower_machine_is_no_regression(self):
+        baseline = self.__get_results(0.1, 100, 1000)
+        results = self.__get_results(0.2, 50, 1000)
+
+        assert FeatureExtractionBenchmark.get_regressions(results, baseline, tolerance=0.2) == []
+
+    def test_small_memory_growth_is_no_regression(self):
+        baseline = self.__get_results(0.1, 100, 0)
+        results = self.__get_results(0.1, 100, 2**19)
+
+        assert FeatureExtractionBenchmark.get_regressions(results, baseline, tolerance=0.2) == []
+        assert len(FeatureExtractionBenchmark.get_regressions(results, baseline, min_memory_growth_in_bytes=0)) == 1
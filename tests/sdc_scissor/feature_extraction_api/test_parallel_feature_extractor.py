@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+from sdc_scissor.feature_extraction_api.angle_based_strategy import AngleBasedStrategy
+from sdc_scissor.feature_extraction_api.feature_cache import FeatureCache
+from sdc_scissor.feature_extraction_api.feature_extraction import FeatureExtractor
+from sdc_scissor.feature_extraction_api.parallel_feature_extractor import ParallelFeatureExtractor
+from sdc_scissor.testing_api.test_loader import TestLoader
+from sdc_scissor.testing_api.test_validator import NoIntersectionValidator, SimpleTestValidator
+
+
+class TestParallelFeatureExtractor:
+    def setup_class(self):
+        self.test_dir = Path(os.path.dirname(__file__)).parent.parent.parent / "sample_tests"
+
+    def __extract_serially(self):
+        test_loader = TestLoader(self.test_dir, test_validator=NoIntersectionValidator(SimpleTestValidator()))
+        feature_extractor = FeatureExtractor(segmentation_strategy=AngleBasedStrategy())
+        road_features_lst = []
+        while test_loader.has_next():
+            test, _ = test_loader.next()
+            road_features = feature_extractor.extract_features(test)
+            road_features.safety = test.test_outcome
+            road_features_lst.append((test.test_id, road_features.to_dict()))
+        return road_features_lst
+
+    def test_parallel_extraction_has_the_same_order_and_values_as_serial_extraction(self):
+        expected = self.__extract_serially()
+
+        test_loader = TestLoader(self.test_dir, test_validator=NoIntersectionValidator(SimpleTestValidator()))
+        parallel_feature_extractor = ParallelFeatureExtractor(
+            test_loader=test_loader, segmentation_strategy=AngleBasedStrategy(), jobs=2, chunk_size=16
+        )
+        actual = [(test_id, rf.to_dict()) for test_id, rf in parallel_feature_extractor.extract_features()]
+
+        assert actual == expected
+        assert not test_loader.has_next()
+
+    def test_single_job_runs_in_process(self):
+        test_loader = TestLoader(self.test_dir, test_validator=SimpleTestValidator())
+        test_loader.test_paths = test_loader.test_paths[-5:]
+        expected_test_ids = [str(test_path) for test_path in reversed(test_loader.test_paths)]
+        parallel_feature_extractor = ParallelFeatureExtractor(
+            test_loader=test_loader, segmentation_strategy=AngleBasedStrategy(), jobs=1, chunk_size=2
+        )
+
+        road_features_lst = parallel_feature_extractor.extract_features()
+
+        assert [test_id for test_id, _ in road_features_lst] == expected_test_ids
+
+    def test_features_are_extracted_on_demand(self):
+        test_loader = TestLoader(self.test_dir, test_validator=NoIntersectionValidator(SimpleTestValidator()))
+        nr_of_tests = len(test_loader.test_paths)
+        parallel_feature_extractor = ParallelFeatureExtractor(
+            test_loader=test_loader, segmentation_strategy=AngleBasedStrategy(), jobs=2, chunk_size=4
+        )
+
+        road_features_iterator = parallel_feature_extractor.iter_features()
+        road_features_lst = [next(road_features_iterator) for _ in range(3)]
+        road_features_iterator.close()
+
+        assert len(road_features_lst) == 3
+        # at most the chunks in flight of the two workers are taken from the test loader
+        assert len(test_loader.test_paths) >= nr_of_tests - (2 * 2 + 1) * 4
+
+    def test_workers_do_not_use_the_cache_connection_of_the_parent(self, tmp_path):
+        expected = self.__extract_serially()
+        feature_cache = FeatureCache(tmp_path / "cache.db")
+        # the parent opens its connection and counts a miss that is not flushed when the workers are forked
+        parent_connection = feature_cache.connection
+        assert feature_cache.get("unknown") is None
+
+        for _ in range(2):
+            test_loader = TestLoader(self.test_dir, test_validator=NoIntersectionValidator(SimpleTestValidator()))
+            parallel_feature_extractor = ParallelFeatureExtractor(
+                test_loader=test_loader,
+                segmentation_strategy=AngleBasedStrategy(),
+                jobs=2,
+                chunk_size=16,
+                feature_cache=feature_cache,
+            )
+            actual = [(test_id, rf.to_dict()) for test_id, rf in parallel_feature_extractor.extract_features()]
+            assert actual == expected
+        feature_cache.flush()
+        statistics = feature_cache.get_statistics()
+
+        assert feature_cache.connection is parent_connection
+        assert statistics["misses"] == statistics["entries"] + 1
+        assert statistics["hits"] == statistics["entries"]
+        feature_cache.close()
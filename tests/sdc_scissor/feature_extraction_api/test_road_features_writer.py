@@ -0,0 +1,67 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from sdc_scissor.feature_extraction_api.feature_extraction import FeatureExtractor, RoadFeatures
+from sdc_scissor.feature_extraction_api.road_features_writer import RoadFeaturesWriter
+
+
+@pytest.fixture
+def tmp_dir():
+    file_dir = Path("tmp-writer-dir")
+    file_dir.mkdir(parents=True)
+    yield file_dir
+    shutil.rmtree(file_dir)
+
+
+def _get_road_features(nr_of_tests):
+    road_features_lst = []
+    for i in range(nr_of_tests):
+        road_features = RoadFeatures()
+        road_features.num_l_turns = i
+        road_features.road_distance = 100.5 + i
+        road_features.std_angle = 0.25 * i
+        road_features.test_duration = None if i % 3 == 0 else 10.0 * i
+        road_features.safety = "FAIL" if i % 2 else "PASS"
+        road_features_lst.append(("{}-test.json".format(i), road_features))
+    return road_features_lst
+
+
+class TestRoadFeaturesWriter:
+    def test_batched_writing_produces_the_same_csv_as_a_single_batch(self, tmp_dir):
+        road_features_lst = _get_road_features(25)
+        FeatureExtractor.save_to_csv(road_features_lst, tmp_dir)
+        expected = (tmp_dir / "road_features.csv").read_text()
+
+        with RoadFeaturesWriter(tmp_dir, batch_size=4) as road_features_writer:
+            road_features_writer.write_all(road_features_lst)
+        actual = (tmp_dir / "road_features.csv").read_text()
+
+        assert actual == expected
+        assert road_features_writer.nr_of_rows == 25
+
+    def test_csv_schema(self, tmp_dir):
+        road_features_lst = _get_road_features(3)
+
+        with RoadFeaturesWriter(tmp_dir) as road_features_writer:
+            road_features_writer.write_all(road_features_lst)
+
+        dd = pd.read_csv(tmp_dir / "road_features.csv")
+        expected_columns = ["Unnamed: 0"] + list(RoadFeatures().to_dict().keys()) + ["test_id"]
+        assert list(dd.columns) == expected_columns
+        assert list(dd["Unnamed: 0"]) == [0, 1, 2]
+        assert list(dd["test_id"]) == ["0-test.json", "1-test.json", "2-test.json"]
+        assert list(dd["num_l_turns"]) == [0, 1, 2]
+
+    def test_parquet_has_the_same_rows_as_csv(self, tmp_dir):
+        pytest.importorskip("pyarrow")
+        road_features_lst = _get_road_features(10)
+
+        with RoadFeaturesWriter(tmp_dir, batch_size=3, parquet=True) as road_features_writer:
+            road_features_writer.write_all(road_features_lst)
+
+        dd_csv = pd.read_csv(tmp_dir / "road_features.csv", index_col=0)
+        dd_parquet = pd.read_parquet(tmp_dir / "road_features.parquet")
+        pd.testing.assert_frame_equal(dd_csv, dd_parquet, check_dtype=False)
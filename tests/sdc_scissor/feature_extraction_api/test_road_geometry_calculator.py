@@ -1,6 +1,7 @@
 import math
 
 from pytest import approx
+from shapely.geometry import Point, Polygon
 
 from sdc_scissor.feature_extraction_api.feature_extraction import RoadGeometryCalculator
 
@@ -129,3 +130,92 @@ class TestRoadGeometryCalculatorRoadLength:
         expected_length = 3
 
         assert length == expected_length
+
+
+class TestRoadGeometryCalculatorArrayKernel:
+    def setup_class(self):
+        self.__road_geometry_calculator = RoadGeometryCalculator()
+        self.__roads = []
+        for radius in (20, 50, 80):
+            road_points = []
+            for i in range(0, 91, 1):
+                road_points.append((radius * math.cos(math.radians(i)), radius * math.sin(math.radians(i))))
+            road_points.extend([(-x, y + 2 * radius) for x, y in road_points[::-3]])
+            self.__roads.append(road_points)
+        self.__roads.append([(1, 1), (2, 1), (3, 1), (4, 1)])
+
+    def test_turn_angles_match_scalar_api(self):
+        for road_points in self.__roads:
+            expected = self.__road_geometry_calculator.extract_turn_angles(road_points)
+            actual = self.__road_geometry_calculator.get_turn_angles_array(road_points)
+            assert list(actual) == approx(expected, rel=1e-12, abs=1e-9)
+
+    def test_cumulative_lengths_match_scalar_api(self):
+        for road_points in self.__roads:
+            cumulative_lengths = self.__road_geometry_calculator.get_cumulative_road_lengths(road_points)
+            assert cumulative_lengths[0] == 0
+            for i in range(len(road_points)):
+                expected = self.__road_geometry_calculator.get_road_length(road_points[: i + 1])
+                assert cumulative_lengths[i] == approx(expected, rel=1e-12)
+
+    def test_batch_geometry_matches_single_roads_and_is_nan_padded(self):
+        turn_angles, segment_lengths, cumulative_lengths = self.__road_geometry_calculator.get_batch_geometry(
+            self.__roads
+        )
+
+        assert turn_angles.shape[0] == segment_lengths.shape[0] == cumulative_lengths.shape[0] == len(self.__roads)
+        for i, road_points in enumerate(self.__roads):
+            n = len(road_points)
+            expected_angles = self.__road_geometry_calculator.get_turn_angles_array(road_points)
+            expected_lengths = self.__road_geometry_calculator.get_segment_lengths(road_points)
+            assert list(turn_angles[i, : n - 2]) == list(expected_angles)
+            assert list(segment_lengths[i, : n - 1]) == list(expected_lengths)
+            assert cumulative_lengths[i, n - 1] == approx(self.__road_geometry_calculator.get_road_length(road_points))
+            assert all(math.isnan(value) for value in cumulative_lengths[i, n:])
+            assert all(math.isnan(value) for value in turn_angles[i, n - 2 :])
+
+
+class TestRoadGeometryCalculatorDiversity:
+    def setup_class(self):
+        self.__road_geometry_calculator = RoadGeometryCalculator()
+
+    @staticmethod
+    def __get_shapely_area(segment_road_points):
+        start_point, end_point = Point(segment_road_points[0]), Point(segment_road_points[-1])
+        polygon_points = [Point(rp[0], rp[1]) for rp in segment_road_points]
+        polygon_points.extend([end_point, start_point])
+        return Polygon(polygon_points).area
+
+    def test_straight_segment_has_no_diversity(self):
+        road_points = [(x, 3) for x in range(10)]
+
+        assert self.__road_geometry_calculator.get_segment_diversity(road_points) == 0
+
+    def test_half_circle(self):
+        radius = 50
+        road_points = [
+            (radius * math.cos(math.radians(i)) + 120, radius * math.sin(math.radians(i)) + 80) for i in range(181)
+        ]
+
+        diversity = self.__road_geometry_calculator.get_segment_diversity(road_points)
+
+        assert diversity == approx(self.__get_shapely_area(road_points))
+        assert diversity == approx(math.pi * radius**2 / 2, rel=1e-3)
+
+    def test_self_intersecting_segment_lobes_cancel_like_shapely(self):
+        road_points = [(0, 0), (2, 2), (2, 0), (0, 2)]
+
+        diversity = self.__road_geometry_calculator.get_segment_diversity(road_points)
+
+        assert diversity == approx(self.__get_shapely_area(road_points), abs=1e-12)
+
+    def test_batch_matches_single_segments(self):
+        road_points = [(x, math.sin(x / 5) * 10) for x in range(100)]
+        segment_indexes = [(0, 30), (30, 31), (31, 70), (71, 99), (50, 50)]
+
+        diversities = self.__road_geometry_calculator.get_segment_diversities(road_points, segment_indexes)
+
+        for (start_index, end_index), diversity in zip(segment_indexes, diversities):
+            segment_road_points = road_points[start_index : end_index + 1]
+            expected = self.__get_shapely_area(segment_road_points)
+            assert diversity == approx(expected, abs=1e-9)
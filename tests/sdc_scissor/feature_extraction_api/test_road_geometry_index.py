@@ -0,0 +1,47 @@
+import math
+
+from pytest import approx
+
+from sdc_scissor.feature_extraction_api.road_geometry_calculator import RoadGeometryCalculator
+from sdc_scissor.feature_extraction_api.road_geometry_index import RoadGeometryIndex
+
+
+class TestRoadGeometryIndex:
+    def setup_class(self):
+        self.road_geometry_calculator = RoadGeometryCalculator()
+        self.radius = 50
+        self.road_points = [[x, 0] for x in range(-20, 0)]
+        for i in range(0, 91, 1):
+            x = self.radius * math.sin(math.radians(i))
+            y = self.radius - self.radius * math.cos(math.radians(i))
+            self.road_points.append([x, y])
+        self.geometry_index = RoadGeometryIndex(self.road_points)
+
+    def test_angle_sum_matches_sliced_turn_angles(self):
+        n = len(self.road_points)
+        for start_index, end_index in [(0, n - 1), (0, 19), (19, n - 1), (5, 6), (30, 60), (3, 3)]:
+            segment_road_points = self.road_points[start_index : end_index + 1]
+            expected = sum(self.road_geometry_calculator.extract_turn_angles(segment_road_points))
+            actual = self.geometry_index.get_angle_sum(start_index, end_index)
+            assert actual == approx(expected, abs=1e-9)
+
+    def test_length_matches_sliced_road_length(self):
+        n = len(self.road_points)
+        for start_index, end_index in [(0, n - 1), (0, 19), (19, n - 1), (5, 6), (30, 60), (3, 3)]:
+            segment_road_points = self.road_points[start_index : end_index + 1]
+            expected = self.road_geometry_calculator.get_road_length(segment_road_points)
+            actual = self.geometry_index.get_length(start_index, end_index)
+            assert actual == approx(expected, abs=1e-9)
+
+    def test_road_length(self):
+        expected = self.road_geometry_calculator.get_road_length(self.road_points)
+        assert self.geometry_index.road_length == expected
+
+    def test_radius_of_turn(self):
+        radius = self.geometry_index.get_radius(20, len(self.road_points) - 1)
+        assert radius == approx(self.radius, abs=1)
+
+    def test_end_index_beyond_road_behaves_like_slicing(self):
+        n = len(self.road_points)
+        assert self.geometry_index.get_length(n - 3, n + 5) == approx(self.geometry_index.get_length(n - 3, n - 1))
+        assert self.geometry_index.get_angle_sum(n, n + 5) == 0
@@ -11,3 +11,8 @@ class TestCSVLoader:
         actual = CSVLoader.load_dataframe_from_csv(Path("test.csv"))
         expected = pd.DataFrame
         assert type(actual) is expected
+
+    def test_load_dataframe_from_csv_file(self, fs):
+        fs.create_file("road_features.csv", contents=",a,b\n0,1,2\n")
+        actual = CSVLoader.load_dataframe(Path("road_features.csv"))
+        assert list(actual["b"]) == [2]
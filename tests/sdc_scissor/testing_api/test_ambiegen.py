@@ -0,0 +1,70 @@
+import copy
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from shapely.geometry import LineString, Point
+
+from sdc_scissor.testing_api.test_generators.ambiegen.Utils.generate_test_case_sampling import GenerateTestCaseSampling
+from sdc_scissor.testing_api.test_generators.ambiegen.Utils.test_case_problem import TestCaseProblem
+from sdc_scissor.testing_api.test_generators.ambiegen.Utils.vehicle import (
+    _interpolate,
+    _Polyline,
+    find_circle,
+    min_radius,
+)
+
+
+class TestAmbieGen:
+    def setup_class(self):
+        random.seed(2)
+        np.random.seed(2)
+        self.population = GenerateTestCaseSampling()._do(None, 12)
+        self.roads = []
+        for solution in copy.deepcopy(self.population)[:, 0]:
+            solution.get_points()
+            solution.remove_invalid_cases()
+            if len(solution.road_points) > 2:
+                self.roads.append(solution.car.interpolate_road(solution.road_points))
+
+    def test_fitness_is_evaluated_in_parallel_like_serially(self):
+        serial_population = copy.deepcopy(self.population)
+        parallel_population = copy.deepcopy(self.population)
+
+        random.seed(3)
+        serial_out = TestCaseProblem().evaluate(serial_population, return_as_dictionary=True)
+        serial_random_state = random.getstate()
+        random.seed(3)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel_out = TestCaseProblem(executor=executor).evaluate(parallel_population, return_as_dictionary=True)
+
+        assert random.getstate() == serial_random_state
+        assert np.array_equal(parallel_out["F"], serial_out["F"])
+        assert np.array_equal(parallel_out["G"], serial_out["G"])
+        for serial_solution, parallel_solution in zip(serial_population[:, 0], parallel_population[:, 0]):
+            assert parallel_solution.states == serial_solution.states
+            assert np.array_equal(parallel_solution.intp_points, serial_solution.intp_points)
+            assert parallel_solution.car_path == serial_solution.car_path
+
+    def test_distances_to_the_road_are_measured_like_with_shapely(self):
+        rng = np.random.default_rng(4)
+        for nodes in self.roads:
+            nodes = list(nodes)
+            nodes.insert(5, nodes[5])  # segment of length zero
+            road = LineString(nodes)
+            xs, ys = rng.uniform(-10, 210, 50), rng.uniform(-10, 210, 50)
+            # points close to the vertices are measured from the vertices or from the segments
+            xs[:10], ys[:10] = np.array(nodes[:50:5]).T + rng.normal(0, 0.01, (2, 10))
+
+            polyline = _Polyline(nodes)
+
+            assert polyline.length == road.length
+            assert list(polyline.distances(xs, ys)) == [Point(x, y).distance(road) for x, y in zip(xs, ys)]
+
+    def test_minimum_radius_is_found_like_circle_by_circle(self):
+        for road in self.roads:
+            nodes = _interpolate(road)
+            expected = min(find_circle(nodes[i], nodes[i + 2], nodes[i + 4]) for i in range(len(nodes) - 5))
+
+            assert min_radius(nodes) == expected * 3.280839895
+        assert min_radius([(0.0, 0.0), (1.0, 1.0), (2.0, 2.0), (3.0, 3.0), (4.0, 4.0), (5.0, 5.0)]) == 0
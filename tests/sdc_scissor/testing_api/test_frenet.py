@@ -0,0 +1,143 @@
+import random
+
+import numpy as np
+from shapely import geometry
+
+from sdc_scissor.testing_api.test_generators.frenetic.src.generators.random_frenet_generator import _choice_of_linspace
+from sdc_scissor.testing_api.test_generators.frenetic.src.utils.frenet import (
+    frenet_to_cartesian,
+    frenet_to_cartesian_batch,
+)
+from sdc_scissor.testing_api.test_generators.frenetic_v.src.generators.random_frenet_generator import (
+    CustomFrenetVGenerator,
+)
+from sdc_scissor.testing_api.test_generators.frenetic_v.src.utils.frenet import (
+    frenetv_to_cartesian,
+    frenetv_to_cartesian_batch,
+)
+
+
+def _frenet_to_cartesian_loop(x0, y0, theta0, ss, kappas):
+    xs = np.zeros(ss.shape[0])
+    ys = np.zeros(ss.shape[0])
+    thetas = np.zeros(ss.shape[0])
+    xs[0] = x0
+    ys[0] = y0
+    thetas[0] = theta0
+    for i in range(thetas.shape[0] - 1):
+        thetas[i + 1] = thetas[i] + (kappas[i + 1] + kappas[i]) * (ss[i + 1] - ss[i]) / 2.0
+        xs[i + 1] = xs[i] + (ss[i + 1] - ss[i]) * np.cos(thetas[i])
+        ys[i + 1] = ys[i] + (ss[i + 1] - ss[i]) * np.sin(thetas[i])
+    return (xs, ys)
+
+
+def _frenetv_to_cartesian_loop(x0, y0, theta0, ss, kappas):
+    xs = np.zeros(len(kappas))
+    ys = np.zeros(len(kappas))
+    thetas = np.zeros(len(kappas))
+    xs[0] = x0
+    ys[0] = y0
+    thetas[0] = theta0
+    for i in range(thetas.shape[0] - 1):
+        ss_diff_half = (ss[i + 1] - ss[i]) / 2.0
+        thetas[i + 1] = thetas[i] + (kappas[i + 1] + kappas[i]) * ss_diff_half
+        xs[i + 1] = xs[i] + (np.cos(thetas[i + 1]) + np.cos(thetas[i])) * ss_diff_half
+        ys[i + 1] = ys[i] + (np.sin(thetas[i + 1]) + np.sin(thetas[i])) * ss_diff_half
+    return (xs, ys)
+
+
+class TestFrenet:
+    def setup_class(self):
+        rng = np.random.default_rng(7)
+        self.kappas_matrix = rng.uniform(-0.07, 0.07, (200, 20))
+        self.frenetic_ss = np.arange(10, 20 * 10, 10)
+        self.frenetic_v_ss = np.cumsum([10] * 20) - 10
+
+    def test_frenetic_integration_agrees_with_the_loop(self):
+        xs_matrix, ys_matrix = frenet_to_cartesian_batch(100, 10, 1.57, self.frenetic_ss, self.kappas_matrix)
+        for kappas, batch_xs, batch_ys in zip(self.kappas_matrix, xs_matrix, ys_matrix):
+            expected_xs, expected_ys = _frenet_to_cartesian_loop(100, 10, 1.57, self.frenetic_ss, list(kappas))
+            xs, ys = frenet_to_cartesian(100, 10, 1.57, self.frenetic_ss, list(kappas))
+            assert np.array_equal(xs, expected_xs) and np.array_equal(ys, expected_ys)
+            assert np.array_equal(batch_xs, expected_xs) and np.array_equal(batch_ys, expected_ys)
+
+    def test_frenetic_v_integration_agrees_with_the_loop(self):
+        xs_matrix, ys_matrix = frenetv_to_cartesian_batch(100, 10, 1.57, self.frenetic_v_ss, self.kappas_matrix)
+        for kappas, batch_xs, batch_ys in zip(self.kappas_matrix, xs_matrix, ys_matrix):
+            expected_xs, expected_ys = _frenetv_to_cartesian_loop(100, 10, 1.57, self.frenetic_v_ss, list(kappas))
+            xs, ys = frenetv_to_cartesian(100, 10, 1.57, self.frenetic_v_ss, list(kappas))
+            assert np.array_equal(xs, expected_xs) and np.array_equal(ys, expected_ys)
+            assert np.array_equal(batch_xs, expected_xs) and np.array_equal(batch_ys, expected_ys)
+
+    def test_kappas_are_drawn_like_from_a_linspace(self):
+        for start, stop in [(-0.07, 0.03), (0.01, 0.05), (0.05, 0.05), (-0.02, -0.01)]:
+            for _ in range(100):
+                random_state = random.getstate()
+                expected = random.choice(np.linspace(start, stop))
+                random.setstate(random_state)
+                assert _choice_of_linspace(start, stop) == expected
+
+    def test_frenetic_v_self_intersection_prefilter_agrees_with_shapely(self):
+        random.seed(3)
+        generator = CustomFrenetVGenerator(map_size=200, count=1)
+        road_points_list = generator.kappas_to_road_points_batch([generator.generate_random_test() for _ in range(500)])
+
+        actual = generator.are_likely_self_intersecting(road_points_list)
+
+        expected = [
+            generator._BaseFrenetVGenerator__is_likely_self_intersecting_with_shapely(road_points)
+            for road_points in road_points_list
+        ]
+        assert actual == expected
+        assert any(expected)
+
+    def test_frenetic_v_skips_rejected_roads(self):
+        random.seed(3)
+        generator = CustomFrenetVGenerator(map_size=200, count=100)
+
+        road_points_collection = generator.start()
+
+        assert len(road_points_collection) == 100
+        assert None in road_points_collection
+        assert all(isinstance(road_points, list) for road_points in road_points_collection if road_points is not None)
+
+    def test_frenetic_v_roads_are_reframed_like_with_shapely(self):
+        random.seed(4)
+        generator = CustomFrenetVGenerator(map_size=120, count=1)
+        road_points_list = generator.kappas_to_road_points_batch([generator.generate_random_test() for _ in range(300)])
+        low, high = generator.margin, generator.map_size - generator.margin
+        reduced_map_rect = geometry.Polygon([(low, low), (low, high), (high, high), (high, low)])
+
+        nr_of_roads_that_do_not_fit = 0
+        for road_points in road_points_list:
+            expected = None
+            if reduced_map_rect.contains(geometry.LineString(road_points)):
+                expected = road_points
+            else:
+                for orientation in range(0, 90, 1):
+                    new_center_line = generator.rotate_and_relocate_line(geometry.LineString(road_points), orientation)
+                    if reduced_map_rect.contains(new_center_line):
+                        expected = np.array(new_center_line.coords)
+                        break
+
+            actual = generator.reframe_road(road_points)
+
+            if expected is None:
+                nr_of_roads_that_do_not_fit += 1
+                assert actual is None
+            else:
+                assert np.array_equal(actual, expected)
+        assert nr_of_roads_that_do_not_fit > 0
+
+    def test_frenetic_v_single_roads_are_executed_like_batches(self):
+        random.seed(5)
+        generator = CustomFrenetVGenerator(map_size=200, count=1)
+        kappas_list = [generator.generate_random_test() for _ in range(50)]
+
+        expected = generator.execute_frenet_tests([list(kappas) for kappas in kappas_list])
+        road_points_list = generator.kappas_to_road_points_batch(kappas_list)
+
+        for kappas, expected_road_points, expected_result in zip(kappas_list, road_points_list, expected):
+            assert np.array_equal(generator.kappas_to_road_points(kappas), expected_road_points)
+            assert generator.execute_frenet_test(list(kappas)) == expected_result
+        assert any(isinstance(result, list) for result in expected)
@@ -0,0 +1,159 @@
+import json
+
+import numpy as np
+import pytest
+
+from sdc_scissor.testing_api.packed_test_corpus import PackedTestCorpus
+from sdc_scissor.testing_api.test_loader import TestLoader
+from sdc_scissor.testing_api.test_validator import SimpleTestValidator
+
+
+class TestPackedTestCorpus:
+    def setup_class(self):
+        road_points = [[0, 0], [10, 0], [20, 5], [30, 10]]
+        self.test_jsons = {
+            "test_1.json": {"test_id": 1, "test_outcome": "PASS", "test_duration": 10.5, "road_points": road_points},
+            "test_2.json": {
+                "test_id": "two",
+                "is_valid": False,
+                "test_outcome": "FAIL",
+                "test_duration": None,
+                "road_points": road_points,
+                "interpolated_road_points": [[0, 0, -28, 10], [15, 2.5, -28, 10], [30, 10, -28, 10]],
+            },
+            "sub/test_3.json": {
+                "test_id": 3,
+                "is_valid": True,
+                "test_outcome": None,
+                "predicted_test_outcome": "PASS",
+                "road_points": road_points[:3],
+            },
+        }
+
+    def __create_test_dir(self, tmp_path):
+        tests_dir = tmp_path / "tests"
+        for name, test_json in self.test_jsons.items():
+            (tests_dir / name).parent.mkdir(parents=True, exist_ok=True)
+            with open(tests_dir / name, "w") as fp:
+                json.dump(test_json, fp)
+        return tests_dir
+
+    def __pack(self, tmp_path):
+        tests_dir = self.__create_test_dir(tmp_path)
+        corpus_path = tmp_path / "corpus.sdcpack"
+        test_paths = list(reversed(TestLoader.find_test_paths(tests_dir)))
+        PackedTestCorpus.pack_tests(test_paths, tests_dir=tests_dir, corpus_path=corpus_path)
+        return tests_dir, corpus_path
+
+    def test_round_trip(self, tmp_path):
+        _, corpus_path = self.__pack(tmp_path)
+
+        test_corpus = PackedTestCorpus(corpus_path)
+
+        assert len(test_corpus) == 3
+        assert PackedTestCorpus.is_packed_corpus(corpus_path)
+        for i in range(len(test_corpus)):
+            expected = self.test_jsons[test_corpus.get_name(i)]
+            actual = test_corpus.get_test_json(i)
+            assert actual["test_id"] == expected["test_id"]
+            assert actual.get("is_valid", True) == expected.get("is_valid", True)
+            assert actual["test_outcome"] == expected.get("test_outcome")
+            assert actual["predicted_test_outcome"] == expected.get("predicted_test_outcome")
+            assert actual["test_duration"] == expected.get("test_duration")
+            assert actual["road_points"].tolist() == expected["road_points"]
+            assert actual["interpolated_road_points"].tolist() == expected.get("interpolated_road_points", [])
+        test_corpus.close()
+
+    def test_points_are_views_of_the_file(self, tmp_path):
+        _, corpus_path = self.__pack(tmp_path)
+        test_corpus = PackedTestCorpus(corpus_path)
+
+        points = test_corpus.get_points(
+            "interpolated_road_points", [test_corpus.get_name(i) for i in range(3)].index("test_2.json")
+        )
+
+        assert points.shape == (3, 4)
+        assert not points.flags.owndata
+        assert not points.flags.writeable
+
+    def test_unpack_tests(self, tmp_path):
+        _, corpus_path = self.__pack(tmp_path)
+        test_corpus = PackedTestCorpus(corpus_path)
+
+        test_corpus.unpack_tests(tmp_path / "unpacked")
+
+        with open(tmp_path / "unpacked" / "sub" / "test_3.json") as fp:
+            test_json = json.load(fp)
+        assert test_json["road_points"] == self.test_jsons["sub/test_3.json"]["road_points"]
+        assert test_json["predicted_test_outcome"] == "PASS"
+
+    def test_test_loader_iterates_corpus_like_the_directory(self, tmp_path):
+        tests_dir, corpus_path = self.__pack(tmp_path)
+
+        expected = []
+        test_loader = TestLoader(tests_dir=tests_dir, test_validator=SimpleTestValidator())
+        while test_loader.has_next():
+            test, _ = test_loader.next()
+            expected.append((str(test.test_id)[len(str(tests_dir)) :], np.asarray(test.road_points).tolist()))
+
+        actual = []
+        test_loader = TestLoader(tests_dir=corpus_path, test_validator=SimpleTestValidator())
+        while test_loader.has_next():
+            test, _ = test_loader.next()
+            actual.append((str(test.test_id)[len(str(corpus_path)) :], np.asarray(test.road_points).tolist()))
+
+        assert len(actual) == 2
+        assert actual == expected
+
+    def test_directory_is_no_packed_corpus(self, tmp_path):
+        tests_dir = self.__create_test_dir(tmp_path)
+
+        assert not PackedTestCorpus.is_packed_corpus(tests_dir)
+        assert not PackedTestCorpus.is_packed_corpus(tests_dir / "test_1.json")
+
+    def test_legacy_keys_are_kept(self, tmp_path):
+        tests_dir = self.__create_test_dir(tmp_path)
+        legacy_test_json = {
+            "test_id": 4,
+            "test_outcome": "FAIL",
+            "simulation_time": 12.5,
+            "interpolated_points": [[0, 0], [5, 1], [10, 3], [15, 4]],
+            "road_points": [[0, 0], [15, 4]],
+        }
+        with open(tests_dir / "test_4.json", "w") as fp:
+            json.dump(legacy_test_json, fp)
+        corpus_path = tmp_path / "corpus.sdcpack"
+        test_paths = list(reversed(TestLoader.find_test_paths(tests_dir)))
+        PackedTestCorpus.pack_tests(test_paths, tests_dir=tests_dir, corpus_path=corpus_path)
+
+        expected = {}
+        test_loader = TestLoader(tests_dir=tests_dir, test_validator=None)
+        while test_loader.has_next():
+            test, _ = test_loader.next()
+            expected[str(test.test_id)[len(str(tests_dir)) :]] = (test.test_duration, np.asarray(test.road_points))
+        actual = {}
+        test_loader = TestLoader(tests_dir=corpus_path, test_validator=None)
+        while test_loader.has_next():
+            test, _ = test_loader.next()
+            actual[str(test.test_id)[len(str(corpus_path)) :]] = (test.test_duration, np.asarray(test.road_points))
+        PackedTestCorpus(corpus_path).unpack_tests(tmp_path / "unpacked")
+
+        assert actual.keys() == expected.keys()
+        for name, (test_duration, road_points) in expected.items():
+            assert actual[name][0] == test_duration
+            assert np.array_equal(actual[name][1], road_points)
+        with open(tmp_path / "unpacked" / "test_4.json") as fp:
+            test_json = json.load(fp)
+        assert test_json["simulation_time"] == 12.5
+        assert test_json["interpolated_points"] == legacy_test_json["interpolated_points"]
+        with open(tmp_path / "unpacked" / "test_1.json") as fp:
+            test_json = json.load(fp)
+        assert "simulation_time" not in test_json and "interpolated_points" not in test_json
+
+    def test_catalog_is_not_supported_for_corpora(self, tmp_path):
+        _, corpus_path = self.__pack(tmp_path)
+
+        with pytest.raises(Exception, match="not supported for packed test corpora"):
+            TestLoader(tests_dir=corpus_path, test_validator=None, catalog_path=tmp_path / "catalog.db")
+        with pytest.raises(Exception, match="not supported for packed test corpora"):
+            TestLoader(tests_dir=corpus_path, test_validator=None, catalog_query="road_distance > 200")
@@ -0,0 +1,52 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sdc_scissor.testing_api.pipeline import Pipeline
+
+
+class TestPipeline:
+    def test_stages_keep_the_order_of_the_items(self):
+        def slow_square(x):
+            time.sleep(0.001 * (x % 3))
+            return x * x
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pipeline = Pipeline(range(50), max_pending=4)
+            pipeline.filter(lambda x: x % 2 == 0).map(slow_square, executor=executor).batch(7)
+            batches = list(pipeline)
+
+        assert [len(batch) for batch in batches] == [7, 7, 7, 4]
+        assert list(Pipeline(batches).flatten()) == [x * x for x in range(0, 50, 2)]
+
+    @pytest.mark.parametrize("use_executor", [False, True])
+    def test_source_is_consumed_only_on_demand(self, use_executor):
+        nr_of_taken_items = 0
+        lock = threading.Lock()
+
+        def source():
+            nonlocal nr_of_taken_items
+            for i in range(1000):
+                with lock:
+                    nr_of_taken_items += 1
+                yield i
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pipeline = Pipeline(source(), max_pending=5).map(
+                lambda x: x + 1, executor=executor if use_executor else None
+            )
+            items = iter(pipeline)
+            assert [next(items) for _ in range(10)] == list(range(1, 11))
+
+        assert nr_of_taken_items <= 10 + 5
+        assert nr_of_taken_items >= 10
+
+    def test_sink_receives_every_item(self):
+        written_items = []
+
+        nr_of_items = Pipeline(range(10)).map(str).run(written_items.append)
+
+        assert nr_of_items == 10
+        assert written_items == [str(i) for i in range(10)]
@@ -0,0 +1,22 @@
+import numpy as np
+
+from sdc_scissor.testing_api.road_prefilter import INVALID, UNDECIDED, VALID, prefilter_roads
+
+
+class TestRoadPrefilter:
+    def test_roads_are_decided_per_road(self):
+        roads = np.array(
+            [
+                [[0, 0], [50, 0], [100, 0], [150, 0], [200, 0]],
+                [[0, 0], [100, 0], [100, 100], [50, 100], [50, -50]],
+                [[0, 0], [10, 0], [10, 10], [0, 10], [0, 20]],
+            ],
+            dtype=float,
+        )
+
+        assert prefilter_roads(roads, offset=5).tolist() == [VALID, INVALID, UNDECIDED]
+
+    def test_roads_with_less_than_three_segments_are_undecided(self):
+        roads = np.array([[[0, 0], [50, 0], [100, 0]]], dtype=float)
+
+        assert prefilter_roads(roads, offset=5).tolist() == [UNDECIDED]
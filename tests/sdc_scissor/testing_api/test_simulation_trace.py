@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+import pytest
+
+from sdc_scissor.testing_api.simulation_trace import SimulationTrace, SimulationTraceWriter
+
+
+class TestSimulationTrace:
+    @staticmethod
+    def __write_trace(trace_path, nr_of_rows, chunk_size):
+        with SimulationTraceWriter(trace_path, chunk_size=chunk_size) as writer:
+            for i in range(nr_of_rows):
+                signals = {"wheelspeed": 0.5 * i, "gear": i % 4, "lowbeam": i % 2 == 0, "lights": [1, 2]}
+                if i == 3:
+                    del signals["wheelspeed"]
+                    signals["new_signal"] = 1.0
+                writer.append(0.1 * i, (i, 2 * i, -28.0), signals)
+        return writer
+
+    def test_columns_are_typed_and_complete(self, tmp_path):
+        self.__write_trace(tmp_path / "test.trace", nr_of_rows=7, chunk_size=3)
+
+        trace = SimulationTrace(tmp_path / "test.trace")
+
+        assert len(trace) == 7
+        assert trace.get_column_names() == ["time", "x", "y", "z", "wheelspeed", "gear", "lowbeam"]
+        columns = trace.read_columns()
+        assert columns["time"] == pytest.approx(0.1 * np.arange(7))
+        assert columns["y"].tolist() == [2.0 * i for i in range(7)]
+        assert columns["gear"].dtype == np.float64
+        assert columns["gear"].tolist() == [i % 4 for i in range(7)]
+        assert columns["lowbeam"].dtype == np.bool_
+        assert np.isnan(columns["wheelspeed"][3])
+        assert columns["wheelspeed"][4] == 2.0
+
+    def test_only_requested_columns_are_read(self, tmp_path):
+        self.__write_trace(tmp_path / "test.trace", nr_of_rows=5, chunk_size=2)
+
+        trace = SimulationTrace(tmp_path / "test.trace")
+        columns = trace.read_columns(["x", "gear"])
+
+        assert list(columns.keys()) == ["x", "gear"]
+        with pytest.raises(Exception):
+            trace.read_columns(["lights"])
+
+    def test_trace_is_readable_up_to_the_last_chunk(self, tmp_path):
+        writer = SimulationTraceWriter(tmp_path / "test.trace", chunk_size=2)
+        for i in range(5):
+            writer.append(0.1 * i, (i, i, 0), {"throttle": 1.0})
+
+        trace = SimulationTrace(tmp_path / "test.trace")
+
+        assert len(trace) == 4
+        assert trace.read_columns(["throttle"])["throttle"].tolist() == [1.0] * 4
+        with open(tmp_path / "test.trace" / "trace.json") as fp:
+            assert json.load(fp)["nr_of_rows"] == 4
+
+    def test_integer_signals_are_not_truncated(self, tmp_path):
+        with SimulationTraceWriter(tmp_path / "test.trace", chunk_size=1) as writer:
+            writer.append(0.0, (0, 0, 0), {"throttle": 0, "wheelspeed": 0})
+            writer.append(0.1, (0, 1, 0), {"throttle": 0.73, "wheelspeed": 12.6})
+
+        columns = SimulationTrace(tmp_path / "test.trace").read_columns(["throttle", "wheelspeed"])
+
+        assert columns["throttle"].tolist() == [0.0, 0.73]
+        assert columns["wheelspeed"].tolist() == [0.0, 12.6]
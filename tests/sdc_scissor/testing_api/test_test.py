@@ -0,0 +1,72 @@
+import json
+import pathlib
+
+import numpy as np
+
+from sdc_scissor.testing_api import test as test_module
+from sdc_scissor.testing_api.test import Test
+from sdc_scissor.testing_api.test_loader import TestLoader
+from sdc_scissor.testing_api.test_validator import SimpleTestValidator
+
+
+class TestTest:
+    def setup_class(self):
+        rng = np.random.default_rng(0)
+        self.road_points = np.cumsum(rng.random((30, 2)) * 10, axis=0).tolist()
+
+    def test_interpolation_is_lazy(self, mocker):
+        splprep = mocker.spy(test_module, "splprep")
+        test = Test(0, self.road_points, "PASS")
+
+        assert not test.is_interpolated
+        assert splprep.call_count == 0
+        assert len(test.interpolated_road_points) == 51
+        assert len(test.interpolated_road_points) == 51
+        assert splprep.call_count == 1
+
+    def test_given_interpolation_is_used(self):
+        interpolated_road_points = [[0, 0], [1, 1]]
+        test = Test(0, self.road_points, "PASS", interpolated_road_points=interpolated_road_points)
+
+        assert test.is_interpolated
+        assert test.interpolated_road_points is interpolated_road_points
+
+    def test_saved_test_contains_interpolation(self, tmp_path):
+        test = Test(0, self.road_points, "PASS", 3.5)
+        test.save_as_json(tmp_path / "test.json")
+
+        with open(tmp_path / "test.json") as fp:
+            test_json = json.load(fp)
+        assert test_json["road_points"] == self.road_points
+        assert test_json["interpolated_road_points"] == Test(0, self.road_points, "PASS").interpolated_road_points
+        assert test_json["test_duration"] == 3.5
+
+    def test_batch_interpolation_equals_single_interpolation(self):
+        rng = np.random.default_rng(1)
+        roads = [np.cumsum(rng.random((n, 2)) * 10, axis=0).tolist() for n in (2, 3, 4, 5, 12, 12, 40)]
+        roads.append(self.road_points)
+        expected = [Test(0, road_points, "PASS").interpolated_road_points for road_points in roads]
+
+        tests = [Test(i, road_points, "PASS") for i, road_points in enumerate(roads)]
+        tests[0].interpolated_road_points = [[0, 0], [1, 1]]
+        Test.interpolate_batch(tests)
+
+        assert tests[0].interpolated_road_points == [[0, 0], [1, 1]]
+        for test, interpolated_road_points in zip(tests[1:], expected[1:]):
+            assert test.is_interpolated
+            assert test.interpolated_road_points == interpolated_road_points
+
+    def test_loader_reuses_stored_interpolation(self, fs):
+        interpolated_road_points = [[0, 0, -28, 10], [10, 0, -28, 10], [20, 5, -28, 10], [30, 10, -28, 10]]
+        fs.create_file(
+            "/tests/test_1.json",
+            contents=json.dumps(
+                {"road_points": [[0, 0], [30, 10]], "interpolated_road_points": interpolated_road_points}
+            ),
+        )
+
+        test_loader = TestLoader(tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator())
+        test, _ = test_loader.next()
+
+        assert test.is_interpolated
+        assert test.interpolated_road_points == [[0, 0], [10, 0], [20, 5], [30, 10]]
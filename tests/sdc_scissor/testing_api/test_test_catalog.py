@@ -0,0 +1,103 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from sdc_scissor.testing_api.test import Test
+from sdc_scissor.testing_api.test_catalog import TestCatalog
+from sdc_scissor.testing_api.test_loader import TestLoader
+from sdc_scissor.testing_api.test_validator import SimpleTestValidator
+
+
+class TestTestCatalog:
+    @staticmethod
+    def __create_tests(tests_dir):
+        road_points = [[0, 0], [10, 0], [20, 5], [30, 10]]
+        tests_dir.mkdir()
+        (tests_dir / "test_1.json").write_text(json.dumps({"road_points": road_points, "test_outcome": "PASS"}))
+        (tests_dir / "test_2.json").write_text(json.dumps({"road_points": road_points, "is_valid": False}))
+        (tests_dir / "test_3.json").write_text(json.dumps({"road_points": road_points, "test_duration": 12.5}))
+
+    def test_unchanged_tests_are_served(self, tmp_path):
+        self.__create_tests(tmp_path / "tests")
+        test_catalog = TestCatalog(tmp_path / "catalog.db", tmp_path / "tests")
+        test_path = tmp_path / "tests" / "test_3.json"
+        test_catalog.put(test_path, {"test_id": "3", "is_valid": True, "test_duration": 12.5})
+        test_catalog.close()
+
+        test_catalog = TestCatalog(tmp_path / "catalog.db", tmp_path / "tests")
+        assert test_catalog.get(test_path)["test_duration"] == 12.5
+        os.utime(test_path, ns=(0, 0))
+        assert test_catalog.get(test_path)["is_valid"]
+        test_path.write_text(test_path.read_text().replace("12.5", "13.5"))
+        assert test_catalog.get(test_path) is None
+        assert test_catalog.get(tmp_path / "tests" / "test_1.json") is None
+
+    def test_tests_are_selected_by_their_features(self, tmp_path):
+        self.__create_tests(tmp_path / "tests")
+        test_catalog = TestCatalog(tmp_path / "catalog.db", tmp_path / "tests")
+        test_paths = [tmp_path / "tests" / "test_{}.json".format(i) for i in (1, 2, 3)]
+        for test_path in test_paths:
+            test_catalog.put(test_path, TestLoader.get_metadata(test_path, json.loads(test_path.read_text())))
+        test_catalog.put_features(
+            {
+                test_paths[0]: {"road_distance": 150.0, "num_l_turns": np.int64(2)},
+                test_paths[2]: {"road_distance": 250.0, "num_l_turns": np.int64(0)},
+            }
+        )
+
+        assert len(test_catalog) == 3
+        assert test_catalog.select_test_paths("is_valid") == [test_paths[0], test_paths[2]]
+        assert test_catalog.select_test_paths("road_distance > ?", (200,)) == [test_paths[2]]
+        assert test_catalog.select_test_paths("is_valid AND test_outcome IS NULL") == [test_paths[2]]
+        assert test_catalog.select_test_paths("num_l_turns > 1") == [test_paths[0]]
+        with pytest.raises(Exception):
+            test_catalog.select_test_paths("unknown_feature > 1")
+        with pytest.raises(Exception):
+            test_catalog.put_features({test_paths[0]: {"road distance; --": 1.0}})
+
+    def test_modified_tests_lose_their_features(self, tmp_path):
+        self.__create_tests(tmp_path / "tests")
+        test_catalog = TestCatalog(tmp_path / "catalog.db", tmp_path / "tests")
+        test_path = tmp_path / "tests" / "test_1.json"
+        test_catalog.put(test_path, {"test_id": "1"})
+        test_catalog.put_features({test_path: {"road_distance": 150.0}})
+
+        test_catalog.put(test_path, {"test_id": "1", "predicted_test_outcome": "FAIL"})
+        assert test_catalog.select_test_paths("road_distance > 0") == [test_path]
+        test_path.write_text(json.dumps({"road_points": [[0, 0], [50, 0]]}))
+        test_catalog.put(test_path, {"test_id": "1"})
+        assert test_catalog.select_test_paths("road_distance > 0") == []
+
+    def test_loader_keeps_catalog_in_sync_and_selects_without_walking(self, mocker, tmp_path):
+        tests_dir = tmp_path / "tests"
+        self.__create_tests(tests_dir)
+        catalog_path = tmp_path / "catalog.db"
+        test_loader = TestLoader(tests_dir, test_validator=SimpleTestValidator(), catalog_path=catalog_path)
+        while test_loader.has_next():
+            test, test_path = test_loader.next()
+            test.predicted_test_outcome = "FAIL"
+            test.save_as_json(test_path)
+            test_loader.update_test_metadata(test_path, test)
+        test_loader.save_metadata()
+        assert len(test_loader.test_catalog) == 3
+
+        (tests_dir / "test_2.json").unlink()
+        test_loader = TestLoader(tests_dir, test_validator=SimpleTestValidator(), catalog_path=catalog_path)
+        assert len(test_loader.test_catalog) == 2
+
+        walk = mocker.spy(os, "walk")
+        read_test_json = mocker.spy(TestLoader, "read_test_json")
+        test_loader = TestLoader(
+            tests_dir,
+            test_validator=SimpleTestValidator(),
+            catalog_path=catalog_path,
+            catalog_query="predicted_test_outcome = 'FAIL' AND test_outcome IS NULL",
+        )
+        assert walk.call_count == 0
+        assert read_test_json.call_count == 0
+        assert test_loader.test_paths == [tests_dir / "test_3.json"]
+        test, _ = test_loader.next()
+        assert isinstance(test, Test)
+        assert test.test_duration == 12.5
@@ -1,6 +1,9 @@
+import json
 import random
 from pathlib import Path
 
+import numpy as np
+
 from sdc_scissor.testing_api.test_generator import KeepAllTestsBehavior, KeepValidTestsOnlyBehavior, TestGenerator
 from sdc_scissor.testing_api.test_validator import MakeTestInvalidValidator, SimpleTestValidator
 
@@ -57,6 +60,41 @@ class TestTestGenerator:
             actual = test.test_id
             assert expected == actual
 
+    def test_saved_tests_contain_the_interpolated_road_points(self, fs):
+        destination = Path("./destination")
+        destination.mkdir(parents=True)
+        test_generator = TestGenerator(
+            count=2,
+            destination=destination,
+            tool="frenetic",
+            validator=SimpleTestValidator(),
+            test_keeping_behavior=KeepAllTestsBehavior(),
+        )
+        test_generator.generate()
+        test_generator.save_tests()
+
+        with open(destination / "00000_test.json") as fp:
+            test_json = json.load(fp)
+        assert len(test_json["interpolated_road_points"]) == 51
+        assert "_Test__interpolated_road_points" not in test_json
+
+    def test_tests_can_be_saved_while_they_are_generated(self, fs):
+        destination = Path("./destination")
+        destination.mkdir(parents=True)
+        test_generator = TestGenerator(
+            count=3,
+            destination=destination,
+            tool="frenetic",
+            validator=SimpleTestValidator(),
+            test_keeping_behavior=KeepAllTestsBehavior(),
+        )
+
+        saved_test_paths = [test_generator.save_test(test) for test in test_generator.iter_tests()]
+
+        assert saved_test_paths == [destination / "{:05d}_test.json".format(i) for i in range(3)]
+        assert all(test_path.exists() for test_path in saved_test_paths)
+        assert test_generator.generated_tests == []
+
     def test_id_generation_of_generate_tests_on_keeping_all_tests_ambiegen(self):
         destination = "./destination"
         number_of_tests_to_generate = 10
@@ -108,3 +146,43 @@ class TestTestGenerator:
             expected = index
             actual = test.test_id
             assert expected == actual
+
+    def test_seeded_generation_does_not_depend_on_the_number_of_jobs(self, tmp_path):
+        generated_tests = []
+        for jobs in (1, 2):
+            test_generator = TestGenerator(
+                count=5,
+                destination=tmp_path,
+                tool="frenetic",
+                validator=SimpleTestValidator(),
+                test_keeping_behavior=KeepAllTestsBehavior(),
+                jobs=jobs,
+                seed=42,
+                chunk_size=2,
+            )
+            test_generator.generate()
+            generated_tests.append(test_generator.generated_tests)
+
+        assert [test.test_id for test in generated_tests[1]] == list(range(len(generated_tests[1])))
+        assert [test.to_dict() for test in generated_tests[0]] == [test.to_dict() for test in generated_tests[1]]
+
+    def test_seeded_generation_keeps_the_random_state_of_the_caller(self, tmp_path):
+        random.seed(7)
+        np.random.seed(7)
+        expected = (random.random(), np.random.random())
+        random.seed(7)
+        np.random.seed(7)
+
+        test_generator = TestGenerator(
+            count=3,
+            destination=tmp_path,
+            tool="frenetic",
+            validator=SimpleTestValidator(),
+            test_keeping_behavior=KeepAllTestsBehavior(),
+            jobs=1,
+            seed=42,
+            chunk_size=2,
+        )
+        test_generator.generate()
+
+        assert (random.random(), np.random.random()) == expected
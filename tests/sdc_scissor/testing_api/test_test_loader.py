@@ -1,3 +1,5 @@
+import json
+import os
 import pathlib
 
 import pytest
@@ -33,3 +35,143 @@ class TestTestLoader:
         test_loader.test_paths = [mocker.stub(), mocker.stub()]
         has_next = test_loader.has_next()
         assert has_next
+
+
+class TestTestLoaderManifest:
+    @staticmethod
+    def __create_tests(fs):
+        road_points = [[0, 0], [10, 0], [20, 5], [30, 10]]
+        fs.create_file("/tests/test_1.json", contents=json.dumps({"road_points": road_points, "test_outcome": "PASS"}))
+        fs.create_file("/tests/test_2.json", contents=json.dumps({"road_points": road_points, "is_valid": False}))
+        fs.create_file(
+            "/tests/test_3.json",
+            contents=json.dumps({"road_points": road_points, "is_valid": True, "test_duration": 12.5}),
+        )
+
+    @staticmethod
+    def __load_all(test_loader):
+        test_ids = []
+        while test_loader.has_next():
+            test, _ = test_loader.next()
+            test_ids.append(test.test_id)
+        return sorted(test_ids)
+
+    def test_every_test_is_parsed_once_and_invalid_tests_are_skipped(self, mocker, fs):
+        self.__create_tests(fs)
+        read_test_json = mocker.spy(TestLoader, "read_test_json")
+
+        test_loader = TestLoader(tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator())
+
+        assert read_test_json.call_count == 0
+        assert self.__load_all(test_loader) == ["/tests/test_1.json", "/tests/test_3.json"]
+        assert read_test_json.call_count == 3
+
+    def test_manifest_skips_known_invalid_tests(self, mocker, fs):
+        self.__create_tests(fs)
+        test_loader = TestLoader(
+            tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator(), manifest_path="/manifest.json"
+        )
+        self.__load_all(test_loader)
+        test_loader.save_metadata()
+        read_test_json = mocker.spy(TestLoader, "read_test_json")
+
+        test_loader = TestLoader(
+            tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator(), manifest_path="/manifest.json"
+        )
+
+        assert len(test_loader.test_manifest) == 3
+        assert sorted(str(test_path) for test_path in test_loader.test_paths) == [
+            "/tests/test_1.json",
+            "/tests/test_3.json",
+        ]
+        assert self.__load_all(test_loader) == ["/tests/test_1.json", "/tests/test_3.json"]
+        assert read_test_json.call_count == 2
+
+    def test_manifest_entry_of_modified_test_is_not_used(self, fs):
+        self.__create_tests(fs)
+        test_loader = TestLoader(
+            tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator(), manifest_path="/manifest.json"
+        )
+        self.__load_all(test_loader)
+        test_loader.save_metadata()
+        with open("/tests/test_2.json", "w") as fp:
+            json.dump({"road_points": [[0, 0], [10, 0], [20, 5], [30, 10]], "is_valid": True}, fp)
+        os.remove("/tests/test_3.json")
+
+        test_loader = TestLoader(
+            tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator(), manifest_path="/manifest.json"
+        )
+
+        assert self.__load_all(test_loader) == ["/tests/test_1.json", "/tests/test_2.json"]
+        test_loader.save_metadata()
+        with open("/manifest.json") as fp:
+            manifest_json = json.load(fp)
+        assert sorted(manifest_json["tests"].keys()) == ["test_1.json", "test_2.json"]
+        assert manifest_json["tests"]["test_2.json"]["is_valid"]
+        assert manifest_json["tests"]["test_1.json"]["test_outcome"] == "PASS"
+
+
+class TestTestLoaderPrefetch:
+    @staticmethod
+    def __create_tests(tests_dir):
+        os.makedirs(tests_dir, exist_ok=True)
+        for i in range(10):
+            road_points = [[0, 0], [10, i], [20, 5], [30, 10]]
+            with open(os.path.join(tests_dir, "test_{}.json".format(i)), "w") as fp:
+                json.dump({"road_points": road_points, "is_valid": i % 3 != 0}, fp)
+
+    @staticmethod
+    def __get_test_ids(tests_with_paths):
+        return [test.test_id for test, _ in tests_with_paths]
+
+    @pytest.mark.parametrize("prefetch", [1, 3, 20])
+    def test_prefetching_preserves_the_order(self, fs, prefetch):
+        self.__create_tests("/tests")
+        test_loader = TestLoader(tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator())
+        expected = [
+            str(test_path) for test_path in reversed(test_loader.test_paths) if int(test_path.stem[-1]) % 3 != 0
+        ]
+
+        actual = list(test_loader.iter_tests(prefetch=prefetch))
+
+        assert len(actual) == 6
+        assert self.__get_test_ids(actual) == expected
+        assert [test.road_points[1][1] for test, _ in actual] == [int(test_id[-6]) for test_id in expected]
+        assert not test_loader.has_next()
+
+    def test_prefetching_updates_the_manifest(self, fs):
+        self.__create_tests("/tests")
+        test_loader = TestLoader(
+            tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator(), manifest_path="/manifest.json"
+        )
+
+        assert len(list(test_loader.iter_tests(prefetch=4))) == 6
+        test_loader.save_metadata()
+        test_loader = TestLoader(
+            tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator(), manifest_path="/manifest.json"
+        )
+
+        assert len(test_loader.test_manifest) == 10
+        assert len(test_loader.test_paths) == 6
+
+    def test_stopping_early_drops_the_prefetched_tests(self, fs):
+        self.__create_tests("/tests")
+        test_loader = TestLoader(tests_dir=pathlib.Path("/tests"), test_validator=SimpleTestValidator())
+
+        tests_iterator = test_loader.iter_tests(prefetch=2)
+        test, _ = next(tests_iterator)
+        tests_iterator.close()
+
+        assert len(test_loader.test_paths) <= 10 - 2
+        remaining_test_ids = self.__get_test_ids(test_loader.iter_tests())
+        assert 0 < len(remaining_test_ids) < 6
+        assert test.test_id not in remaining_test_ids
+
+    def test_prefetching_on_processes(self, tmp_path):
+        self.__create_tests(tmp_path)
+        test_validator = NoIntersectionValidator(SimpleTestValidator())
+
+        actual = list(TestLoader(tmp_path, test_validator=test_validator).iter_tests(prefetch=2, use_processes=True))
+
+        assert len(actual) == 6
+        assert all(test.is_valid for test, _ in actual)
@@ -1,4 +1,7 @@
 from sdc_scissor.config import CONFIG
+from sdc_scissor.testing_api.road_model import RoadModel
+from sdc_scissor.testing_api.simulation_trace import SimulationTrace
+from sdc_scissor.testing_api.test import Test
 from sdc_scissor.testing_api.test_monitor import TestMonitor
 
 
@@ -66,3 +69,30 @@ class TestTestMonitor:
         expected = True
         actual = self.test_monitor.is_test_finished
         assert expected == actual
+
+    def test_car_states_are_written_to_the_simulation_trace(self, mocker, tmp_path):
+        mock_simulator = mocker.patch("sdc_scissor.simulator_api.abstract_simulator.AbstractSimulator")
+        mock_simulator.get_car_position.return_value = 50, 50, 0
+
+        class _TestSensorData:
+            def __init__(self):
+                self._data = {"wheelspeed": 10.0, "gear": 3}
+
+        mock_simulator.get_sensor_data.return_value = _TestSensorData()
+        self.test_monitor.simulator = mock_simulator
+        self.test_monitor.cbh = mocker.patch("sdc_scissor.can_api.can_bus_handler.CanBusHandler")
+
+        test = Test(0, [[0, 0], [100, 0]], "NOT_EXECUTED")
+        self.test_monitor.test = test
+        self.test_monitor.road_model = RoadModel(test.interpolated_road_points)
+        self.test_monitor.oob = 0.5
+        self.test_monitor.start_trace(tmp_path / "test_0.trace")
+        for _ in range(3):
+            self.test_monitor.process_car_state(interrupt_on_failure=False)
+        self.test_monitor.dump_data()
+
+        assert test.simulation_trace == "test_0.trace"
+        assert "simulation_data" not in test.to_dict()
+        trace = SimulationTrace(tmp_path / "test_0.trace")
+        assert len(trace) == 3
+        assert trace.read_columns(["gear"])["gear"].tolist() == [3, 3, 3]
@@ -1,9 +1,16 @@
+import os
+
+import numpy as np
+from shapely.geometry import LineString
+
+from sdc_scissor.testing_api import test_validator as test_validator_module
 from sdc_scissor.testing_api.test_validator import (
     NoIntersectionValidator,
     NoTooSharpTurnsValidator,
     SimpleTestValidator,
     Test,
 )
+from sdc_scissor.testing_api.validation_cache import ValidationCache
 
 
 class TestTestValidator:
@@ -53,3 +60,73 @@ class TestTestValidator:
         expected = True
         actual = tv.validate(test)
         assert actual == expected
+
+    def test_batch_validation_equals_single_validation(self):
+        rng = np.random.default_rng(0)
+        roads = [np.cumsum(rng.normal(size=(8, 2)) * 30, axis=0).tolist() for _ in range(40)]
+        roads.append([[10, 10], [100, 10], [150, 50], [100, 100], [60, 60], [20, 0], [20, -10]])
+        roads.append([[10, 10], [15, 15], [100, 100], [150, 150], [200, 180]])
+        tv = NoIntersectionValidator(SimpleTestValidator())
+        expected = [tv.validate(Test(0, road_points, None)) for road_points in roads]
+
+        actual = tv.validate_batch([Test(0, road_points, None) for road_points in roads])
+
+        assert actual == expected
+        assert True in actual and False in actual
+
+    def test_prefilter_decides_clear_roads_without_shapely(self, mocker):
+        parallel_offset = mocker.spy(LineString, "parallel_offset")
+        straight_road = Test(0, road_points=[[0, 0], [50, 0], [100, 0], [150, 0]], test_outcome=None)
+        crossing_road = Test(
+            1, road_points=[[0, 0], [100, 0], [200, 0], [200, 100], [100, 100], [100, -100]], test_outcome=None
+        )
+        tv = NoIntersectionValidator(SimpleTestValidator())
+
+        assert tv.validate_batch([straight_road, crossing_road]) == [True, False]
+        assert parallel_offset.call_count == 0
+
+    def test_validation_results_are_cached(self, mocker, tmp_path):
+        roads = [[[10, 10], [15, 15], [100, 100], [150, 150]], [[0, 0], [100, 0], [100, 100], [50, 100], [50, -50]]]
+        validation_cache = ValidationCache(tmp_path / "validation.db")
+        tv = NoIntersectionValidator(SimpleTestValidator(), validation_cache=validation_cache)
+        expected = tv.validate_batch([Test(i, road_points, None) for i, road_points in enumerate(roads)])
+        tv.flush()
+        prefilter_roads = mocker.spy(test_validator_module, "prefilter_roads")
+
+        tv = NoIntersectionValidator(
+            SimpleTestValidator(), validation_cache=ValidationCache(tmp_path / "validation.db")
+        )
+        actual = [tv.validate(Test(i, road_points, None)) for i, road_points in enumerate(roads)]
+
+        assert actual == expected
+        assert prefilter_roads.call_count == 0
+        assert tv.validation_cache.hits == 2
+        assert len(tv.validation_cache) == 2
+        tv = NoIntersectionValidator(
+            SimpleTestValidator(), validation_cache=ValidationCache(tmp_path / "validation.db"), offset=6
+        )
+        tv.validate(Test(0, roads[0], None))
+        assert tv.validation_cache.misses == 1
+
+    def test_forked_process_opens_its_own_cache_connection(self, tmp_path):
+        validation_cache = ValidationCache(tmp_path / "validation.db")
+        validation_cache.put_many({"a": True})
+        validation_cache.flush()
+        parent_connection = validation_cache.connection
+
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                if validation_cache.connection is not parent_connection:
+                    validation_cache.put_many({"b": False})
+                    validation_cache.flush()
+                    exit_code = 0
+            finally:
+                os._exit(exit_code)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert validation_cache.connection is parent_connection
+        assert validation_cache.get_many(["a", "b"]) == {"a": True, "b": False}
+        validation_cache.close()
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import numpy as np
+from pytest import approx
+
+from sdc_scissor.testing_api.packed_test_corpus import PackedTestCorpus
+from sdc_scissor.testing_api.test import Test
+from sdc_scissor.testing_api.test_loader import TestLoader
+from sdc_scissor.testing_api.test_validator import SimpleTestValidator
+from sdc_scissor.testing_api.test_writer import (
+    PackedTestWriter,
+    ShardedTestWriter,
+    get_id_width,
+    get_relative_test_path,
+)
+
+
+class TestTestWriter:
+    def setup_class(self):
+        self.tests = []
+        for test_id in range(7):
+            test = Test(test_id, [[0, 0], [10, test_id], [20, 2 * test_id], [30, 0]], "NOT_EXECUTED")
+            test.is_valid = True
+            self.tests.append(test)
+
+    def test_relative_paths_are_sharded_by_test_id(self):
+        test = Test(123456, [[0, 0], [10, 0]], "NOT_EXECUTED")
+
+        assert get_relative_test_path(test, shard_size=1000) == Path("00123") / "123456_test.json"
+        assert get_relative_test_path(test, shard_size=0) == Path("123456_test.json")
+        assert get_relative_test_path(self.tests[3], shard_size=1000) == Path("00000") / "00003_test.json"
+
+    def test_ids_are_padded_to_the_largest_id(self, tmp_path):
+        assert [get_id_width(count) for count in [None, 1, 100000, 100001, 2500000]] == [5, 5, 5, 6, 7]
+
+        with ShardedTestWriter(tmp_path, shard_size=0, nr_of_threads=0, count=100001) as test_writer:
+            test_paths = [
+                test_writer.write(Test(test_id, [[0, 0], [10, 0]], "NOT_EXECUTED")) for test_id in [9, 100000]
+            ]
+
+        assert [test_path.name for test_path in test_paths] == ["000009_test.json", "100000_test.json"]
+        assert sorted(path.name for path in tmp_path.iterdir()) == [test_path.name for test_path in test_paths]
+
+    def test_tests_are_written_into_shards(self, tmp_path):
+        written_tests = []
+        with ShardedTestWriter(
+            tmp_path, shard_size=3, nr_of_threads=2, max_pending=2, on_write=lambda *args: written_tests.append(args)
+        ) as test_writer:
+            test_paths = [test_writer.write(test) for test in self.tests]
+
+        assert [test_path for test_path, _ in written_tests] == test_paths
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["00000", "00001", "00002"]
+        assert all(test_path.exists() for test_path in test_paths)
+        assert "\n" not in test_paths[0].read_text()
+        test_loader = TestLoader(tmp_path, test_validator=SimpleTestValidator())
+        assert len(test_loader.test_paths) == 7
+        test = TestLoader.load_test_from_path(test_paths[5], SimpleTestValidator())
+        assert np.array(test.interpolated_road_points) == approx(np.array(self.tests[5].interpolated_road_points))
+
+    def test_tests_are_written_into_a_packed_corpus(self, tmp_path):
+        with PackedTestWriter(tmp_path / "tests.pack", shard_size=3) as test_writer:
+            test_paths = [test_writer.write(test) for test in self.tests]
+
+        test_corpus = PackedTestCorpus(tmp_path / "tests.pack")
+        assert len(test_corpus) == 7
+        assert test_corpus.get_name(4) == "00001/00004_test.json"
+        assert test_paths[4].read_test_json()["road_points"].tolist() == self.tests[4].road_points
+        test_corpus.close()